@@ -0,0 +1,56 @@
+"""
+Bulk import locations from a file (or stdin) using COPY-based ingestion.
+
+Usage:
+    python -m app.cli.import_locations places.ndjson
+    python -m app.cli.import_locations places.csv --format csv --tolerance 25
+    cat places.geojson | python -m app.cli.import_locations - --format geojson
+"""
+import argparse
+import json
+import sys
+
+from app.core.database import SessionLocal
+from app.core.importers import ImportFormat, run_import
+from app.repositories.location_repository import LocationRepository
+
+EXTENSION_FORMATS = {
+    ".ndjson": ImportFormat.ndjson,
+    ".jsonl": ImportFormat.ndjson,
+    ".csv": ImportFormat.csv,
+    ".geojson": ImportFormat.geojson,
+    ".json": ImportFormat.geojson,
+}
+
+
+def detect_format(path: str) -> ImportFormat:
+    for extension, fmt in EXTENSION_FORMATS.items():
+        if path.lower().endswith(extension):
+            return fmt
+    return ImportFormat.ndjson
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", help="Input file, or - for stdin")
+    parser.add_argument("--format", choices=[f.value for f in ImportFormat],
+                        help="Input format (default: from file extension, else ndjson)")
+    parser.add_argument("--tolerance", type=int, default=10, help="Dedup radius in meters")
+    args = parser.parse_args()
+
+    fmt = ImportFormat(args.format) if args.format else detect_format(args.path)
+    stream = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+
+    db = SessionLocal()
+    try:
+        stats = run_import(LocationRepository(db), stream, fmt, args.tolerance)
+    finally:
+        db.close()
+        if stream is not sys.stdin.buffer:
+            stream.close()
+
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+import math
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import orjson
+
+from app.core.config import Settings
+from app.core.geometry import spheroid_distance_meters
+from app.core.pagination import KEYSET_DISTANCE_DECIMALS
+from app.models.location import LocationRow
+
+KEY_PREFIX = "nearby:"
+
+# Grid sizes (degrees) used to index cached entries for invalidation.
+# An entry is filed under the cells of the first level at least as wide as its radius.
+INDEX_LEVELS = (0.01, 0.1, 1.0)
+METERS_PER_DEGREE = 111320.0
+
+# Candidate sets larger than this are not cached; the entry just records that
+# the cell is too dense and requests there run the exact query
+MAX_CACHED_CANDIDATES = 2000
+DENSE_MARKER = b"-"
+
+
+def radius_bucket(distance_meters: int) -> int:
+    """Round a search radius up to a coarse bucket so near-identical radii share entries"""
+    if distance_meters <= 1000:
+        step = 50
+    elif distance_meters <= 10000:
+        step = 250
+    else:
+        step = 1000
+    return min(50000, math.ceil(distance_meters / step) * step)
+
+
+def _cell(latitude: float, longitude: float, size: float) -> Tuple[int, int]:
+    return math.floor(longitude / size), math.floor(latitude / size)
+
+
+def _index_key(size: float, cell: Tuple[int, int]) -> str:
+    return f"{KEY_PREFIX}idx:{size}:{cell[0]}:{cell[1]}"
+
+
+def _covering_index_keys(latitude: float, longitude: float, distance_meters: int) -> Iterable[str]:
+    """Index cells (at one level) overlapped by the bounding box of a search circle"""
+    size = next((s for s in INDEX_LEVELS if s * METERS_PER_DEGREE >= distance_meters), INDEX_LEVELS[-1])
+    dlat = distance_meters / METERS_PER_DEGREE
+    dlng = min(180.0, distance_meters / (METERS_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.0001)))
+
+    min_x, min_y = _cell(latitude - dlat, longitude - dlng, size)
+    max_x, max_y = _cell(latitude + dlat, longitude + dlng, size)
+    for x in range(min_x, max_x + 1):
+        for y in range(min_y, max_y + 1):
+            yield _index_key(size, (x, y))
+
+
+class LRUCacheBackend:
+    """In-process LRU with per-entry TTL (one per worker process)"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._index: dict[str, set] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def index_add(self, index_key: str, key: str, ttl_seconds: int) -> None:
+        self._index.setdefault(index_key, set()).add(key)
+        if len(self._index) > self.max_entries:
+            # Drop index cells that no longer point at any live entry
+            self._index = {
+                cell: live for cell, keys in self._index.items()
+                if (live := {k for k in keys if k in self._entries})
+            }
+
+    async def index_pop(self, index_key: str) -> set:
+        return self._index.pop(index_key, set())
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._index.clear()
+
+    async def eviction_count(self) -> int:
+        return self.evictions
+
+
+class RedisCacheBackend:
+    """Shared cache on any Redis-protocol server (redis.asyncio client or a fake)"""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        await self.client.set(key, value, ex=ttl_seconds)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*keys)
+
+    async def index_add(self, index_key: str, key: str, ttl_seconds: int) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.sadd(index_key, key)
+            pipe.expire(index_key, ttl_seconds)
+            await pipe.execute()
+
+    async def index_pop(self, index_key: str) -> set:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.smembers(index_key)
+            pipe.delete(index_key)
+            members, _ = await pipe.execute()
+        return {m.decode() if isinstance(m, bytes) else m for m in members}
+
+    async def clear(self) -> None:
+        batch = []
+        async for key in self.client.scan_iter(match=f"{KEY_PREFIX}*", count=1000):
+            batch.append(key)
+            if len(batch) >= 1000:
+                await self.client.delete(*batch)
+                batch = []
+        if batch:
+            await self.client.delete(*batch)
+
+    async def eviction_count(self) -> int:
+        try:
+            info = await self.client.info("stats")
+        except Exception:  # fakes and restricted servers may not support INFO
+            return 0
+        return int(info.get("evicted_keys", 0))
+
+
+class NearbyCache:
+    """
+    Response cache for nearby searches.
+
+    Query coordinates are snapped to the center of a grid cell and the radius to
+    a bucket, so clients at roughly the same spot share entries. An entry holds
+    the candidate rows within superset_radius of the cell center, which every
+    request in the cell filters and ranks from its own point. Each entry is
+    filed under the index cells its search circle overlaps; a write at a point
+    invalidates only the entries filed under that point's cells.
+    """
+
+    def __init__(self, backend, ttl_seconds: int = 30, cell_degrees: float = 0.001):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.cell_degrees = cell_degrees
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def superset_radius(self, distance_meters: int) -> float:
+        """
+        Radius around a cell center covering the bucketed radius from anywhere in
+        the cell: bucket plus the cell's half-diagonal (with the longest meridian
+        degree, ~111.7 km), 0.5% for the in-memory index's spherical distances
+        and a meter of slack.
+        """
+        half_diagonal = self.cell_degrees / 2 * 111700.0 * math.sqrt(2)
+        return (radius_bucket(distance_meters) + half_diagonal) * 1.005 + 1.0
+
+    def snap(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        """Center of the cache cell containing the point"""
+        x, y = _cell(latitude, longitude, self.cell_degrees)
+        return (
+            round((y + 0.5) * self.cell_degrees, 7),
+            round((x + 0.5) * self.cell_degrees, 7),
+        )
+
+    @staticmethod
+    def key(latitude: float, longitude: float, distance_meters: int, **params) -> str:
+        extra = ":".join(f"{name}={params[name]}" for name in sorted(params))
+        return f"{KEY_PREFIX}{latitude}:{longitude}:{distance_meters}:{extra}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, latitude: float, longitude: float, distance_meters: int) -> None:
+        await self.backend.set(key, value, self.ttl_seconds)
+        for index_key in _covering_index_keys(latitude, longitude, distance_meters):
+            await self.backend.index_add(index_key, key, self.ttl_seconds)
+
+    async def invalidate_point(self, latitude: float, longitude: float) -> None:
+        """Drop every cached search whose circle may contain this point"""
+        for size in INDEX_LEVELS:
+            keys = await self.backend.index_pop(_index_key(size, _cell(latitude, longitude, size)))
+            if keys:
+                await self.backend.delete(*keys)
+                self.invalidations += len(keys)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    async def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": await self.backend.eviction_count(),
+            "invalidations": self.invalidations,
+        }
+
+
+def encode_candidates(rows: List[LocationRow]) -> bytes:
+    return orjson.dumps([list(row) for row in rows])
+
+
+def decode_candidates(value: bytes) -> List[list]:
+    return orjson.loads(value)
+
+
+def rank_candidates(
+    candidates: List[list],
+    latitude: float,
+    longitude: float,
+    distance_meters: int,
+    skip: int = 0,
+    limit: int = 10,
+    after: Optional[Tuple[float, int]] = None,
+    distances_from: Callable = spheroid_distance_meters
+) -> List[Tuple[LocationRow, float]]:
+    """
+    One page of a nearby search answered from cached candidate rows: distances
+    from the client's own point (distances_from: the metric of the path that
+    serves the query uncached), the exact radius, then (distance, id) order and
+    the keyset/offset window on distances rounded like that path's.
+    """
+    if not candidates:
+        return []
+    ids = np.array([c[0] for c in candidates], dtype=np.int64)
+    exact = distances_from(latitude, longitude, [c[3] for c in candidates], [c[4] for c in candidates])
+    distances = np.round(exact, KEYSET_DISTANCE_DECIMALS)
+
+    keep = exact <= distance_meters
+    if after is not None:
+        after_distance, after_id = after
+        keep &= (distances > after_distance) | ((distances == after_distance) & (ids > after_id))
+    selected = np.flatnonzero(keep)
+    order = selected[np.lexsort((ids[selected], distances[selected]))][skip:skip + limit]
+
+    page = []
+    for i in order.tolist():
+        values = candidates[i]
+        row = LocationRow(
+            *values[:5], datetime.fromisoformat(values[5]), datetime.fromisoformat(values[6]), *values[7:]
+        )
+        page.append((row, float(distances[i])))
+    return page
+
+
+def build_nearby_cache(settings: Settings) -> Optional[NearbyCache]:
+    """Cache selected by CACHE_BACKEND (none, memory or redis)"""
+    if settings.cache_backend == "none":
+        return None
+    if settings.cache_backend == "redis":
+        import redis.asyncio as redis  # optional dependency, only needed for this backend
+        backend = RedisCacheBackend(redis.from_url(settings.cache_redis_url))
+    else:
+        backend = LRUCacheBackend(settings.cache_max_entries)
+    return NearbyCache(backend, settings.cache_ttl_seconds, settings.cache_cell_degrees)
@@ -0,0 +1,138 @@
+import os
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    """Read a boolean flag from the environment (1/true/yes/on)"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer from the environment"""
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float from the environment"""
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_list(name: str) -> list:
+    """Read a comma-separated list from the environment"""
+    return [item.strip() for item in os.getenv(name, "").split(",") if item.strip()]
+
+
+def to_async_url(url: str) -> str:
+    """Database URL rewritten for the asyncpg driver"""
+    scheme, _, rest = url.partition("://")
+    return f"postgresql+asyncpg://{rest}" if scheme.startswith("postgres") else url
+
+
+class Settings:
+    """Application settings, read once from environment variables"""
+
+    PRE_PING_STRATEGIES = ("always", "idle", "never")
+    CACHE_BACKENDS = ("none", "memory", "redis")
+    READ_ENGINES = ("postgis", "memory")
+    PLAN_CACHE_MODES = ("auto", "force_generic_plan", "force_custom_plan")
+
+    def __init__(self):
+        self.database_url = os.getenv("DATABASE_URL")
+        # Serve requests through asyncpg/AsyncSession instead of the psycopg2 threadpool path
+        self.async_db = _env_bool("ASYNC_DB", False)
+
+        # Connection pool (per worker process)
+        self.pool_size = _env_int("DB_POOL_SIZE", 5)
+        self.max_overflow = _env_int("DB_MAX_OVERFLOW", 10)
+        self.pool_timeout = _env_float("DB_POOL_TIMEOUT", 30.0)
+        self.pool_recycle = _env_int("DB_POOL_RECYCLE", 1800)  # seconds, -1 disables
+        # always: ping on every checkout, idle: only after DB_PRE_PING_IDLE_SECONDS unused, never: no ping
+        self.pre_ping = os.getenv("DB_PRE_PING", "idle").strip().lower()
+        self.pre_ping_idle_seconds = _env_float("DB_PRE_PING_IDLE_SECONDS", 60.0)
+        self.statement_timeout_ms = _env_int("DB_STATEMENT_TIMEOUT_MS", 0)  # 0 disables
+        # External PgBouncer (transaction pooling): no app-side pool, no startup options
+        self.pgbouncer = _env_bool("DB_PGBOUNCER", False)
+        # SQLAlchemy compiled SQL cache (per engine) and, on the asyncpg path, server-side
+        # prepared statements kept per connection (ignored with DB_PGBOUNCER); 0 disables
+        self.query_cache_size = _env_int("DB_QUERY_CACHE_SIZE", 500)
+        self.prepared_statement_cache_size = _env_int("DB_PREPARED_STATEMENT_CACHE_SIZE", 100)
+        # How Postgres plans prepared statements: auto re-plans the first five executions,
+        # then keeps a generic plan unless it estimates worse than the custom ones
+        self.plan_cache_mode = os.getenv("DB_PLAN_CACHE_MODE", "auto").strip().lower()
+
+        # Streaming replicas serving reads (comma-separated URLs, empty = primary only).
+        # Replicas lagging more than REPLICA_MAX_LAG_SECONDS are skipped; health and lag
+        # are re-probed every REPLICA_CHECK_SECONDS
+        self.replica_urls = _env_list("DATABASE_REPLICA_URLS")
+        self.replica_max_lag_seconds = _env_float("REPLICA_MAX_LAG_SECONDS", 5.0)
+        self.replica_check_seconds = _env_float("REPLICA_CHECK_SECONDS", 2.0)
+
+        # Nearby search response cache
+        self.cache_backend = os.getenv("CACHE_BACKEND", "none").strip().lower()
+        self.cache_ttl_seconds = _env_int("CACHE_TTL_SECONDS", 30)
+        self.cache_max_entries = _env_int("CACHE_MAX_ENTRIES", 10000)
+        self.cache_cell_degrees = _env_float("CACHE_CELL_DEGREES", 0.001)  # ~110 m
+        self.cache_redis_url = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+        # Exact pagination counts cached per query fingerprint, 0 disables
+        self.count_cache_ttl_seconds = _env_float("COUNT_CACHE_TTL_SECONDS", 10.0)
+        self.count_cache_max_entries = _env_int("COUNT_CACHE_MAX_ENTRIES", 1000)
+
+        # Per-request DB metrics at /metrics and slow query logging
+        self.instrumentation = _env_bool("INSTRUMENTATION", True)
+        self.slow_query_ms = _env_float("SLOW_QUERY_MS", 500.0)  # 0 disables the slow query log
+        # Log the plan of slow SELECTs (plain EXPLAIN: planned only, never executed again)
+        self.slow_query_explain = _env_bool("SLOW_QUERY_EXPLAIN", False)
+
+        # Cache-Control on location reads (ETag-validated). The no-cache default makes
+        # caches revalidate every time (304 without a body when unchanged); a max-age
+        # lets a CDN answer repeats itself, at the cost of serving data up to that stale
+        self.location_cache_control = os.getenv("LOCATION_CACHE_CONTROL", "no-cache")
+        self.search_cache_control = os.getenv("SEARCH_CACHE_CONTROL", "no-cache")
+
+        # /locations/bbox: viewports zoomed out below this level are clustered, on a grid
+        # of BBOX_CLUSTER_GRID x BBOX_CLUSTER_GRID cells across the viewport
+        self.bbox_cluster_below_zoom = _env_int("BBOX_CLUSTER_BELOW_ZOOM", 12)
+        self.bbox_cluster_grid = _env_int("BBOX_CLUSTER_GRID", 32)
+
+        # /tiles/{z}/{x}/{y}.mvt: below TILE_FULL_DETAIL_ZOOM keep one feature per
+        # TILE_THIN_PIXELS px cell; TILE_CACHE_DIR enables the on-disk tile cache
+        self.tile_full_detail_zoom = _env_int("TILE_FULL_DETAIL_ZOOM", 14)
+        self.tile_thin_pixels = _env_int("TILE_THIN_PIXELS", 4)
+        self.tile_cache_dir = os.getenv("TILE_CACHE_DIR", "")
+        self.tile_max_age_seconds = _env_int("TILE_MAX_AGE_SECONDS", 60)
+
+        # Engine answering nearby/nearest reads: postgis, or an in-process replica (memory)
+        self.read_engine = os.getenv("READ_ENGINE", "postgis").strip().lower()
+        self.memory_index_cell_degrees = _env_float("MEMORY_INDEX_CELL_DEGREES", 0.01)
+        self.memory_index_poll_seconds = _env_float("MEMORY_INDEX_POLL_SECONDS", 5.0)
+        self.memory_index_reload_seconds = _env_float("MEMORY_INDEX_RELOAD_SECONDS", 300.0)
+
+        if self.pre_ping not in self.PRE_PING_STRATEGIES:
+            raise ValueError(
+                f"DB_PRE_PING must be one of {', '.join(self.PRE_PING_STRATEGIES)}, got {self.pre_ping!r}"
+            )
+        if self.plan_cache_mode not in self.PLAN_CACHE_MODES:
+            raise ValueError(
+                f"DB_PLAN_CACHE_MODE must be one of {', '.join(self.PLAN_CACHE_MODES)}, got {self.plan_cache_mode!r}"
+            )
+        if self.cache_backend not in self.CACHE_BACKENDS:
+            raise ValueError(
+                f"CACHE_BACKEND must be one of {', '.join(self.CACHE_BACKENDS)}, got {self.cache_backend!r}"
+            )
+        if self.read_engine not in self.READ_ENGINES:
+            raise ValueError(
+                f"READ_ENGINE must be one of {', '.join(self.READ_ENGINES)}, got {self.read_engine!r}"
+            )
+
+    @property
+    def async_database_url(self) -> str:
+        """DATABASE_URL rewritten for the asyncpg driver"""
+        return to_async_url(self.database_url)
+
+
+settings = Settings()
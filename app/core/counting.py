@@ -0,0 +1,54 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.explain import explain_plan
+
+
+def statement_fingerprint(statement) -> str:
+    """Stable key for a statement: its SQL text plus bound parameter values"""
+    compiled = statement.compile(dialect=postgresql.dialect())
+    params = sorted((key, str(value)) for key, value in compiled.params.items())
+    return hashlib.sha1(f"{compiled}|{params}".encode()).hexdigest()
+
+
+def estimate_rows(db, statement) -> int:
+    """Planner row estimate for a statement - no rows are read"""
+    return int(explain_plan(db, statement)["Plan"]["Plan Rows"])
+
+
+class CountCache:
+    """In-process TTL cache of exact counts keyed by statement fingerprint (thread-safe)"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, total = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return total
+
+    def set(self, key: str, total: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, total)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -1,17 +1,67 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-import os
+from app.core.config import settings, to_async_url
+from app.core.pooling import engine_options, install_idle_pre_ping
+from app.core.instrumentation import install_query_instrumentation
+from app.core.replicas import Replica, ReplicaRouter
 
 # Read from .env (development only - use proper config in production)
-DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_URL = settings.database_url
 
-# GeoAlchemy requires async engine for spatial operations
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    connect_args={"options": "-c timezone=utc"}
-)
+# Pool size, recycle, pre-ping and statement_timeout come from settings (DB_* env vars)
+engine = create_engine(DATABASE_URL, **engine_options(settings))
+install_idle_pre_ping(engine, settings)
+install_query_instrumentation(engine, settings)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+# Async engine is only built when enabled so the sync path doesn't need asyncpg installed
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.async_db:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_engine = create_async_engine(
+        settings.async_database_url,
+        **engine_options(settings, is_async=True)
+    )
+    install_idle_pre_ping(async_engine.sync_engine, settings)
+    install_query_instrumentation(async_engine.sync_engine, settings)
+    # expire_on_commit=False: returned ORM rows are read after the session commits
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+def _build_replica(index: int, url: str) -> Replica:
+    """Sync (and, with ASYNC_DB, async) engine and session factories for one replica"""
+    replica_engine = create_engine(url, **engine_options(settings))
+    install_idle_pre_ping(replica_engine, settings)
+    install_query_instrumentation(replica_engine, settings)
+    replica = Replica(
+        f"replica-{index}", replica_engine,
+        sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    )
+
+    if settings.async_db:
+        replica.async_engine = create_async_engine(to_async_url(url), **engine_options(settings, is_async=True))
+        install_idle_pre_ping(replica.async_engine.sync_engine, settings)
+        install_query_instrumentation(replica.async_engine.sync_engine, settings)
+        replica.async_session_factory = async_sessionmaker(
+            replica.async_engine, autoflush=False, expire_on_commit=False
+        )
+    return replica
+
+
+# Reads are spread over DATABASE_REPLICA_URLS when set; writes always use engine above
+replica_router = None
+
+if settings.replica_urls:
+    replica_router = ReplicaRouter(
+        [_build_replica(i, url) for i, url in enumerate(settings.replica_urls)],
+        max_lag_seconds=settings.replica_max_lag_seconds,
+        check_seconds=settings.replica_check_seconds
+    )
@@ -1,5 +1,14 @@
 from sqlalchemy.orm import Session
-from app.core.database import SessionLocal
+from app.core.config import settings
+from app.core.cache import build_nearby_cache
+from app.core.tiles import build_tile_cache
+from app.core.counting import CountCache
+from app.core.database import SessionLocal, AsyncSessionLocal, replica_router
+from app.core.replicas import wants_primary
+from app.repositories.async_location_repository import AsyncLocationRepository
+from app.repositories.memory_location_index import MemoryLocationIndex
+from fastapi import Depends, Request
+from sqlalchemy.exc import OperationalError
 
 
 def get_db():
@@ -12,3 +21,114 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Async database session dependency (asyncpg).
+    Ensures session is properly closed after request.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Config switch: ASYNC_DB=true serves requests on AsyncSession, otherwise the sync Session
+get_session = get_async_db if settings.async_db else get_db
+
+
+def _read_replica(request: Request):
+    """Replica for this read, or None when it must (or can only) go to the primary"""
+    if replica_router is None or wants_primary(request):
+        return None
+    return replica_router.pick()
+
+
+def get_read_db(request: Request):
+    """
+    Session for read-only work: a healthy replica within the lag tolerance, else the primary.
+    A replica whose connection fails is taken out of rotation until its next good probe.
+    """
+    replica = _read_replica(request)
+    db = replica.session_factory() if replica is not None else SessionLocal()
+    try:
+        yield db
+    except OperationalError:
+        if replica is not None:
+            replica_router.mark_failed(replica)
+        raise
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    """Async (asyncpg) variant of get_read_db"""
+    replica = _read_replica(request)
+    factory = replica.async_session_factory if replica is not None else AsyncSessionLocal
+    async with factory() as db:
+        try:
+            yield db
+        except OperationalError:
+            if replica is not None:
+                replica_router.mark_failed(replica)
+            raise
+
+
+get_read_session = get_async_read_db if settings.async_db else get_read_db
+
+
+def read_session_factory(request: Request):
+    """Sync session factory for reads that open their own sessions (streaming export)"""
+    replica = _read_replica(request)
+    return replica.session_factory if replica is not None else SessionLocal
+
+
+def get_replica_router():
+    """Replica router, or None when every query goes to the primary"""
+    return replica_router
+
+
+# Exact pagination counts, shared by all requests of this worker process
+count_cache = (
+    CountCache(settings.count_cache_ttl_seconds, settings.count_cache_max_entries)
+    if settings.count_cache_ttl_seconds > 0 else None
+)
+
+
+def get_location_repository(db=Depends(get_session)) -> AsyncLocationRepository:
+    """Awaitable LocationRepository bound to the configured session type"""
+    return AsyncLocationRepository(db, count_cache)
+
+
+def get_read_location_repository(db=Depends(get_read_session)) -> AsyncLocationRepository:
+    """get_location_repository for read-only routes: may be bound to a replica"""
+    return AsyncLocationRepository(db, count_cache)
+
+
+# One cache per worker process, selected by CACHE_BACKEND
+nearby_cache = build_nearby_cache(settings)
+
+
+def get_nearby_cache():
+    """Nearby search response cache, or None when caching is disabled"""
+    return nearby_cache
+
+
+# On-disk vector tile cache when TILE_CACHE_DIR is set (shared by worker processes)
+tile_cache = build_tile_cache(settings)
+
+
+def get_tile_cache():
+    """Vector tile cache, or None when tiles are always rendered"""
+    return tile_cache
+
+
+# In-process replica for nearby/nearest reads when READ_ENGINE=memory (loaded at startup)
+memory_index = (
+    MemoryLocationIndex(settings.memory_index_cell_degrees)
+    if settings.read_engine == "memory" else None
+)
+
+
+def get_memory_index():
+    """In-memory read index, or None when reads go to PostGIS"""
+    return memory_index
@@ -0,0 +1,30 @@
+import json
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) wrapper that keeps the inner statement's bind parameters"""
+    inherit_cache = False
+
+    def __init__(self, statement, analyze: bool = False, buffers: bool = False):
+        self.statement = statement
+        self.analyze = analyze
+        self.buffers = buffers
+
+
+@compiles(Explain, 'postgresql')
+def _compile_explain(element, compiler, **kw):
+    options = ["FORMAT JSON"]
+    if element.analyze:
+        options.append("ANALYZE")
+    if element.buffers:
+        options.append("BUFFERS")
+    return f"EXPLAIN ({', '.join(options)}) " + compiler.process(element.statement, **kw)
+
+
+def explain_plan(db, statement, analyze: bool = False, buffers: bool = False) -> dict:
+    """Top-level plan dict ({"Plan": ..., "Execution Time": ...}) for a statement"""
+    raw = db.execute(Explain(statement, analyze=analyze, buffers=buffers)).scalar()
+    return (raw if isinstance(raw, list) else json.loads(raw))[0]
@@ -0,0 +1,118 @@
+"""
+Minimal streaming FlatGeobuf writer for Point layers (https://flatgeobuf.org/).
+
+Writes the header without a spatial index and with an unknown feature count,
+so features can be emitted as rows arrive instead of buffering the layer.
+"""
+import struct
+from typing import List, Sequence, Tuple
+
+try:
+    import flatbuffers  # optional: only needed for FlatGeobuf export
+except ImportError:
+    flatbuffers = None
+
+MAGIC = b"fgb\x03fgb\x00"
+
+GEOMETRY_TYPE_POINT = 1
+
+# ColumnType enum values from the FlatGeobuf schema
+COLUMN_LONG = 7
+COLUMN_DOUBLE = 10
+COLUMN_STRING = 11
+COLUMN_DATETIME = 13
+
+# Number of fields per table in the schema (vtable sizes)
+_HEADER_FIELDS, _COLUMN_FIELDS, _CRS_FIELDS, _FEATURE_FIELDS, _GEOMETRY_FIELDS = 14, 11, 6, 3, 8
+
+
+def available() -> bool:
+    return flatbuffers is not None
+
+
+class FlatGeobufWriter:
+    """Encode a header and then one size-prefixed Feature per row"""
+
+    def __init__(self, columns: Sequence[Tuple[str, int]], name: str = "locations", srid: int = 4326):
+        if flatbuffers is None:
+            raise RuntimeError("FlatGeobuf export requires the flatbuffers package")
+        self.columns = list(columns)
+        self.name = name
+        self.srid = srid
+
+    def header(self) -> bytes:
+        builder = flatbuffers.Builder(1024)
+        name = builder.CreateString(self.name)
+
+        column_offsets = []
+        for column_name, column_type in self.columns:
+            column_name_offset = builder.CreateString(column_name)
+            builder.StartObject(_COLUMN_FIELDS)
+            builder.PrependUOffsetTRelativeSlot(0, column_name_offset, 0)
+            builder.PrependUint8Slot(1, column_type, 0)
+            column_offsets.append(builder.EndObject())
+
+        builder.StartVector(4, len(column_offsets), 4)
+        for offset in reversed(column_offsets):
+            builder.PrependUOffsetTRelative(offset)
+        columns = builder.EndVector()
+
+        org = builder.CreateString("EPSG")
+        builder.StartObject(_CRS_FIELDS)
+        builder.PrependUOffsetTRelativeSlot(0, org, 0)
+        builder.PrependInt32Slot(1, self.srid, 0)
+        crs = builder.EndObject()
+
+        builder.StartObject(_HEADER_FIELDS)
+        builder.PrependUOffsetTRelativeSlot(0, name, 0)
+        builder.PrependUint8Slot(2, GEOMETRY_TYPE_POINT, 0)
+        builder.PrependUOffsetTRelativeSlot(7, columns, 0)
+        builder.PrependUint64Slot(8, 0, 0)  # feature count unknown while streaming
+        builder.PrependUint16Slot(9, 0, 16)  # index_node_size 0: no spatial index
+        builder.PrependUOffsetTRelativeSlot(10, crs, 0)
+        builder.FinishSizePrefixed(builder.EndObject())
+        return MAGIC + bytes(builder.Output())
+
+    def _properties(self, values: Sequence) -> bytes:
+        """Column-index-tagged property values; None values are left out"""
+        parts: List[bytes] = []
+        for index, ((_, column_type), value) in enumerate(zip(self.columns, values)):
+            if value is None:
+                continue
+            if column_type == COLUMN_LONG:
+                parts.append(struct.pack("<Hq", index, value))
+            elif column_type == COLUMN_DOUBLE:
+                parts.append(struct.pack("<Hd", index, value))
+            else:
+                if column_type == COLUMN_DATETIME:
+                    value = value.isoformat()
+                encoded = value.encode("utf-8")
+                parts.append(struct.pack("<HI", index, len(encoded)) + encoded)
+        return b"".join(parts)
+
+    def feature(self, x: float, y: float, values: Sequence) -> bytes:
+        builder = flatbuffers.Builder(256)
+        properties = builder.CreateByteVector(self._properties(values))
+
+        builder.StartVector(8, 2, 8)
+        builder.PrependFloat64(y)
+        builder.PrependFloat64(x)
+        xy = builder.EndVector()
+
+        builder.StartObject(_GEOMETRY_FIELDS)
+        builder.PrependUOffsetTRelativeSlot(1, xy, 0)
+        geometry = builder.EndObject()
+
+        builder.StartObject(_FEATURE_FIELDS)
+        builder.PrependUOffsetTRelativeSlot(0, geometry, 0)
+        builder.PrependUOffsetTRelativeSlot(1, properties, 0)
+        builder.FinishSizePrefixed(builder.EndObject())
+        return bytes(builder.Output())
+
+    def features(self, coordinates, rows: Sequence[Sequence]) -> bytes:
+        """Encode a batch: coordinates are (x, y) pairs, rows the matching column values"""
+        return b"".join(
+            self.feature(x, y, values)
+            for (x, y), values in zip(coordinates, rows)
+        )
+
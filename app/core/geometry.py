@@ -1,9 +1,11 @@
-from typing import Dict, Tuple
+from typing import Dict, Sequence, Tuple
+import numpy as np
 from shapely.geometry import Point
 from shapely import wkt, wkb
 from geoalchemy2.shape import to_shape, from_shape
 from geoalchemy2.elements import WKTElement, WKBElement
 import json
+import math
 
 
 def point_to_geojson(point: Point) -> Dict:
@@ -61,3 +63,87 @@ def validate_geojson_point(geojson: Dict) -> bool:
         )
     except (TypeError, KeyError):
         return False
+
+
+# ---- GeoJSON point decoding for the bulk import ------------------------------
+
+def _geojson_pair(geometry) -> Tuple[float, float]:
+    try:
+        if geometry.get("type") == "Point":
+            longitude, latitude = geometry["coordinates"][:2]
+            return float(longitude), float(latitude)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        pass
+    return math.nan, math.nan
+
+
+def geojson_to_coordinates(geometries: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (N, 2) longitude/latitude array plus a validity mask for GeoJSON geometries.
+    Entries that are not Points, are malformed or out of range are masked out.
+    The pairs come out of the parsed dicts one by one; only the type/range
+    checks run as array operations.
+    """
+    coordinates = np.array([_geojson_pair(g) for g in geometries], dtype=float).reshape(-1, 2)
+    with np.errstate(invalid="ignore"):
+        valid = (
+            (np.abs(coordinates[:, 0]) <= 180)
+            & (np.abs(coordinates[:, 1]) <= 90)
+        )
+    return coordinates, valid
+
+
+# ---- Spheroid distances for the nearby cache -----------------------------------
+
+# WGS84 ellipsoid, as used by PostGIS geography
+_WGS84_A = 6378137.0
+_WGS84_F = 1 / 298.257223563
+_WGS84_B = _WGS84_A * (1 - _WGS84_F)
+
+
+def spheroid_distance_meters(latitude: float, longitude: float, latitudes, longitudes) -> np.ndarray:
+    """
+    Vectorised Vincenty inverse: WGS84 distances in meters from one point to
+    arrays of points. Agrees with PostGIS geography ST_Distance to well under a
+    millimeter away from near-antipodal pairs (irrelevant at search radii).
+    """
+    lat2 = np.radians(np.asarray(latitudes, dtype=float))
+    lng2 = np.radians(np.asarray(longitudes, dtype=float))
+    f, a, b = _WGS84_F, _WGS84_A, _WGS84_B
+
+    u1 = math.atan((1 - f) * math.tan(math.radians(latitude)))
+    u2 = np.arctan((1 - f) * np.tan(lat2))
+    sin_u1, cos_u1 = math.sin(u1), math.cos(u1)
+    sin_u2, cos_u2 = np.sin(u2), np.cos(u2)
+    big_l = lng2 - math.radians(longitude)
+
+    lam = big_l.copy()
+    for _ in range(200):
+        sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+        sin_sigma = np.hypot(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)
+        cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+        sigma = np.arctan2(sin_sigma, cos_sigma)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sin_alpha = np.where(sin_sigma == 0, 0.0, cos_u1 * cos_u2 * sin_lam / sin_sigma)
+            cos2_alpha = 1 - sin_alpha ** 2
+            # Both points on the equator: cos2_alpha is 0 and the term drops out
+            cos_2sm = np.where(cos2_alpha == 0, 0.0, cos_sigma - 2 * sin_u1 * sin_u2 / cos2_alpha)
+        c = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+        updated = big_l + (1 - c) * f * sin_alpha * (
+            sigma + c * sin_sigma * (cos_2sm + c * cos_sigma * (-1 + 2 * cos_2sm ** 2))
+        )
+        # Freeze each pair once it converges, so its distance does not depend on
+        # which other points share the array
+        active = np.abs(updated - lam) >= 1e-12
+        lam = np.where(active, updated, lam)
+        if not active.any():
+            break
+
+    u_sq = cos2_alpha * (a ** 2 - b ** 2) / b ** 2
+    big_a = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+    big_b = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+    delta_sigma = big_b * sin_sigma * (cos_2sm + big_b / 4 * (
+        cos_sigma * (-1 + 2 * cos_2sm ** 2)
+        - big_b / 6 * cos_2sm * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sm ** 2)
+    ))
+    return b * big_a * (sigma - delta_sigma)
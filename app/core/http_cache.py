@@ -0,0 +1,58 @@
+import hashlib
+from typing import Iterable, Optional
+
+from app.models.location import LocationRow
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=12).hexdigest()
+
+
+def strong_etag(*parts) -> str:
+    return f'"{_digest(":".join(map(str, parts)))}"'
+
+
+def weak_etag(*parts) -> str:
+    return f'W/{strong_etag(*parts)}'
+
+
+def location_etag(row: LocationRow) -> str:
+    """Strong ETag for one location: its id and updated_at (bumped on every write)"""
+    return strong_etag(row.id, row.updated_at.isoformat())
+
+
+def results_etag(rows: Iterable[LocationRow], *extra) -> str:
+    """
+    Weak ETag for a list of results: the ids in order and the newest updated_at.
+    Weak because the body also carries values derived from the query (distances,
+    cursors, totals) that are only equivalent, not byte-identical, across encoders.
+    """
+    ids = []
+    newest = None
+    for row in rows:
+        ids.append(row.id)
+        if newest is None or row.updated_at > newest:
+            newest = row.updated_at
+    return weak_etag(",".join(map(str, ids)), newest.isoformat() if newest else "-", *extra)
+
+
+def _opaque(tag: str) -> str:
+    """Weak comparison (RFC 9110): W/"x" and "x" match"""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True when an If-None-Match header lists this ETag (or is *)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return _opaque(etag) in (_opaque(tag) for tag in if_none_match.split(","))
+
+
+def cache_headers(etag: str, cache_control: str) -> dict:
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return headers
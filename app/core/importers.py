@@ -0,0 +1,240 @@
+import codecs
+import csv
+import json
+import time
+from enum import Enum
+from itertools import islice
+from typing import IO, Iterator, List, Optional, Tuple
+
+from app.core.geometry import geojson_to_coordinates
+from app.core.spatial import validate_coordinates
+
+# Features decoded per vectorised geometry pass in GeoJSON imports
+GEOJSON_CHUNK_SIZE = 10_000
+
+# Bytes per read when checking an upload's encoding before it is imported
+CHECK_CHUNK_SIZE = 1 << 20
+
+# (name, description, category, longitude, latitude) - the column order COPY expects
+ImportRecord = Tuple[str, Optional[str], Optional[str], float, float]
+
+
+class ImportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+    geojson = "geojson"
+
+
+class ImportStats:
+    """Counts rows that could not be parsed or failed validation"""
+
+    def __init__(self):
+        self.rejected = 0
+
+
+class InvalidDocument(ValueError):
+    """The upload as a whole cannot be read: bad encoding, truncated or wrongly shaped"""
+
+
+def _clean_name(name) -> str:
+    name = (name or "").strip()
+    if not 1 <= len(name) <= 100:
+        raise ValueError("name must be 1-100 characters")
+    return name
+
+
+def _clean_text(value, field: str, max_length: Optional[int] = None) -> Optional[str]:
+    """Optional string column: empty -> None, anything but a string is rejected"""
+    if value is None or value == "":
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"{field} must be a string")
+    if max_length is not None and len(value) > max_length:
+        raise ValueError(f"{field} must be at most {max_length} characters")
+    return value
+
+
+def _record(name, description, category, longitude, latitude) -> ImportRecord:
+    """Validate and normalise one row, mirroring LocationCreate constraints"""
+    name = _clean_name(name)
+    longitude, latitude = float(longitude), float(latitude)
+    if not validate_coordinates(latitude, longitude):
+        raise ValueError("coordinates out of range")
+    return (
+        name, _clean_text(description, "description"), _clean_text(category, "category", 50),
+        longitude, latitude
+    )
+
+
+def _from_feature(feature: dict) -> ImportRecord:
+    """GeoJSON Feature with a Point geometry -> record"""
+    geometry = feature.get("geometry") or {}
+    if geometry.get("type") != "Point":
+        raise ValueError("geometry must be a Point")
+    longitude, latitude = geometry["coordinates"][:2]
+    properties = feature.get("properties") or {}
+    return _record(
+        properties.get("name"), properties.get("description"), properties.get("category"),
+        longitude, latitude
+    )
+
+
+def _from_features(features: List[dict], stats: ImportStats) -> Iterator[ImportRecord]:
+    """A chunk of GeoJSON Features -> records, with geometries decoded and range-checked in one pass"""
+    geometries = [feature.get("geometry") if isinstance(feature, dict) else None for feature in features]
+    coordinates, valid = geojson_to_coordinates(geometries)
+
+    for feature, (longitude, latitude), ok in zip(features, coordinates.tolist(), valid.tolist()):
+        if not ok:
+            stats.rejected += 1
+            continue
+        properties = feature.get("properties") or {}
+        try:
+            yield (
+                _clean_name(properties.get("name")),
+                _clean_text(properties.get("description"), "description"),
+                _clean_text(properties.get("category"), "category", 50),
+                longitude, latitude
+            )
+        except (AttributeError, TypeError, ValueError):
+            stats.rejected += 1
+
+
+def _from_object(obj: dict) -> ImportRecord:
+    """NDJSON line: either a LocationCreate-shaped object or a GeoJSON Feature"""
+    if obj.get("type") == "Feature":
+        return _from_feature(obj)
+    return _record(
+        obj.get("name"), obj.get("description"), obj.get("category"), obj["longitude"], obj["latitude"]
+    )
+
+
+def _iter_ndjson(stream: IO[bytes]) -> Iterator[bytes]:
+    for line in stream:
+        if line.strip():
+            yield line
+
+
+def _from_ndjson_line(line: bytes) -> ImportRecord:
+    # Decoded per line, so bad UTF-8 rejects that line only
+    return _from_object(json.loads(line.decode("utf-8")))
+
+
+def _iter_csv(stream: IO[bytes]) -> Iterator[dict]:
+    yield from csv.DictReader(codecs.getreader("utf-8")(stream))
+
+
+def _iter_geojson(stream: IO[bytes]) -> Iterator[dict]:
+    try:
+        import ijson  # optional: stream features without loading the whole document
+    except ImportError:
+        document = json.load(stream)
+        _check_collection(document)
+        yield from document.get("features", [])
+        return
+    yield from ijson.items(stream, "features.item", use_float=True)
+
+
+def _check_collection(document) -> None:
+    if not isinstance(document, dict) or not isinstance(document.get("features", []), list):
+        raise InvalidDocument("GeoJSON body must be an object with a features array")
+
+
+def _document_errors() -> tuple:
+    """Exceptions that mean the document itself is unreadable"""
+    errors = (UnicodeDecodeError, json.JSONDecodeError, csv.Error)
+    try:
+        import ijson
+    except ImportError:
+        return errors
+    return errors + (ijson.JSONError,)
+
+
+def _unreadable(fmt: ImportFormat, exc: Exception) -> InvalidDocument:
+    # Parser messages can span lines (yajl points at the offset); keep one line
+    return InvalidDocument(f"Unreadable {fmt.value} document: {' '.join(str(exc).split())}")
+
+
+def check_document(stream: IO[bytes], fmt: ImportFormat) -> None:
+    """
+    Read a seekable upload once before anything is imported and raise InvalidDocument
+    if it cannot be parsed as a whole: GeoJSON must be one complete object with a
+    features array, CSV must be UTF-8. NDJSON is checked per line while importing.
+    Leaves the stream at its start.
+    """
+    try:
+        if fmt == ImportFormat.geojson:
+            try:
+                import ijson
+            except ImportError:
+                return  # _iter_geojson loads and checks the whole document before yielding
+            events = ijson.parse(stream)
+            if next(events, (None, None, None))[1] != "start_map":
+                raise InvalidDocument("GeoJSON body must be an object with a features array")
+            for prefix, event, _ in events:
+                if prefix == "features" and event not in ("start_array", "end_array"):
+                    raise InvalidDocument("GeoJSON features must be an array")
+        elif fmt == ImportFormat.csv:
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            while chunk := stream.read(CHECK_CHUNK_SIZE):
+                decoder.decode(chunk)
+            decoder.decode(b"", final=True)
+    except _document_errors() as exc:
+        raise _unreadable(fmt, exc) from exc
+    finally:
+        stream.seek(0)
+
+
+def parse_records(stream: IO[bytes], fmt: ImportFormat, stats: ImportStats) -> Iterator[ImportRecord]:
+    """
+    Stream validated records out of a binary NDJSON, CSV or GeoJSON FeatureCollection
+    upload. Invalid rows are skipped and counted in stats.rejected; a document that
+    cannot be read at all raises InvalidDocument.
+    """
+    try:
+        if fmt == ImportFormat.geojson:
+            features = _iter_geojson(stream)
+            while chunk := list(islice(features, GEOJSON_CHUNK_SIZE)):
+                yield from _from_features(chunk, stats)
+            return
+
+        if fmt == ImportFormat.csv:
+            rows, convert = _iter_csv(stream), _from_object
+        else:
+            rows, convert = _iter_ndjson(stream), _from_ndjson_line
+
+        for row in rows:
+            try:
+                yield convert(row)
+            except (AttributeError, KeyError, TypeError, ValueError, IndexError):
+                # AttributeError: a line that is not an object, or a non-string name
+                stats.rejected += 1
+    except _document_errors() as exc:
+        raise _unreadable(fmt, exc) from exc
+
+
+def run_import(repo, stream: IO[bytes], fmt: ImportFormat, tolerance_meters: int = 10) -> dict:
+    """
+    Parse a stream and bulk load it through repo.bulk_import, with throughput stats.
+    A seekable stream is checked first, so an unreadable document raises
+    InvalidDocument before any batch is committed.
+    """
+    stats = ImportStats()
+    start = time.perf_counter()
+    if stream.seekable():
+        check_document(stream, fmt)
+
+    received, inserted = repo.bulk_import(
+        parse_records(stream, fmt, stats),
+        tolerance_meters=tolerance_meters
+    )
+
+    elapsed = time.perf_counter() - start
+    return {
+        "received": received,
+        "inserted": inserted,
+        "deduplicated": received - inserted,
+        "rejected": stats.rejected,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round((received + stats.rejected) / elapsed, 1) if elapsed else 0.0,
+    }
@@ -0,0 +1,215 @@
+import functools
+import inspect
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Bucket bounds (seconds / counts) for the exported histograms
+TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250, 1000, 10000, 100000)
+
+
+class Histogram:
+    """Labelled Prometheus histogram (cumulative buckets, _sum, _count), thread-safe"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            # Per-bucket counts, then sum and count
+            series = self._series.setdefault(labels, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for labels, values in sorted(series.items()):
+            label_text = ",".join(f'{name}="{value}"' for name, value in zip(self.label_names, labels))
+            prefix = label_text + "," if label_text else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {int(cumulative)}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {int(values[-1])}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {values[-2]}")
+            lines.append(f"{self.name}_count{{{label_text}}} {int(values[-1])}")
+        return lines
+
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Request latency", ("endpoint", "method"), TIME_BUCKETS)
+REQUEST_DB_SECONDS = Histogram(
+    "db_request_time_seconds", "Database time per request", ("endpoint",), TIME_BUCKETS)
+REQUEST_STATEMENTS = Histogram(
+    "db_statements_per_request", "SQL statements per request", ("endpoint",), COUNT_BUCKETS)
+REQUEST_ROWS_RETURNED = Histogram(
+    "db_rows_returned_per_request", "Rows returned by the database per request", ("endpoint",), COUNT_BUCKETS)
+REQUEST_ROWS_HYDRATED = Histogram(
+    "db_rows_hydrated_per_request", "ORM objects loaded per request", ("endpoint",), COUNT_BUCKETS)
+STATEMENT_SECONDS = Histogram(
+    "db_statement_duration_seconds", "SQL statement latency", ("endpoint", "repo_method"), TIME_BUCKETS)
+
+HISTOGRAMS = (
+    REQUEST_SECONDS, REQUEST_DB_SECONDS, REQUEST_STATEMENTS,
+    REQUEST_ROWS_RETURNED, REQUEST_ROWS_HYDRATED, STATEMENT_SECONDS,
+)
+
+
+class RequestStats:
+    """Database work done on behalf of one request (shared with threadpool workers)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.db_seconds = 0.0
+        self.statements = 0
+        self.rows_returned = 0
+        self.rows_hydrated = 0
+        self.statement_seconds: List[Tuple[str, float]] = []
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+_repo_method: ContextVar[str] = ContextVar("repo_method", default="none")
+
+
+def instrument_methods(cls):
+    """Class decorator tagging SQL issued inside each public method with Class.method"""
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(method):
+            continue
+
+        def wrap(method, tag):
+            @functools.wraps(method)
+            def tagged(*args, **kwargs):
+                token = _repo_method.set(tag)
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    _repo_method.reset(token)
+            return tagged
+
+        setattr(cls, name, wrap(method, f"{cls.__name__}.{name}"))
+    return cls
+
+
+def render_metrics() -> str:
+    """All histograms in the Prometheus text exposition format"""
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+def _explain_slow_statement(conn, statement: str, parameters) -> None:
+    """
+    Plain EXPLAIN of a slow SELECT inside a savepoint so failures can't poison the
+    transaction. Not ANALYZE: that would run the query again while the database is
+    already slow, and would execute side effects of SELECTs such as
+    location_insert_if_absent(...).
+    """
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return
+    explain_cursor = conn.connection.cursor()
+    try:
+        explain_cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            explain_cursor.execute("EXPLAIN " + statement, parameters)
+            plan = "\n".join(row[0] for row in explain_cursor.fetchall())
+            explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+            logger.warning("Slow query plan:\n%s", plan)
+        except Exception:
+            explain_cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            logger.exception("Could not EXPLAIN slow query")
+    finally:
+        explain_cursor.close()
+
+
+def install_query_instrumentation(engine, settings: Settings) -> None:
+    """
+    Time every statement on this engine into the current request's stats and
+    log statements slower than slow_query_ms (with their plan if slow_query_explain).
+    """
+    if not settings.instrumentation:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+        method = _repo_method.get()
+
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.db_seconds += elapsed
+            stats.statements += 1
+            stats.statement_seconds.append((method, elapsed))
+            if cursor.rowcount and cursor.rowcount > 0:
+                stats.rows_returned += cursor.rowcount
+
+        if settings.slow_query_ms and elapsed * 1000 >= settings.slow_query_ms:
+            logger.warning(
+                "Slow query %.1f ms in %s (%s): %s",
+                elapsed * 1000, method, stats.path if stats else "-", statement
+            )
+            if settings.slow_query_explain and not executemany:
+                _explain_slow_statement(conn, statement, parameters)
+
+
+@event.listens_for(Session, "loaded_as_persistent")
+def _count_hydrated(session, instance):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.rows_hydrated += 1
+
+
+class InstrumentationMiddleware:
+    """ASGI middleware collecting per-request latency and DB stats, labelled by route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope["path"])
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_stats.reset(token)
+            route = scope.get("route")
+            endpoint = getattr(route, "path", "unmatched")
+
+            REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint, scope["method"])
+            REQUEST_DB_SECONDS.observe(stats.db_seconds, endpoint)
+            REQUEST_STATEMENTS.observe(stats.statements, endpoint)
+            REQUEST_ROWS_RETURNED.observe(stats.rows_returned, endpoint)
+            REQUEST_ROWS_HYDRATED.observe(stats.rows_hydrated, endpoint)
+            for method, seconds in stats.statement_seconds:
+                STATEMENT_SECONDS.observe(seconds, endpoint, method)
@@ -0,0 +1,25 @@
+import base64
+import json
+from typing import Tuple
+
+# Nearby pages order and resume on distances rounded to this many decimals (1 cm).
+# PostGIS, the nearby cache and the memory index compute distances separately;
+# rounding keeps float-level differences between them out of a cursor issued by
+# one and resumed by another
+KEYSET_DISTANCE_DECIMALS = 2
+
+
+def encode_cursor(distance: float, location_id: int) -> str:
+    """Encode the (distance, id) keyset position of the last row as an opaque cursor"""
+    raw = json.dumps([distance, location_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """Decode an opaque cursor back into (distance, id). Raises ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        distance, location_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(distance), int(location_id)
+    except (TypeError, ValueError, json.JSONDecodeError) as exc:
+        raise ValueError("Invalid pagination cursor") from exc
@@ -0,0 +1,145 @@
+import threading
+import time
+import uuid
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool, NullPool
+from app.core.config import Settings
+
+
+class PoolMetrics:
+    """Checkout wait-time counters for one connection pool (per worker process)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+
+class _TimedCheckoutMixin:
+    """Records how long each checkout waited for a free connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.observe_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.observe_wait(time.perf_counter() - start)
+        return connection
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(settings: Settings, is_async: bool = False) -> dict:
+    """create_engine / create_async_engine keyword arguments for the configured pool"""
+    if settings.pgbouncer:
+        # PgBouncer does the pooling; it also rejects startup options, so timezone and
+        # statement_timeout must be set on the database role (ALTER ROLE ... SET ...)
+        # Prepared statements do not survive a transaction-pooled server connection
+        # handoff: no cache, and unique names so two clients never collide on one
+        options = {"poolclass": NullPool, "query_cache_size": settings.query_cache_size}
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        } if is_async else {}
+        return options
+
+    options = {
+        "query_cache_size": settings.query_cache_size,
+        "poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        "pool_size": settings.pool_size,
+        "max_overflow": settings.max_overflow,
+        "pool_timeout": settings.pool_timeout,
+        "pool_recycle": settings.pool_recycle,
+        "pool_pre_ping": settings.pre_ping == "always",
+    }
+
+    server_settings = {"timezone": "utc"}
+    if settings.statement_timeout_ms:
+        server_settings["statement_timeout"] = str(settings.statement_timeout_ms)
+    if settings.plan_cache_mode != "auto":
+        server_settings["plan_cache_mode"] = settings.plan_cache_mode
+
+    if is_async:
+        # asyncpg prepares every statement; the cache keeps the prepared (and after
+        # five runs possibly generic-planned) statement on its server connection
+        options["connect_args"] = {
+            "server_settings": server_settings,
+            "prepared_statement_cache_size": settings.prepared_statement_cache_size,
+        }
+    else:
+        options["connect_args"] = {
+            "options": " ".join(f"-c {key}={value}" for key, value in server_settings.items())
+        }
+    return options
+
+
+def install_idle_pre_ping(engine, settings: Settings) -> None:
+    """
+    Ping a pooled connection on checkout only if it sat idle longer than
+    pre_ping_idle_seconds, instead of paying a round trip on every checkout.
+    """
+    if settings.pgbouncer or settings.pre_ping != "idle":
+        return
+
+    @event.listens_for(engine, "checkin")
+    def mark_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < settings.pre_ping_idle_seconds:
+            return
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            # Pool discards this connection and retries the checkout with a fresh one
+            raise exc.DisconnectionError() from e
+
+
+def pool_snapshot(pool) -> dict:
+    """Current usage and wait-time counters for a pool"""
+    snapshot = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        snapshot.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "in_use": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+        })
+
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        snapshot.update({
+            "checkouts": metrics.checkouts,
+            "timeouts": metrics.timeouts,
+            "wait_seconds_total": round(metrics.wait_seconds_total, 6),
+            "wait_seconds_max": round(metrics.wait_seconds_max, 6),
+            "wait_seconds_avg": round(metrics.wait_seconds_total / metrics.checkouts, 6) if metrics.checkouts else 0.0,
+        })
+    return snapshot
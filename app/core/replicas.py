@@ -0,0 +1,151 @@
+import itertools
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Set on responses to writes; reads carrying it go to the primary until it expires
+READ_PRIMARY_COOKIE = "read_primary_until"
+# Per-request override for clients that need the primary without a prior write
+CONSISTENCY_HEADER = "x-read-consistency"
+
+# Replay lag in seconds. 0 when a streaming replica has replayed everything it
+# received, so an idle primary (no new transactions) does not look like growing lag.
+# Only while the WAL receiver is streaming: once it disconnects, receive stops
+# advancing and replay catches up with it, which says nothing about the primary.
+# Then the age of the last replayed transaction counts (infinite if there is none).
+# Reading pg_stat_wal_receiver.status needs pg_read_all_stats (e.g. via pg_monitor);
+# without it the shortcut is never taken, which only errs towards the primary.
+_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+            AND EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 'Infinity')
+    END
+""")
+
+
+class Replica:
+    """One read replica: its engines and session factories plus the last probe result"""
+
+    def __init__(self, name: str, engine, session_factory, async_engine=None, async_session_factory=None):
+        self.name = name
+        self.engine = engine
+        self.session_factory = session_factory
+        self.async_engine = async_engine
+        self.async_session_factory = async_session_factory
+        # Not used until the first successful probe
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.failures = 0
+
+
+class ReplicaRouter:
+    """
+    Round-robin over the replicas that passed their last probe and lag less than
+    max_lag_seconds. A background thread re-probes every check_seconds; a replica
+    whose connection fails mid-request is taken out until its next good probe.
+    """
+
+    def __init__(self, replicas: List[Replica], max_lag_seconds: float = 5.0, check_seconds: float = 2.0):
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self.check_seconds = check_seconds
+        self._counter = itertools.count()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def read_your_writes_seconds(self) -> float:
+        """How long after a write its author must read from the primary: worst accepted lag plus probe staleness"""
+        return self.max_lag_seconds + self.check_seconds
+
+    def probe(self, replica: Replica) -> None:
+        try:
+            with replica.engine.connect() as conn:
+                lag = float(conn.execute(_LAG_SQL).scalar())
+        except Exception:
+            if replica.healthy:
+                logger.warning("Replica %s failed its health check", replica.name, exc_info=True)
+            replica.healthy = False
+            replica.failures += 1
+        else:
+            if not replica.healthy:
+                logger.info("Replica %s is healthy (lag %.1f s)", replica.name, lag)
+            replica.healthy = True
+            replica.lag_seconds = lag
+        replica.checked_at = time.monotonic()
+
+    def check(self) -> None:
+        for replica in self.replicas:
+            self.probe(replica)
+
+    def usable(self) -> List[Replica]:
+        return [
+            r for r in self.replicas
+            if r.healthy and r.lag_seconds is not None and r.lag_seconds <= self.max_lag_seconds
+        ]
+
+    def pick(self) -> Optional[Replica]:
+        """Next usable replica in round-robin order, or None to read from the primary"""
+        candidates = self.usable()
+        if not candidates:
+            return None
+        return candidates[next(self._counter) % len(candidates)]
+
+    def mark_failed(self, replica: Replica) -> None:
+        replica.healthy = False
+        replica.failures += 1
+
+    def snapshot(self) -> List[dict]:
+        return [
+            {
+                "name": r.name,
+                "healthy": r.healthy,
+                "lag_seconds": r.lag_seconds,
+                "failures": r.failures,
+                "usable": r in self.usable(),
+            }
+            for r in self.replicas
+        ]
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="replica-health", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.check_seconds):
+            self.check()
+
+
+def wants_primary(request: Request) -> bool:
+    """True for requests that must see their own recent writes"""
+    if request.headers.get(CONSISTENCY_HEADER, "").lower() == "primary":
+        return True
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def remember_write(response: Response, router: Optional[ReplicaRouter]) -> None:
+    """Route this client's reads to the primary until replicas have caught up with the write"""
+    if router is None:
+        return
+    window = router.read_your_writes_seconds
+    response.set_cookie(
+        READ_PRIMARY_COOKIE, f"{time.time() + window:.3f}",
+        max_age=int(window) + 1, httponly=True, samesite="lax"
+    )
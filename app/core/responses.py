@@ -0,0 +1,34 @@
+from typing import Any, Optional
+
+import orjson
+from fastapi.responses import Response
+
+from app.models.location import LocationRow
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered straight to bytes with orjson, skipping Pydantic"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def location_payload(row: LocationRow, distance: Optional[float] = None) -> dict:
+    """LocationResponse / LocationWithDistance shaped dict for a LocationRow"""
+    payload = {
+        "name": row.name,
+        "description": row.description,
+        "category": row.category,
+        "id": row.id,
+        "latitude": row.latitude,
+        "longitude": row.longitude,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+    }
+    if distance is not None:
+        payload["distance_meters"] = distance
+    return payload
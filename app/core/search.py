@@ -0,0 +1,39 @@
+from sqlalchemy import func, or_
+from app.models.location import Location
+
+# Text search configuration used for search_vector and its queries.
+# 'simple' keeps place names as typed - no stemming, no English stop words.
+SEARCH_CONFIG = 'simple'
+
+
+def like_pattern(term: str) -> str:
+    """Substring pattern for ILIKE, with LIKE wildcards in the term escaped"""
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+def search_tsquery(term: str):
+    """websearch_to_tsquery - supports "quoted phrases", OR and -exclusion"""
+    return func.websearch_to_tsquery(SEARCH_CONFIG, term)
+
+
+def text_search_filter(term: str):
+    """
+    Match the term as a substring of name/description or as full-text words.
+    The ILIKEs are served by the pg_trgm GIN indexes and the @@ by the
+    search_vector GIN index, so the planner combines them with a BitmapOr.
+    """
+    pattern = like_pattern(term)
+    return or_(
+        Location.name.ilike(pattern, escape='\\'),
+        Location.description.ilike(pattern, escape='\\'),
+        Location.search_vector.op('@@')(search_tsquery(term))
+    )
+
+
+def text_search_rank(term: str):
+    """Relevance: full-text cover density (name weighted over description), then name similarity"""
+    return (
+        func.ts_rank_cd(Location.search_vector, search_tsquery(term))
+        + func.similarity(Location.name, term)
+    )
@@ -1,9 +1,50 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from geoalchemy2 import functions
+from sqlalchemy import func, literal
+from geoalchemy2 import functions, Geography, Geometry
 from app.models.location import Location
 from shapely.geometry import Point
 from geoalchemy2.shape import from_shape
+from geoalchemy2.elements import WKBElement, WKTElement
+
+
+def to_geography(expr):
+    """
+    Wrap a geometry column or value in geography() so PostGIS measures in meters.
+    Matches the functional GiST index idx_locations_point_geog.
+    """
+    if isinstance(expr, (WKBElement, WKTElement)):
+        expr = literal(expr, Geometry(srid=4326))
+    return func.geography(expr, type_=Geography(srid=4326))
+
+
+def st_point(longitude, latitude):
+    """
+    SRID 4326 point built in SQL from its coordinates. Unlike a WKB literal the
+    coordinates stay plain float parameters, so statements using it can be cached.
+    """
+    return functions.ST_SetSRID(functions.ST_MakePoint(longitude, latitude), 4326)
+
+
+def st_dwithin_meters(column, query_point, distance_meters):
+    """ST_DWithin on the geography cast - radius in meters, index-backed"""
+    return functions.ST_DWithin(
+        to_geography(column),
+        to_geography(query_point),
+        distance_meters
+    )
+
+
+def st_distance_meters(column, query_point):
+    """Spheroid distance in meters between a geometry column and a point"""
+    return functions.ST_Distance(to_geography(column), to_geography(query_point))
+
+
+def st_within_bbox(column, min_longitude, min_latitude, max_longitude, max_latitude):
+    """Bounding box test with ST_MakeEnvelope - served by the geometry GiST index (&&)"""
+    return functions.ST_Intersects(
+        column,
+        functions.ST_MakeEnvelope(min_longitude, min_latitude, max_longitude, max_latitude, 4326)
+    )
 
 
 def find_locations_within_distance(
@@ -14,16 +55,12 @@ def find_locations_within_distance(
 ) -> list[Location]:
     """
     Find all locations within specified distance of a point using ST_DWithin.
-    Uses spatial index for fast querying.
+    Uses the geography spatial index for fast querying.
     """
     query_point = from_shape(Point(longitude, latitude), srid=4326)
 
     return db.query(Location).filter(
-        functions.ST_DWithin(
-            Location.point,
-            query_point,
-            distance_meters
-        )
+        st_dwithin_meters(Location.point, query_point, distance_meters)
     ).all()
 
 
@@ -38,7 +75,7 @@ def calculate_distance(db: Session,
     query_point = from_shape(Point(longitude, latitude), srid=4326)
 
     result = db.query(
-        functions.ST_Distance(Location.point, query_point)
+        st_distance_meters(Location.point, query_point)
     ).filter(Location.id == location_id).scalar()
 
     return float(result) if result else None
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import math
+import os
+import shutil
+import struct
+import tempfile
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+from app.core.config import Settings
+from app.core.http_cache import etag_matches
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+LAYER_NAME = "locations"
+
+# Tile coordinate space and the margin rendered around it (in tile units)
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+MAX_ZOOM = 22
+
+# 256 px tiles: tile units per screen pixel
+UNITS_PER_PIXEL = TILE_EXTENT // 256
+
+
+class Tile(NamedTuple):
+    """
+    An encoded tile, its ETag (a hash of the bytes) and, for cached tiles, when it
+    was rendered. Every write at a point drops the cached tiles covering it, so a
+    cached tile rendered after a write - insert, move or delete - always carries a
+    later Last-Modified. Uncached renders have no stable time to offer and carry
+    none; the ETag alone revalidates them.
+    """
+    data: bytes
+    etag: str
+    last_modified: Optional[datetime]
+
+    @classmethod
+    def rendered(cls, data: bytes, cached: bool = False) -> "Tile":
+        return cls(data, tile_etag(data), datetime.now(timezone.utc) if cached else None)
+
+    @property
+    def last_modified_header(self) -> Optional[str]:
+        if self.last_modified is None:
+            return None
+        return format_datetime(self.last_modified.astimezone(timezone.utc), usegmt=True)
+
+    def not_modified(self, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+        """Conditional GET check: If-None-Match wins, If-Modified-Since only without it"""
+        if if_none_match is not None:
+            return etag_matches(if_none_match, self.etag)
+        if if_modified_since is None or self.last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one second resolution
+        return self.last_modified.replace(microsecond=0) <= since
+
+
+def tile_etag(data: bytes) -> str:
+    """
+    Strong ETag from the encoded tile itself. Row-derived validators (feature count,
+    max updated_at) miss deletes inside a thinned cell, where only a count changes.
+    """
+    return f'"{hashlib.blake2b(data, digest_size=12).hexdigest()}"'
+
+
+def thinning_grid(z: int, full_detail_zoom: int, thin_pixels: int) -> Optional[int]:
+    """Grid size in tile units for one-feature-per-cell thinning, None at full detail"""
+    if z >= full_detail_zoom or thin_pixels <= 0:
+        return None
+    return thin_pixels * UNITS_PER_PIXEL
+
+
+def tile_bounds(z: int, x: int, y: int, margin: float = 0.0) -> Tuple[float, float, float, float]:
+    """(min_lng, min_lat, max_lng, max_lat) of a tile, grown by margin tile widths on each side"""
+    n = 2 ** z
+
+    def lng(fx: float) -> float:
+        return fx / n * 360.0 - 180.0
+
+    def lat(fy: float) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * fy / n))))
+
+    return (
+        max(lng(x - margin), -180.0), max(lat(y + 1 + margin), -90.0),
+        min(lng(x + 1 + margin), 180.0), min(lat(y - margin), 90.0)
+    )
+
+
+def point_tiles(latitude: float, longitude: float, z: int) -> Iterable[Tuple[int, int]]:
+    """Tiles at zoom z whose buffered area contains the point (up to four near an edge)"""
+    n = 2 ** z
+    latitude = max(min(latitude, 85.0511287798), -85.0511287798)
+    fx = (longitude + 180.0) / 360.0 * n
+    fy = (1.0 - math.asinh(math.tan(math.radians(latitude))) / math.pi) / 2.0 * n
+    margin = TILE_BUFFER / TILE_EXTENT
+
+    xs = {min(max(math.floor(fx + d), 0), n - 1) for d in (-margin, 0.0, margin)}
+    ys = {min(max(math.floor(fy + d), 0), n - 1) for d in (-margin, 0.0, margin)}
+    for x in xs:
+        for y in ys:
+            yield x, y
+
+
+class TileCache:
+    """
+    Encoded tiles on disk at <root>/<z>/<x>/<y>.mvt, shared by all worker processes.
+    Each file is a length-prefixed JSON header (ETag, Last-Modified) followed by the
+    tile, written to a temp file and renamed so readers never see a partial tile.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, z: int, x: int, y: int) -> Path:
+        return self.root / str(z) / str(x) / f"{y}.mvt"
+
+    def get(self, z: int, x: int, y: int) -> Optional[Tile]:
+        try:
+            raw = self._path(z, x, y).read_bytes()
+        except FileNotFoundError:
+            return None
+        (header_size,) = struct.unpack_from("<I", raw)
+        header = json.loads(raw[4:4 + header_size])
+        last_modified = header["last_modified"]
+        return Tile(
+            raw[4 + header_size:],
+            header["etag"],
+            datetime.fromisoformat(last_modified) if last_modified else None
+        )
+
+    def set(self, z: int, x: int, y: int, tile: Tile) -> None:
+        path = self._path(z, x, y)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = json.dumps({
+            "etag": tile.etag,
+            "last_modified": tile.last_modified.isoformat() if tile.last_modified else None
+        }).encode()
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(struct.pack("<I", len(header)) + header + tile.data)
+        os.replace(tmp, path)
+
+    def invalidate_point(self, latitude: float, longitude: float) -> int:
+        """Drop every cached tile, at every zoom, that renders this point; returns tiles removed"""
+        removed = 0
+        for z in range(MAX_ZOOM + 1):
+            for x, y in point_tiles(latitude, longitude, z):
+                try:
+                    self._path(z, x, y).unlink()
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+    def clear(self) -> None:
+        for child in self.root.iterdir():
+            if child.is_dir():
+                shutil.rmtree(child, ignore_errors=True)
+
+
+def build_tile_cache(settings: Settings) -> Optional[TileCache]:
+    """Disk tile cache at TILE_CACHE_DIR, or None when it is unset"""
+    if not settings.tile_cache_dir:
+        return None
+    return TileCache(settings.tile_cache_dir)
@@ -1,9 +1,45 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routers import locations
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.database import SessionLocal, replica_router
+from app.core.dependencies import memory_index
+from app.core.instrumentation import InstrumentationMiddleware
+from app.repositories.memory_location_index import MemoryIndexPoller
+from app.routers import locations, metrics, tiles
 
-app = FastAPI(title="Nearby Places API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    poller = None
+    if memory_index is not None:
+        poller = MemoryIndexPoller(
+            memory_index,
+            SessionLocal,
+            poll_seconds=settings.memory_index_poll_seconds,
+            reload_seconds=settings.memory_index_reload_seconds
+        )
+        await run_in_threadpool(poller.load)
+        poller.start()
+    if replica_router is not None:
+        # First probe before serving, so replicas are in rotation from the first request
+        await run_in_threadpool(replica_router.check)
+        replica_router.start()
+    yield
+    if poller is not None:
+        poller.stop()
+    if replica_router is not None:
+        replica_router.stop()
+
+
+app = FastAPI(title="Nearby Places API", version="1.0.0", lifespan=lifespan)
+
+if settings.instrumentation:
+    app.add_middleware(InstrumentationMiddleware)
 
 app.include_router(locations.router)
+app.include_router(metrics.router)
+app.include_router(tiles.router)
 
 
 @app.get("/")
@@ -1,8 +1,18 @@
+from datetime import datetime
+from typing import NamedTuple, Optional
 from geoalchemy2 import Geometry
-from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy import Column, Computed, Integer, String, Text, DateTime, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from app.core.database import Base
 
+# Weighted document for full-text search; kept in sync by Postgres (generated column)
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
 
 class Location(Base):
     __tablename__ = "locations"
@@ -10,15 +20,43 @@ class Location(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False, index=True)
     description = Column(Text, nullable=True)
+    # Place type ("restaurant", "park", ...), filterable inside the spatial index scans
+    category = Column(String(50), nullable=True)
     point = Column(
         Geometry(geometry_type='POINT', srid=4326),  # WGS84
         nullable=False
     )
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Deferred so regular loads never pull the tsvector over the wire
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
 
     # Spatial index for point column - critical for spatial query performance
     __table_args__ = (
         Index('idx_locations_point', 'point', postgresql_using='gist'),
+        # Functional index so geography (meter-based) ST_DWithin can use an index scan
+        Index('idx_locations_point_geog', func.geography(point), postgresql_using='gist'),
         Index('idx_locations_created_at', 'created_at'),  # For time-based queries
+        # Composite GiST (btree_gist) so "category = x" is checked inside the spatial
+        # index scan: geography for ST_DWithin radius queries, geometry for bbox and KNN
+        Index('idx_locations_category_point_geog', 'category', func.geography(point), postgresql_using='gist'),
+        Index('idx_locations_category_point', 'category', 'point', postgresql_using='gist'),
+        # Text search: full-text on search_vector, substring ILIKE via pg_trgm
+        Index('idx_locations_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('idx_locations_name_trgm', 'name', postgresql_using='gin',
+              postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('idx_locations_description_trgm', 'description', postgresql_using='gin',
+              postgresql_ops={'description': 'gin_trgm_ops'}),
     )
+
+
+class LocationRow(NamedTuple):
+    """Plain (non-ORM) location row with coordinates already extracted"""
+    id: int
+    name: str
+    description: Optional[str]
+    latitude: float
+    longitude: float
+    created_at: datetime
+    updated_at: datetime
+    category: Optional[str] = None
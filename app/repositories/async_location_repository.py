@@ -0,0 +1,37 @@
+from typing import TYPE_CHECKING, Optional, Union
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app.core.counting import CountCache
+from app.repositories.location_repository import LocationRepository
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class AsyncLocationRepository:
+    """
+    Awaitable variant of LocationRepository for async routes.
+
+    Every LocationRepository method is available as a coroutine:
+    - with an AsyncSession, the query runs on the asyncpg connection via run_sync,
+      so the event loop never blocks and no threadpool worker is held
+    - with a sync Session, the call is offloaded to the threadpool (legacy path)
+    """
+
+    def __init__(self, db: Union["AsyncSession", Session], count_cache: Optional[CountCache] = None):
+        self.db = db
+        self.count_cache = count_cache
+
+    def __getattr__(self, name: str):
+        method = getattr(LocationRepository, name)
+
+        async def call(*args, **kwargs):
+            if isinstance(self.db, Session):
+                return await run_in_threadpool(method, LocationRepository(self.db, self.count_cache), *args, **kwargs)
+            return await self.db.run_sync(
+                lambda session: method(LocationRepository(session, self.count_cache), *args, **kwargs)
+            )
+
+        call.__name__ = name
+        call.__doc__ = method.__doc__
+        return call
@@ -1,21 +1,154 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, asc, or_
+import csv
+import io
+from itertools import islice
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import (
+    func, desc, asc, tuple_, text, select, column, values, true, lambda_stmt, case, cast, delete, update,
+    Boolean, Float, Integer, Numeric, String
+)
 from geoalchemy2 import functions
-from app.models.location import Location
+from app.models.location import Location, LocationRow
 from app.core.geometry import shapely_to_db_point, db_point_to_shapely
+from app.core.spatial import st_dwithin_meters, st_distance_meters, st_point, st_within_bbox
+from app.core.tiles import LAYER_NAME, TILE_BUFFER, TILE_EXTENT, tile_bounds
+from app.core.search import text_search_filter, text_search_rank
+from app.core.counting import CountCache, estimate_rows, statement_fingerprint
+from app.core.instrumentation import instrument_methods
+from app.core.pagination import KEYSET_DISTANCE_DECIMALS, decode_cursor
 from shapely.geometry import Point
-from app.schemas.query_schemas import LocationQuery, DistanceRangeQuery, SortOrder, LocationSortBy
+from app.schemas.query_schemas import LocationQuery, DistanceRangeQuery, SortOrder, ListSortBy, SearchSortBy, CountStrategy
 
+# Over-fetch factor for KNN candidates before exact spheroid re-ranking
+KNN_CANDIDATE_FACTOR = 4
+
+# Rows per COPY + dedup-insert transaction in bulk_import
+BULK_IMPORT_BATCH_SIZE = 50_000
+
+# Rows fetched per server-side cursor round trip in iter_export_batches
+EXPORT_BATCH_SIZE = 5_000
+
+# Upper bound on clusters returned by cluster_within_bbox (densest cells win)
+MAX_BBOX_CLUSTERS = 2_000
+
+# Rows per statement (and per transaction) in bulk_delete / bulk_update, so locks
+# and WAL per commit stay bounded and replicas never replay one huge transaction
+BULK_WRITE_BATCH_SIZE = 5_000
+
+
+class BulkWriteError(Exception):
+    """A bulk write failed part way; `completed` holds what the already committed batches returned"""
+
+    def __init__(self, completed: list):
+        super().__init__(f"Bulk write failed after {len(completed)} committed rows")
+        self.completed = completed
+
+_CREATE_STAGING_SQL = text("""
+    CREATE TEMP TABLE location_staging (
+        seq bigint GENERATED ALWAYS AS IDENTITY,
+        name varchar(100) NOT NULL,
+        description text,
+        category varchar(50),
+        lng double precision NOT NULL,
+        lat double precision NOT NULL,
+        point geometry(Point, 4326) GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(lng, lat), 4326)) STORED
+    ) ON COMMIT DROP
+""")
+
+_COPY_STAGING_SQL = "COPY location_staging (name, description, category, lng, lat) FROM STDIN WITH (FORMAT csv)"
+
+# Skip rows near an existing location, and rows near an earlier row of the same batch
+_INSERT_FROM_STAGING_SQL = text("""
+    INSERT INTO locations (name, description, category, point)
+    SELECT s.name, s.description, s.category, s.point
+    FROM location_staging s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM locations l
+        WHERE ST_DWithin(geography(l.point), geography(s.point), :tolerance)
+    )
+    AND NOT EXISTS (
+        SELECT 1 FROM location_staging e
+        WHERE e.seq < s.seq
+        AND ST_DWithin(geography(e.point), geography(s.point), :tolerance)
+    )
+    ORDER BY s.seq
+""")
+
+
+def location_row_columns():
+    """Columns for the LocationRow fast path - no ORM hydration, no WKB parsing"""
+    return (
+        Location.id,
+        Location.name,
+        Location.description,
+        functions.ST_Y(Location.point).label('latitude'),
+        functions.ST_X(Location.point).label('longitude'),
+        Location.created_at,
+        Location.updated_at,
+        Location.category
+    )
+
+
+def category_filter(category: Optional[str]):
+    """Equality on category - the leading column of the composite GiST indexes"""
+    return Location.category == category
+
+
+def distance_from(longitude: float, latitude: float):
+    """Spheroid distance in meters from Location.point to a coordinate pair"""
+    return st_distance_meters(Location.point, st_point(longitude, latitude))
+
+
+def keyset_distance(longitude: float, latitude: float):
+    """distance_from rounded to KEYSET_DISTANCE_DECIMALS, the value nearby pages order and resume on"""
+    return cast(
+        func.round(cast(distance_from(longitude, latitude), Numeric), KEYSET_DISTANCE_DECIMALS), Float
+    )
+
+
+# Hot paths below are built as lambda_stmt: the lambdas' code locations form the
+# cache key, so after the first call SQLAlchemy skips constructing the statement and
+# walking it for a cache key, and just binds the new values into the cached compiled
+# SQL. Only plain values may be captured (coordinates, ids, limits); a WKB literal
+# or a SQL expression in the closure would defeat the cache.
+
+
+@instrument_methods
 class LocationRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, count_cache: Optional[CountCache] = None):
         self.db = db
+        self.count_cache = count_cache
+
+    def _count(self, id_statement, strategy: CountStrategy) -> Optional[int]:
+        """Total rows of a select(Location.id) statement under the requested count strategy"""
+        if strategy == CountStrategy.none:
+            return None
+        if strategy == CountStrategy.estimated:
+            return estimate_rows(self.db, id_statement)
+
+        count_statement = select(func.count()).select_from(id_statement.subquery())
+        if self.count_cache is None:
+            return self.db.execute(count_statement).scalar_one()
 
-    def create(self, name: str, description: str, point: Point) -> Location:
+        key = statement_fingerprint(count_statement)
+        total = self.count_cache.get(key)
+        if total is None:
+            total = self.db.execute(count_statement).scalar_one()
+            self.count_cache.set(key, total)
+        return total
+
+    @staticmethod
+    def _page_size(per_page: int, strategy: CountStrategy) -> int:
+        """Rows to fetch: one extra when has_next cannot be derived from an exact total"""
+        return per_page if strategy == CountStrategy.exact else per_page + 1
+
+    def create(self, name: str, description: str, point: Point, category: Optional[str] = None) -> Location:
         """Create a new location"""
         db_location = Location(
             name=name,
             description=description,
+            category=category,
             point=shapely_to_db_point(point)
         )
         self.db.add(db_location)
@@ -28,32 +161,107 @@ class LocationRepository:
         query_point = shapely_to_db_point(point)
         
         existing = self.db.query(Location).filter(
-            functions.ST_DWithin(
-                Location.point,
-                query_point,
-                tolerance_meters
-            )
+            st_dwithin_meters(Location.point, query_point, tolerance_meters)
         ).first()
         
         return existing is not None
 
-    def create_if_not_exists(self, name: str, description: str, point: Point, tolerance_meters: int = 10) -> tuple[Location, bool]:
-        """Create location only if one doesn't exist nearby. Returns (location, was_created)"""
-        if self.location_exists_at_point(point, tolerance_meters):
-            # Find and return existing location
-            query_point = shapely_to_db_point(point)
-            existing = self.db.query(Location).filter(
-                functions.ST_DWithin(Location.point, query_point, tolerance_meters)
-            ).first()
-            return existing, False
-        
-        # Create new location
-        new_location = self.create(name, description, point)
-        return new_location, True
+    def create_if_not_exists(
+        self,
+        name: str,
+        description: str,
+        point: Point,
+        tolerance_meters: int = 10,
+        category: Optional[str] = None
+    ) -> tuple[Location, bool]:
+        """
+        Create location only if one doesn't exist nearby. Returns (location, was_created).
+        Runs as a single call to location_insert_if_absent(), which serialises
+        concurrent writers on advisory locks for the grid cells around the point.
+        """
+        was_created_column = column("was_created", Boolean)
+        statement = text(
+            "SELECT * FROM location_insert_if_absent(:name, :description, :lng, :lat, :tolerance, :category)"
+        ).columns(
+            Location.id, Location.name, Location.description, Location.category, Location.point,
+            Location.created_at, Location.updated_at, was_created_column
+        )
+
+        location, was_created = self.db.execute(
+            select(Location, was_created_column).from_statement(statement),
+            {
+                "name": name,
+                "description": description,
+                "lng": point.x,
+                "lat": point.y,
+                "tolerance": tolerance_meters,
+                "category": category,
+            }
+        ).one()
+
+        # Detach before commit so the row isn't expired and re-fetched on access
+        self.db.expunge(location)
+        self.db.commit()
+
+        return location, was_created
+
+    def bulk_import(
+        self,
+        records: Iterable[tuple[str, Optional[str], Optional[str], float, float]],
+        tolerance_meters: int = 10,
+        batch_size: int = BULK_IMPORT_BATCH_SIZE
+    ) -> tuple[int, int]:
+        """
+        Bulk load (name, description, category, longitude, latitude) records.
+        Each batch is COPYed into a temp staging table, then inserted in one
+        set-based statement that drops rows within tolerance of an existing
+        location or of an earlier row in the batch. Returns (received, inserted).
+        """
+        records = iter(records)
+        received = inserted = 0
+
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            received += len(batch)
+            inserted += self._import_batch(batch, tolerance_meters)
+
+        return received, inserted
+
+    def _import_batch(self, batch: list, tolerance_meters: int) -> int:
+        """COPY one batch into staging and dedup-insert it in a single transaction"""
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(batch)
+        buffer.seek(0)
+
+        connection = self.db.connection()
+        connection.execute(_CREATE_STAGING_SQL)
+
+        # COPY needs the raw psycopg2 cursor
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(_COPY_STAGING_SQL, buffer)
+        finally:
+            cursor.close()
+
+        connection.execute(text("CREATE INDEX ON location_staging USING gist (geography(point))"))
+        connection.execute(text("ANALYZE location_staging"))
+        result = connection.execute(_INSERT_FROM_STAGING_SQL, {"tolerance": tolerance_meters})
+        self.db.commit()
+
+        return result.rowcount
 
     def get_by_id(self, location_id: int) -> Optional[Location]:
         """Get location by ID"""
-        return self.db.query(Location).filter(Location.id == location_id).first()
+        stmt = lambda_stmt(lambda: select(Location).where(Location.id == location_id))
+        return self.db.execute(stmt).scalars().first()
+
+    def get_row_by_id(self, location_id: int) -> Optional[LocationRow]:
+        """Get location by ID as a plain LocationRow"""
+        stmt = lambda_stmt(lambda: select(*location_row_columns()).where(Location.id == location_id))
+        row = self.db.execute(stmt).first()
+        return LocationRow(*row) if row else None
 
     def get_all(self, skip: int = 0, limit: int = 100) -> List[Location]:
         """Get all locations with pagination"""
@@ -70,11 +278,7 @@ class LocationRepository:
         query_point = shapely_to_db_point(center_point)
 
         return self.db.query(Location).filter(
-            functions.ST_DWithin(
-                Location.point,
-                query_point,
-                distance_meters
-            )
+            st_dwithin_meters(Location.point, query_point, distance_meters)
         ).offset(skip).limit(limit).all()
 
     def find_within_distance_with_distances(
@@ -82,28 +286,385 @@ class LocationRepository:
         center_point: Point,
         distance_meters: int,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[tuple[Location, float]]:
-        """Find locations within distance and return with calculated distances"""
+        limit: int = 100,
+        after: Optional[tuple[float, int]] = None,
+        category: Optional[str] = None
+    ) -> List[tuple[LocationRow, float]]:
+        """
+        Find locations within distance and return plain rows with calculated distances
+        (rounded, see keyset_distance). Pass `after` = (distance, id) of the last seen
+        row for keyset pagination instead of `skip`. With category, idx_locations_category_point_geog serves
+        both conditions in one index scan.
+        """
+        longitude, latitude = center_point.x, center_point.y
+
+        stmt = lambda_stmt(lambda: select(
+            *location_row_columns(),
+            keyset_distance(longitude, latitude).label('distance')
+        ).where(
+            st_dwithin_meters(Location.point, st_point(longitude, latitude), distance_meters)
+        ))
+
+        if category is not None:
+            stmt += lambda s: s.where(category_filter(category))
+        if after is not None:
+            after_distance, after_id = after
+            stmt += lambda s: s.where(
+                tuple_(keyset_distance(longitude, latitude), Location.id) > tuple_(after_distance, after_id)
+            )
+
+        stmt += lambda s: s.order_by(asc('distance'), asc(Location.id)).offset(skip).limit(limit)
+        results = self.db.execute(stmt).all()
+
+        return [(LocationRow(*row[:-1]), float(row[-1])) for row in results]
+
+    def search_within_distance(
+        self,
+        center_point: Point,
+        distance_meters: int,
+        term: str,
+        sort_by: SearchSortBy = SearchSortBy.distance,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[tuple[float, int]] = None
+    ) -> List[tuple[LocationRow, float, float]]:
+        """
+        Text + radius search in one statement, returning (row, distance, relevance).
+        Both predicates are index-backed (geography GiST, trigram/tsvector GIN), so
+        the planner picks which index drives the scan - or ANDs their bitmaps - from
+        its own selectivity estimates for the term and the radius.
+        Keyset `after` = (distance, id) applies to distance ordering only.
+        """
+        query_point = shapely_to_db_point(center_point)
+        distance = st_distance_meters(Location.point, query_point)
+        relevance = text_search_rank(term)
+
+        query = self.db.query(
+            *location_row_columns(),
+            distance.label('distance'),
+            relevance.label('relevance')
+        ).filter(
+            st_dwithin_meters(Location.point, query_point, distance_meters),
+            text_search_filter(term)
+        )
+
+        if sort_by == SearchSortBy.relevance:
+            query = query.order_by(desc('relevance'), asc('distance'), asc(Location.id))
+        else:
+            if after is not None:
+                query = query.filter(tuple_(distance, Location.id) > tuple_(*after))
+            query = query.order_by(asc('distance'), asc(Location.id))
+
+        results = query.offset(skip).limit(limit).all()
+
+        return [(LocationRow(*row[:-2]), float(row[-2]), float(row[-1])) for row in results]
+
+    def find_k_nearest(
+        self,
+        center_point: Point,
+        k: int = 10,
+        max_distance_meters: Optional[int] = None,
+        category: Optional[str] = None
+    ) -> List[tuple[LocationRow, float]]:
+        """
+        Find the k nearest locations without guessing a radius.
+        Candidates come from an index-ordered KNN scan (<->) on idx_locations_point
+        (idx_locations_category_point with a category), then the top k are
+        re-ranked by exact spheroid distance in meters.
+        """
         query_point = shapely_to_db_point(center_point)
+        distance = st_distance_meters(Location.point, query_point)
+
+        # <-> orders by planar degrees, which stretches longitude away from the
+        # equator, so over-fetch candidates before the exact re-rank
+        candidates = self.db.query(Location.id)
+        if category is not None:
+            candidates = candidates.filter(category_filter(category))
+        if max_distance_meters is not None:
+            candidates = candidates.filter(
+                st_dwithin_meters(Location.point, query_point, max_distance_meters)
+            )
+        candidates = candidates.order_by(
+            Location.point.distance_centroid(query_point)
+        ).limit(k * KNN_CANDIDATE_FACTOR)
 
         results = self.db.query(
-            Location,
-            functions.ST_Distance(Location.point, query_point).label('distance')
+            *location_row_columns(),
+            distance.label('distance')
         ).filter(
-            functions.ST_DWithin(Location.point, query_point, distance_meters)
-        ).order_by(asc('distance')).offset(skip).limit(limit).all()
+            Location.id.in_(candidates.scalar_subquery())
+        ).order_by(asc('distance'), asc(Location.id)).limit(k).all()
+
+        return [(LocationRow(*row[:-1]), float(row[-1])) for row in results]
+
+    def find_within_distance_batch(
+        self,
+        queries: List[tuple[float, float, int]],
+        limit: int = 10
+    ) -> List[List[tuple[LocationRow, float]]]:
+        """
+        Answer many (latitude, longitude, distance_meters) searches in one query:
+        a LATERAL join of a VALUES list against the geography index. Returns one
+        distance-ordered result list per input query, in input order.
+        """
+        if not queries:
+            return []
+
+        points = values(
+            column('idx', Integer), column('lat', Float), column('lng', Float), column('radius', Float),
+            name='q'
+        ).data([(i, lat, lng, radius) for i, (lat, lng, radius) in enumerate(queries)])
+
+        query_point = functions.ST_SetSRID(functions.ST_MakePoint(points.c.lng, points.c.lat), 4326)
+        distance = st_distance_meters(Location.point, query_point)
+
+        nearby = select(
+            *location_row_columns(),
+            distance.label('distance')
+        ).where(
+            st_dwithin_meters(Location.point, query_point, points.c.radius)
+        ).order_by(distance, Location.id).limit(limit).lateral('nearby')
+
+        results = self.db.execute(
+            select(points.c.idx, nearby).select_from(points.join(nearby, true()))
+            .order_by(points.c.idx, nearby.c.distance, nearby.c.id)
+        ).all()
+
+        grouped: List[List[tuple[LocationRow, float]]] = [[] for _ in queries]
+        for row in results:
+            grouped[row[0]].append((LocationRow(*row[1:-1]), float(row[-1])))
+        return grouped
+
+    def find_within_bbox(
+        self,
+        bbox: tuple[float, float, float, float],
+        limit: int,
+        category: Optional[str] = None
+    ) -> List[LocationRow]:
+        """
+        Up to limit rows inside bbox = (min_lng, min_lat, max_lng, max_lat).
+        Unordered on purpose: an ORDER BY would let the planner walk the primary
+        key instead of idx_locations_point, and callers only need "any limit rows".
+        """
+        stmt = select(*location_row_columns()).where(st_within_bbox(Location.point, *bbox))
+        if category is not None:
+            stmt = stmt.where(category_filter(category))
+        results = self.db.execute(stmt.limit(limit)).all()
+        return [LocationRow(*row) for row in results]
+
+    def cluster_within_bbox(
+        self,
+        bbox: tuple[float, float, float, float],
+        grid_size: float,
+        limit: int = MAX_BBOX_CLUSTERS,
+        category: Optional[str] = None
+    ) -> List[tuple[int, float, float]]:
+        """
+        Aggregate the points inside bbox on a grid_size-degree ST_SnapToGrid grid.
+        Returns (count, latitude, longitude) per non-empty cell, the position being
+        the mean of its points, densest cells first.
+        """
+        cells = select(
+            functions.ST_SnapToGrid(Location.point, grid_size).label('cell'),
+            functions.ST_X(Location.point).label('lng'),
+            functions.ST_Y(Location.point).label('lat')
+        ).where(st_within_bbox(Location.point, *bbox))
+        if category is not None:
+            cells = cells.where(category_filter(category))
+        cells = cells.subquery('cells')
+
+        count = func.count().label('count')
+        results = self.db.execute(
+            select(count, func.avg(cells.c.lat), func.avg(cells.c.lng))
+            .group_by(cells.c.cell)
+            .order_by(desc(count))
+            .limit(limit)
+        ).all()
+        return [(int(n), float(lat), float(lng)) for n, lat, lng in results]
+
+    def get_tile(
+        self,
+        z: int,
+        x: int,
+        y: int,
+        thin_grid: Optional[int] = None
+    ) -> bytes:
+        """
+        Encode tile z/x/y with ST_AsMVT (empty bytes for an empty tile).
+        Rows are picked with a 4326 envelope test on idx_locations_point (grown by the
+        tile buffer) and only those are transformed to web mercator. With thin_grid,
+        points are snapped to a thin_grid tile-unit grid and each cell becomes one
+        feature carrying the lowest id and a count.
+        """
+        envelope = functions.ST_TileEnvelope(z, x, y)
+        geom = functions.ST_AsMVTGeom(
+            functions.ST_Transform(Location.point, 3857), envelope, TILE_EXTENT, TILE_BUFFER, True
+        )
+        in_tile = st_within_bbox(Location.point, *tile_bounds(z, x, y, TILE_BUFFER / TILE_EXTENT))
+
+        if thin_grid is None:
+            features = select(
+                geom.label('geom'), Location.id, Location.name
+            ).where(in_tile).subquery('features')
+        else:
+            snapped = select(
+                functions.ST_SnapToGrid(geom, thin_grid).label('geom'), Location.id
+            ).where(in_tile).subquery('snapped')
+            features = select(
+                snapped.c.geom,
+                func.min(snapped.c.id).label('id'),
+                func.count().label('count')
+            ).group_by(snapped.c.geom).subquery('features')
+
+        data = self.db.execute(
+            select(
+                func.ST_AsMVT(features.table_valued(), LAYER_NAME, TILE_EXTENT, 'geom')
+            ).where(features.c.geom.isnot(None))
+        ).scalar()
+        return bytes(data or b"")
+
+    def iter_export_batches(
+        self,
+        bbox: Optional[tuple[float, float, float, float]] = None,
+        near: Optional[tuple[float, float, int]] = None,
+        updated_since: Optional[datetime] = None,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> Iterator[List[LocationRow]]:
+        """
+        Stream plain rows in id order through a server-side cursor (yield_per), one
+        batch at a time, so memory stays bounded whatever the table size.
+        bbox = (min_lng, min_lat, max_lng, max_lat), near = (lat, lng, distance_meters).
+        """
+        stmt = select(*location_row_columns()).order_by(Location.id)
+        if bbox is not None:
+            stmt = stmt.where(st_within_bbox(Location.point, *bbox))
+        if near is not None:
+            latitude, longitude, distance_meters = near
+            query_point = shapely_to_db_point(Point(longitude, latitude))
+            stmt = stmt.where(st_dwithin_meters(Location.point, query_point, distance_meters))
+        if updated_since is not None:
+            stmt = stmt.where(Location.updated_at >= updated_since)
 
-        return [(location, float(distance)) for location, distance in results]
+        result = self.db.execute(stmt.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield [LocationRow(*row) for row in partition]
 
-    def delete(self, location_id: int) -> bool:
-        """Delete location by ID"""
-        location = self.get_by_id(location_id)
-        if location:
-            self.db.delete(location)
-            self.db.commit()
-            return True
-        return False
+    def delete(self, location_id: int) -> Optional[LocationRow]:
+        """Delete location by ID in one DELETE ... RETURNING. Returns the deleted row, or None if not found"""
+        row = self.db.execute(
+            delete(Location).where(Location.id == location_id)
+            .returning(*location_row_columns())
+            .execution_options(synchronize_session=False)
+        ).first()
+        self.db.commit()
+        return LocationRow(*row) if row else None
+
+    def bulk_delete(
+        self,
+        ids: Optional[List[int]] = None,
+        bbox: Optional[tuple[float, float, float, float]] = None,
+        updated_before: Optional[datetime] = None,
+        batch_size: int = BULK_WRITE_BATCH_SIZE
+    ) -> List[tuple[int, float, float]]:
+        """
+        Delete every location matching all given filters, batch_size rows per
+        DELETE ... RETURNING and per transaction. Returns (id, latitude, longitude)
+        of each deleted row. Without ids, batches walk the primary key (id > last
+        deleted id) so each one resumes where the previous stopped instead of
+        rescanning rows already checked.
+        bbox = (min_lng, min_lat, max_lng, max_lat).
+        Raises BulkWriteError with the rows of the committed batches if one fails.
+        """
+        conditions = []
+        if bbox is not None:
+            conditions.append(st_within_bbox(Location.point, *bbox))
+        if updated_before is not None:
+            conditions.append(Location.updated_at < updated_before)
+
+        deleted = []
+        try:
+            if ids is not None:
+                ids = sorted(set(ids))
+                for start in range(0, len(ids), batch_size):
+                    deleted.extend(self._delete_batch(Location.id.in_(ids[start:start + batch_size]), *conditions))
+                return deleted
+
+            last_id = 0
+            while True:
+                batch = select(Location.id).where(Location.id > last_id, *conditions)
+                batch = batch.order_by(Location.id).limit(batch_size).scalar_subquery()
+                rows = self._delete_batch(Location.id.in_(batch))
+                deleted.extend(rows)
+                if len(rows) < batch_size:
+                    return deleted
+                last_id = max(row[0] for row in rows)
+        except Exception as exc:
+            self.db.rollback()
+            raise BulkWriteError(deleted) from exc
+
+    def _delete_batch(self, *conditions) -> List[tuple[int, float, float]]:
+        """One set-based DELETE ... RETURNING, committed on its own"""
+        rows = self.db.execute(
+            delete(Location).where(*conditions)
+            .returning(Location.id, functions.ST_Y(Location.point), functions.ST_X(Location.point))
+            .execution_options(synchronize_session=False)
+        ).all()
+        self.db.commit()
+        return [(row[0], float(row[1]), float(row[2])) for row in rows]
+
+    def bulk_update(
+        self,
+        updates: List[tuple[int, Optional[str], Optional[str], Optional[str], Optional[float], Optional[float]]],
+        batch_size: int = BULK_WRITE_BATCH_SIZE
+    ) -> List[tuple[LocationRow, float, float]]:
+        """
+        Apply (id, name, description, category, latitude, longitude) patches, None
+        keeping the current value, as one UPDATE ... FROM (VALUES ...) RETURNING per
+        batch_size rows and per transaction. Returns (updated row, previous latitude,
+        previous longitude) per updated id; ids that do not exist are skipped.
+        Raises BulkWriteError with the rows of the committed batches if one fails.
+        """
+        updated = []
+        try:
+            for start in range(0, len(updates), batch_size):
+                updated.extend(self._update_batch(updates[start:start + batch_size]))
+        except Exception as exc:
+            self.db.rollback()
+            raise BulkWriteError(updated) from exc
+        return updated
+
+    def _update_batch(self, batch: list) -> List[tuple[LocationRow, float, float]]:
+        patch = values(
+            column('id', Integer), column('name', String), column('description', String),
+            column('category', String), column('lat', Float), column('lng', Float),
+            name='patch'
+        ).data(batch)
+        # Second alias of the target: in UPDATE ... FROM it still reads the
+        # pre-update row, so the old coordinates come back for cache invalidation
+        previous = aliased(Location, name='previous')
+
+        stmt = update(Location).where(
+            Location.id == patch.c.id,
+            previous.id == patch.c.id
+        ).values(
+            name=func.coalesce(patch.c.name, Location.name),
+            description=func.coalesce(patch.c.description, Location.description),
+            category=func.coalesce(patch.c.category, Location.category),
+            # Cast: a column that is NULL in every row of the batch would resolve to text
+            point=case(
+                (patch.c.lat.is_(None), Location.point),
+                else_=st_point(cast(patch.c.lng, Float), cast(patch.c.lat, Float))
+            ),
+            updated_at=func.now()
+        ).returning(
+            *location_row_columns(),
+            functions.ST_Y(previous.point),
+            functions.ST_X(previous.point)
+        ).execution_options(synchronize_session=False)
+
+        rows = self.db.execute(stmt).all()
+        self.db.commit()
+        return [(LocationRow(*row[:-2]), float(row[-2]), float(row[-1])) for row in rows]
 
     def count_total(self) -> int:
         """Get total count of locations"""
@@ -113,94 +674,121 @@ class LocationRepository:
         """Count locations within distance"""
         query_point = shapely_to_db_point(center_point)
         return self.db.query(Location).filter(
-            functions.ST_DWithin(Location.point, query_point, distance_meters)
+            st_dwithin_meters(Location.point, query_point, distance_meters)
         ).count()
 
-    def get_all_with_filters(self, query_params: LocationQuery) -> tuple[List[Location], int]:
-        """Get locations with filtering, sorting, and pagination"""
-        base_query = self.db.query(Location)
+    def _filtered_statement(self, columns, query_params: LocationQuery):
+        """Shared search/sort/page statement for the list queries, plus its id statement for counting"""
+        stmt = select(*columns)
+        id_stmt = select(Location.id)
 
-        # Apply search filter
+        # Indexed text search (pg_trgm + search_vector GIN) instead of a sequential ILIKE scan
         if query_params.search:
-            search_term = f"%{query_params.search}%"
-            base_query = base_query.filter(
-                or_(
-                    Location.name.ilike(search_term),
-                    Location.description.ilike(search_term)
-                )
-            )
+            search_filter = text_search_filter(query_params.search)
+            stmt = stmt.where(search_filter)
+            id_stmt = id_stmt.where(search_filter)
 
-        # Get total count before pagination
-        total_count = base_query.count()
-
-        # Apply sorting
-        if query_params.sort_by == LocationSortBy.name:
-            sort_column = Location.name
-        elif query_params.sort_by == LocationSortBy.created_at:
-            sort_column = Location.created_at
-
-        if query_params.sort_order == SortOrder.asc:
-            base_query = base_query.order_by(asc(sort_column))
+        # Apply sorting, id as tie-breaker so pages are stable
+        if query_params.sort_by == ListSortBy.relevance and query_params.search:
+            stmt = stmt.order_by(desc(text_search_rank(query_params.search)), asc(Location.id))
         else:
-            base_query = base_query.order_by(desc(sort_column))
+            sort_column = Location.name if query_params.sort_by == ListSortBy.name else Location.created_at
+            direction = asc if query_params.sort_order == SortOrder.asc else desc
+            stmt = stmt.order_by(direction(sort_column), direction(Location.id))
 
         # Apply pagination
         skip = (query_params.page - 1) * query_params.per_page
-        locations = base_query.offset(skip).limit(query_params.per_page).all()
+        limit = self._page_size(query_params.per_page, query_params.count)
+        return stmt.offset(skip).limit(limit), id_stmt
 
+    def get_all_with_filters(self, query_params: LocationQuery) -> tuple[List[Location], Optional[int]]:
+        """
+        Get locations with filtering, sorting, and pagination.
+        Unless query_params.count is exact, up to per_page + 1 locations are returned;
+        the extra one only signals that a next page exists.
+        """
+        stmt, id_stmt = self._filtered_statement((Location,), query_params)
+        total_count = self._count(id_stmt, query_params.count)
+        locations = list(self.db.execute(stmt).scalars())
         return locations, total_count
 
+    def get_rows_with_filters(self, query_params: LocationQuery) -> tuple[List[LocationRow], Optional[int]]:
+        """get_all_with_filters returning plain LocationRows for the list endpoint"""
+        stmt, id_stmt = self._filtered_statement(location_row_columns(), query_params)
+        total_count = self._count(id_stmt, query_params.count)
+        rows = [LocationRow(*row) for row in self.db.execute(stmt)]
+        return rows, total_count
+
     def find_within_distance_range(
         self,
         query_params: DistanceRangeQuery
-    ) -> tuple[List[tuple[Location, float]], int]:
-        """Find locations within a distance range (between min and max distance)"""
-        center_point = shapely_to_db_point(
-            Point(query_params.longitude, query_params.latitude)
-        )
-
-        # Separate count query - just count IDs
-        count_query = self.db.query(Location.id).filter(
-            functions.ST_DWithin(
-                Location.point, 
-                center_point, 
-                query_params.max_distance_meters
+    ) -> tuple[List[tuple[LocationRow, float]], Optional[int]]:
+        """
+        Find locations within a distance range (between min and max distance).
+        Total and page size follow query_params.count as in get_all_with_filters.
+        """
+        # Separate count query - just count IDs (not even built when no total is wanted)
+        total_count = None
+        if query_params.count != CountStrategy.none:
+            center_point = shapely_to_db_point(
+                Point(query_params.longitude, query_params.latitude)
             )
-        )
-
-        # Add minimum distance filter if specified
-        if query_params.min_distance_meters > 0:
-            count_query = count_query.filter(
-                functions.ST_Distance(Location.point, center_point) >= query_params.min_distance_meters
+            count_query = self.db.query(Location.id).filter(
+                st_dwithin_meters(
+                    Location.point,
+                    center_point,
+                    query_params.max_distance_meters
+                )
             )
 
-        total_count = count_query.count()
+            # Add minimum distance filter if specified
+            if query_params.min_distance_meters > 0:
+                count_query = count_query.filter(
+                    st_distance_meters(Location.point, center_point) >= query_params.min_distance_meters
+                )
+            if query_params.category is not None:
+                count_query = count_query.filter(category_filter(query_params.category))
 
-        # Main query with distance calculation
-        main_query = self.db.query(
-            Location,
-            functions.ST_Distance(Location.point, center_point).label('distance')
-        ).filter(
-            functions.ST_DWithin(
-                Location.point, 
-                center_point, 
-                query_params.max_distance_meters
-            )
-        )
+            total_count = self._count(count_query.statement, query_params.count)
+
+        # Main query with distance calculation, as a cached lambda_stmt (plain values only)
+        longitude, latitude = query_params.longitude, query_params.latitude
+        max_distance = query_params.max_distance_meters
+        min_distance = query_params.min_distance_meters
+        category = query_params.category
+
+        stmt = lambda_stmt(lambda: select(
+            *location_row_columns(),
+            distance_from(longitude, latitude).label('distance')
+        ).where(
+            st_dwithin_meters(Location.point, st_point(longitude, latitude), max_distance)
+        ))
 
         # Add minimum distance filter
-        if query_params.min_distance_meters > 0:
-            main_query = main_query.filter(
-                functions.ST_Distance(Location.point, center_point) >= query_params.min_distance_meters
-            )
+        if min_distance > 0:
+            stmt += lambda s: s.where(distance_from(longitude, latitude) >= min_distance)
+        if category is not None:
+            stmt += lambda s: s.where(category_filter(category))
 
-        # Apply sorting and pagination
+        # Apply sorting and pagination - keyset on (distance, id) when a cursor is given
+        if query_params.cursor:
+            after_distance, after_id = decode_cursor(query_params.cursor)
         if query_params.sort_order == SortOrder.asc:
-            main_query = main_query.order_by(asc('distance'))
+            if query_params.cursor:
+                stmt += lambda s: s.where(
+                    tuple_(distance_from(longitude, latitude), Location.id) > tuple_(after_distance, after_id)
+                )
+            stmt += lambda s: s.order_by(asc('distance'), asc(Location.id))
         else:
-            main_query = main_query.order_by(desc('distance'))
+            if query_params.cursor:
+                stmt += lambda s: s.where(
+                    tuple_(distance_from(longitude, latitude), Location.id) < tuple_(after_distance, after_id)
+                )
+            stmt += lambda s: s.order_by(desc('distance'), desc(Location.id))
 
-        skip = (query_params.page - 1) * query_params.per_page
-        results = main_query.offset(skip).limit(query_params.per_page).all()
+        skip = 0 if query_params.cursor else (query_params.page - 1) * query_params.per_page
+        limit = self._page_size(query_params.per_page, query_params.count)
+        stmt += lambda s: s.offset(skip).limit(limit)
+        results = self.db.execute(stmt).all()
 
-        return [(location, float(distance)) for location, distance in results], total_count
+        return [(LocationRow(*row[:-1]), float(row[-1])) for row in results], total_count
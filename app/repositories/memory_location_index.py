@@ -0,0 +1,381 @@
+import logging
+import math
+import threading
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from shapely.geometry import Point
+from sqlalchemy.orm import Session
+
+from app.core.pagination import KEYSET_DISTANCE_DECIMALS, decode_cursor
+from app.models.location import Location, LocationRow
+from app.repositories.location_repository import LocationRepository, location_row_columns
+from app.schemas.query_schemas import CountStrategy, DistanceRangeQuery, SortOrder
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_METERS = 6371008.8
+METERS_PER_DEGREE = 111320.0
+
+# Above this many grid cells a query just scans every point
+MAX_CELLS_PER_QUERY = 20000
+
+# Rebuild the packed arrays once this many rows sit in the overlay (or are tombstoned)
+OVERLAY_REBUILD_SIZE = 10000
+
+# First KNN search radius; grows 4x until k rows are found
+KNN_INITIAL_RADIUS_METERS = 500
+
+
+def haversine_meters(lat1, lng1, lat2, lng2):
+    """Vectorised great-circle distance in meters (inputs in radians)"""
+    dlat = lat2 - lat1
+    dlng = lng2 - lng1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class _Snapshot:
+    """Immutable packed arrays of every point, sorted by grid cell"""
+
+    def __init__(self, rows: List[LocationRow], cell_degrees: float):
+        self.cell_degrees = cell_degrees
+        count = len(rows)
+        lat = np.fromiter((r.latitude for r in rows), dtype=np.float64, count=count)
+        lng = np.fromiter((r.longitude for r in rows), dtype=np.float64, count=count)
+        cx = np.floor(lng / cell_degrees).astype(np.int64)
+        cy = np.floor(lat / cell_degrees).astype(np.int64)
+
+        order = np.lexsort((cy, cx))
+        self.rows = [rows[i] for i in order]
+        self.ids = np.fromiter((r.id for r in self.rows), dtype=np.int64, count=count)
+        self.categories = np.array([r.category for r in self.rows], dtype=object)
+        self.lat = np.radians(lat[order])
+        self.lng = np.radians(lng[order])
+
+        # cell -> (start, end) slice into the sorted arrays
+        cx, cy = cx[order], cy[order]
+        self.cells: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        if count:
+            boundaries = np.flatnonzero((np.diff(cx) != 0) | (np.diff(cy) != 0)) + 1
+            starts = np.concatenate(([0], boundaries))
+            ends = np.concatenate((boundaries, [count]))
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                self.cells[(int(cx[start]), int(cy[start]))] = (start, end)
+
+    def candidates(self, latitude: float, longitude: float, distance_meters: float) -> Optional[np.ndarray]:
+        """Positions in cells overlapping the circle's bounding box, or None to scan everything"""
+        dlat = distance_meters / METERS_PER_DEGREE
+        cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+        dlng = distance_meters / (METERS_PER_DEGREE * cos_lat)
+        if dlng >= 180 or longitude - dlng < -180 or longitude + dlng > 180 or abs(latitude) + dlat >= 90:
+            return None  # wraps the antimeridian or a pole
+
+        size = self.cell_degrees
+        min_x, max_x = math.floor((longitude - dlng) / size), math.floor((longitude + dlng) / size)
+        min_y, max_y = math.floor((latitude - dlat) / size), math.floor((latitude + dlat) / size)
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > MAX_CELLS_PER_QUERY:
+            return None
+
+        ranges = [
+            self.cells[(x, y)]
+            for x in range(min_x, max_x + 1)
+            for y in range(min_y, max_y + 1)
+            if (x, y) in self.cells
+        ]
+        if not ranges:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(start, end) for start, end in ranges])
+
+
+class MemoryLocationIndex:
+    """
+    Read-only in-process replica of the locations table for nearby queries.
+
+    Points live in NumPy arrays bucketed by a lat/lng grid; queries gather the
+    cells around the search circle and filter with vectorised haversine.
+    Distances are great-circle (sphere), so they can differ from PostGIS
+    spheroid distances by up to ~0.5%.
+
+    Updates land in a small overlay (plus tombstones for changed/deleted ids)
+    that is folded back into the packed arrays once it grows large.
+    """
+
+    def __init__(self, cell_degrees: float = 0.01):
+        self.cell_degrees = cell_degrees
+        self.last_updated_at = None
+        self._lock = threading.Lock()
+        self._snapshot = _Snapshot([], cell_degrees)
+        self._overlay: Dict[int, LocationRow] = {}
+        self._tombstones: set = set()
+        self._publish()
+
+    def __len__(self) -> int:
+        snapshot, overlay_rows, _, _, tombstones = self._view
+        replaced = int(np.isin(snapshot.ids, tombstones).sum()) if len(tombstones) else 0
+        return len(snapshot.rows) - replaced + len(overlay_rows)
+
+    def _publish(self) -> None:
+        """Swap in an immutable view for readers (caller holds the lock)"""
+        overlay_rows = list(self._overlay.values())
+        self._view = (
+            self._snapshot,
+            overlay_rows,
+            np.radians([r.latitude for r in overlay_rows]),
+            np.radians([r.longitude for r in overlay_rows]),
+            np.fromiter(self._tombstones, dtype=np.int64, count=len(self._tombstones)),
+        )
+
+    # ---- loading and freshness -------------------------------------------
+
+    @staticmethod
+    def _select_rows(db: Session):
+        return db.query(*location_row_columns())
+
+    def load(self, db: Session) -> int:
+        """Full (re)load from the database. Returns number of rows indexed"""
+        rows = [LocationRow(*row) for row in self._select_rows(db).yield_per(10000)]
+        snapshot = _Snapshot(rows, self.cell_degrees)
+
+        with self._lock:
+            self._snapshot = snapshot
+            self._overlay = {}
+            self._tombstones = set()
+            self.last_updated_at = max((r.updated_at for r in rows), default=None)
+            self._publish()
+        return len(rows)
+
+    def refresh(self, db: Session, overlap_seconds: int = 60) -> int:
+        """
+        Pull rows changed since the last seen updated_at. The window overlaps by
+        overlap_seconds because updated_at is set at transaction start, so a row
+        can commit after a later-stamped one. Deletes only show up on load().
+        """
+        if self.last_updated_at is None:
+            return self.load(db)
+
+        since = self.last_updated_at - timedelta(seconds=overlap_seconds)
+        rows = [
+            LocationRow(*row)
+            for row in self._select_rows(db).filter(Location.updated_at > since)
+        ]
+        self.upsert(rows)
+        return len(rows)
+
+    def upsert(self, rows: Iterable[LocationRow]) -> None:
+        """Insert or replace rows (write-through from this process, or a refresh)"""
+        rows = list(rows)
+        if not rows:
+            return
+        with self._lock:
+            for row in rows:
+                self._overlay[row.id] = row
+                self._tombstones.add(row.id)
+                if self.last_updated_at is None or row.updated_at > self.last_updated_at:
+                    self.last_updated_at = row.updated_at
+            if len(self._overlay) >= OVERLAY_REBUILD_SIZE:
+                self._rebuild()
+            self._publish()
+
+    def remove(self, location_id: int) -> None:
+        """Drop a row (write-through delete from this process)"""
+        self.remove_many([location_id])
+
+    def remove_many(self, location_ids: Iterable[int]) -> None:
+        """Drop rows in one publish (write-through bulk delete from this process)"""
+        with self._lock:
+            for location_id in location_ids:
+                self._overlay.pop(location_id, None)
+                self._tombstones.add(location_id)
+            if len(self._tombstones) >= OVERLAY_REBUILD_SIZE:
+                self._rebuild()
+            self._publish()
+
+    def _rebuild(self) -> None:
+        """Fold overlay and tombstones into fresh packed arrays (caller holds the lock)"""
+        rows = [r for r in self._snapshot.rows if r.id not in self._tombstones]
+        rows.extend(self._overlay.values())
+        self._snapshot = _Snapshot(rows, self.cell_degrees)
+        self._overlay = {}
+        self._tombstones = set()
+
+    # ---- queries ------------------------------------------------------------
+
+    def _within(
+        self,
+        latitude: float,
+        longitude: float,
+        distance_meters: float,
+        category: Optional[str] = None
+    ) -> Tuple[List[LocationRow], np.ndarray, np.ndarray]:
+        """All rows within distance (of category, if given), as (rows, distances, ids) - unsorted"""
+        snapshot, overlay_rows, overlay_lat, overlay_lng, tombstones = self._view
+        lat0, lng0 = math.radians(latitude), math.radians(longitude)
+
+        positions = snapshot.candidates(latitude, longitude, distance_meters)
+        if positions is None:
+            positions = np.arange(len(snapshot.rows))
+        distances = haversine_meters(lat0, lng0, snapshot.lat[positions], snapshot.lng[positions])
+        keep = distances <= distance_meters
+        if len(tombstones):
+            keep &= ~np.isin(snapshot.ids[positions], tombstones)
+        if category is not None:
+            keep &= snapshot.categories[positions] == category
+        positions, distances = positions[keep], distances[keep]
+        rows = [snapshot.rows[i] for i in positions.tolist()]
+
+        if overlay_rows:
+            overlay_distances = haversine_meters(lat0, lng0, overlay_lat, overlay_lng)
+            hits = np.flatnonzero(overlay_distances <= distance_meters)
+            if category is not None:
+                hits = hits[np.array([overlay_rows[i].category == category for i in hits.tolist()], dtype=bool)]
+            rows.extend(overlay_rows[i] for i in hits.tolist())
+            distances = np.concatenate((distances, overlay_distances[hits]))
+
+        ids = np.fromiter((r.id for r in rows), dtype=np.int64, count=len(rows))
+        return rows, distances, ids
+
+    @staticmethod
+    def distances_from(latitude: float, longitude: float, latitudes, longitudes) -> np.ndarray:
+        """The index's own spherical metric from one point to arrays of points (degrees in, meters out)"""
+        return haversine_meters(
+            math.radians(latitude), math.radians(longitude),
+            np.radians(np.asarray(latitudes, dtype=float)), np.radians(np.asarray(longitudes, dtype=float))
+        )
+
+    @staticmethod
+    def _ordered(distances, ids, descending: bool = False):
+        """Positions sorted by (distance, id)"""
+        order = np.lexsort((ids, distances))
+        return order[::-1] if descending else order
+
+    @staticmethod
+    def _after_mask(distances, ids, after: Tuple[float, int], descending: bool = False):
+        """Keyset filter matching the (distance, id) row comparison the SQL path uses"""
+        distance, location_id = after
+        if descending:
+            return (distances < distance) | ((distances == distance) & (ids < location_id))
+        return (distances > distance) | ((distances == distance) & (ids > location_id))
+
+    def find_within_distance_with_distances(
+        self,
+        center_point: Point,
+        distance_meters: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[tuple[float, int]] = None,
+        category: Optional[str] = None
+    ) -> List[tuple[LocationRow, float]]:
+        """Same contract as LocationRepository.find_within_distance_with_distances"""
+        rows, distances, ids = self._within(center_point.y, center_point.x, distance_meters, category)
+        distances = np.round(distances, KEYSET_DISTANCE_DECIMALS)
+        order = self._ordered(distances, ids)
+        if after is not None:
+            order = order[self._after_mask(distances[order], ids[order], after)]
+        order = order[skip:skip + limit]
+        return [(rows[i], float(distances[i])) for i in order.tolist()]
+
+    def find_within_distance_batch(
+        self,
+        queries: List[Tuple[float, float, int]],
+        limit: int = 10
+    ) -> List[List[Tuple[LocationRow, float]]]:
+        """Same contract as LocationRepository.find_within_distance_batch"""
+        return [
+            self.find_within_distance_with_distances(Point(lng, lat), radius, limit=limit)
+            for lat, lng, radius in queries
+        ]
+
+    def find_k_nearest(
+        self,
+        center_point: Point,
+        k: int = 10,
+        max_distance_meters: Optional[int] = None,
+        category: Optional[str] = None
+    ) -> List[tuple[LocationRow, float]]:
+        """Same contract as LocationRepository.find_k_nearest"""
+        cap = max_distance_meters or math.pi * EARTH_RADIUS_METERS
+        radius = min(KNN_INITIAL_RADIUS_METERS, cap)
+
+        # Everything within radius is found exactly, so stop once it holds k rows
+        while True:
+            rows, distances, ids = self._within(center_point.y, center_point.x, radius, category)
+            if len(rows) >= k or radius >= cap:
+                break
+            radius = min(radius * 4, cap)
+
+        order = self._ordered(distances, ids)[:k]
+        return [(rows[i], float(distances[i])) for i in order.tolist()]
+
+    def find_within_distance_range(
+        self,
+        query_params: DistanceRangeQuery
+    ) -> tuple[List[tuple[LocationRow, float]], Optional[int]]:
+        """Same contract as LocationRepository.find_within_distance_range (totals here are always exact)"""
+        rows, distances, ids = self._within(
+            query_params.latitude, query_params.longitude, query_params.max_distance_meters,
+            query_params.category
+        )
+        in_range = distances >= query_params.min_distance_meters
+        total = int(in_range.sum())
+
+        descending = query_params.sort_order == SortOrder.desc
+        order = self._ordered(distances, ids, descending)
+        order = order[in_range[order]]
+        if query_params.cursor:
+            after = decode_cursor(query_params.cursor)
+            order = order[self._after_mask(distances[order], ids[order], after, descending)]
+            skip = 0
+        else:
+            skip = (query_params.page - 1) * query_params.per_page
+
+        limit = LocationRepository._page_size(query_params.per_page, query_params.count)
+        order = order[skip:skip + limit]
+        if query_params.count == CountStrategy.none:
+            total = None
+        return [(rows[i], float(distances[i])) for i in order.tolist()], total
+
+
+class MemoryIndexPoller:
+    """Background thread keeping a MemoryLocationIndex fresh by polling updated_at"""
+
+    def __init__(self, index: MemoryLocationIndex, session_factory,
+                 poll_seconds: float = 5.0, reload_seconds: float = 300.0):
+        self.index = index
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self.reload_seconds = reload_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="memory-index-poller", daemon=True)
+
+    def load(self) -> int:
+        db = self.session_factory()
+        try:
+            return self.index.load(db)
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=self.poll_seconds + 5)
+
+    def _run(self) -> None:
+        since_reload = 0.0
+        while not self._stop.wait(self.poll_seconds):
+            since_reload += self.poll_seconds
+            db = self.session_factory()
+            try:
+                # Periodic full reload also picks up deletes made by other workers
+                if since_reload >= self.reload_seconds:
+                    self.index.load(db)
+                    since_reload = 0.0
+                else:
+                    self.index.refresh(db)
+            except Exception:
+                logger.exception("Memory index refresh failed")
+            finally:
+                db.close()
@@ -1,41 +1,136 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+import tempfile
+import time
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from datetime import datetime
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Iterable, List, Optional, Tuple
 
-from app.core.dependencies import get_db
-from app.repositories.location_repository import LocationRepository
+from app.core.cache import (
+    DENSE_MARKER, MAX_CACHED_CANDIDATES, NearbyCache, decode_candidates, encode_candidates,
+    radius_bucket, rank_candidates
+)
+from app.core.tiles import TileCache
+from app.core.dependencies import (
+    get_db, get_location_repository, get_read_location_repository, get_nearby_cache, get_memory_index,
+    get_tile_cache, get_replica_router, read_session_factory
+)
+from app.models.location import LocationRow
+from app.core.importers import ImportFormat, InvalidDocument, run_import
+from app.core.exporters import ExportFormat, MEDIA_TYPES, run_export
+from app.core import flatgeobuf
+from app.core.replicas import ReplicaRouter, remember_write
+from app.core.config import settings
+from app.repositories.async_location_repository import AsyncLocationRepository
+from app.repositories.location_repository import BulkWriteError, LocationRepository
+from app.repositories.memory_location_index import MemoryLocationIndex
 from app.schemas.location_schemas import (
     LocationCreate, LocationResponse, LocationWithDistance,
-    NearbySearchParams, LocationListResponse
+    NearbySearchParams, NearbySearchResponse, NearestSearchParams, LocationListResponse, DistanceRangeResponse,
+    BulkImportResponse, BulkDeleteRequest, BulkDeleteResponse, BulkUpdateRequest, BulkUpdateResponse,
+    BatchNearbyRequest, BatchNearbyResponse,
+    LocationSearchParams, LocationSearchResponse, BBoxSearchParams, BBoxSearchResponse
 )
-from app.core.geometry import latlong_to_point, db_point_to_shapely, point_to_latlong
+from app.core.geometry import latlong_to_point, db_point_to_shapely, point_to_latlong, spheroid_distance_meters
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.responses import FastJSONResponse, location_payload
+from app.core.http_cache import cache_headers, etag_matches, location_etag, results_etag
+from app.schemas.query_schemas import (
+    CountStrategy, DistanceRangeQuery, LocationQuery, LocationSortBy, SearchSortBy, ViewportMode
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/locations", tags=["locations"])
 
+# Above this many changed points, dropping the nearby and tile caches outright is
+# cheaper than invalidating point by point (each point touches every tile zoom)
+BULK_INVALIDATE_POINTS = 100
+
+
+def _not_modified(if_none_match: Optional[str], headers: dict) -> Optional[Response]:
+    """304 (with the validators, no body) when the client already has this representation"""
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
+
+
+async def _invalidate_points(
+    points: List[Tuple[float, float]],
+    cache: Optional[NearbyCache],
+    tile_cache: Optional[TileCache]
+) -> None:
+    """Drop cached nearby results and tiles covering these (latitude, longitude) points"""
+    if len(points) > BULK_INVALIDATE_POINTS:
+        if cache is not None:
+            await cache.clear()
+        if tile_cache is not None:
+            await run_in_threadpool(tile_cache.clear)
+        return
+
+    if cache is not None:
+        for lat, lng in points:
+            await cache.invalidate_point(lat, lng)
+    if tile_cache is not None:
+        def invalidate_tiles(points: Iterable[Tuple[float, float]]) -> None:
+            for lat, lng in points:
+                tile_cache.invalidate_point(lat, lng)
+
+        await run_in_threadpool(invalidate_tiles, points)
+
+
+async def _read(repo: AsyncLocationRepository, index: Optional[MemoryLocationIndex], method: str, **kwargs):
+    """Run a read on the in-memory index when READ_ENGINE=memory, otherwise on PostGIS"""
+    if index is not None:
+        return await run_in_threadpool(getattr(index, method), **kwargs)
+    return await getattr(repo, method)(**kwargs)
+
 
 @router.post("/", response_model=LocationResponse, status_code=status.HTTP_201_CREATED)
-def create_location(
+async def create_location(
     location: LocationCreate,
-    db: Session = Depends(get_db)
+    response: Response,
+    repo: AsyncLocationRepository = Depends(get_location_repository),
+    cache: Optional[NearbyCache] = Depends(get_nearby_cache),
+    index: Optional[MemoryLocationIndex] = Depends(get_memory_index),
+    tile_cache: Optional[TileCache] = Depends(get_tile_cache),
+    replicas: Optional[ReplicaRouter] = Depends(get_replica_router)
 ):
-    """Create a new location"""
-    repo = LocationRepository(db)
+    """Create a new location, or return the existing one at the same spot (200)"""
     point = latlong_to_point(location.latitude, location.longitude)
 
-    db_location = repo.create_if_not_exists(
+    db_location, was_created = await repo.create_if_not_exists(
         name=location.name,
         description=location.description,
-        point=point
+        point=point,
+        category=location.category
     )
+    if not was_created:
+        response.status_code = status.HTTP_200_OK
+    else:
+        remember_write(response, replicas)
+        if cache is not None:
+            await cache.invalidate_point(location.latitude, location.longitude)
+        if tile_cache is not None:
+            await run_in_threadpool(tile_cache.invalidate_point, location.latitude, location.longitude)
 
     # Convert back to response format
     shapely_point = db_point_to_shapely(db_location.point)
     lat, lng = point_to_latlong(shapely_point)
 
+    if was_created and index is not None:
+        index.upsert([LocationRow(
+            db_location.id, db_location.name, db_location.description,
+            lat, lng, db_location.created_at, db_location.updated_at, db_location.category
+        )])
+
     return LocationResponse(
         id=db_location.id,
         name=db_location.name,
         description=db_location.description,
+        category=db_location.category,
         latitude=lat,
         longitude=lng,
         created_at=db_location.created_at,
@@ -43,14 +138,400 @@ def create_location(
     )
 
 
+@router.get("/", response_model=LocationListResponse)
+async def list_locations(
+    params: LocationQuery = Depends(),
+    if_none_match: Optional[str] = Header(None),
+    repo: AsyncLocationRepository = Depends(get_read_location_repository)
+):
+    """List locations, optionally filtered by an indexed text search"""
+    rows, total = await repo.get_rows_with_filters(params)
+
+    # Exact totals give has_next directly; otherwise the repository fetched one extra row
+    if params.count == CountStrategy.exact:
+        has_next = params.page * params.per_page < total
+    else:
+        has_next = len(rows) > params.per_page
+        rows = rows[:params.per_page]
+
+    headers = cache_headers(results_etag(rows, total, has_next), settings.search_cache_control)
+    not_modified = _not_modified(if_none_match, headers)
+    if not_modified is not None:
+        return not_modified
+
+    return FastJSONResponse({
+        "locations": [location_payload(row) for row in rows],
+        "total": total,
+        "count_strategy": params.count,
+        "page": params.page,
+        "per_page": params.per_page,
+        "has_next": has_next
+    }, headers=headers)
+
+
+@router.post("/bulk", response_model=BulkImportResponse)
+async def bulk_import_locations(
+    request: Request,
+    response: Response,
+    format: ImportFormat = Query(ImportFormat.ndjson, description="Body format: ndjson, csv or geojson"),
+    tolerance_meters: int = Query(10, ge=0, le=1000, description="Dedup radius in meters"),
+    db: Session = Depends(get_db),
+    cache: Optional[NearbyCache] = Depends(get_nearby_cache),
+    tile_cache: Optional[TileCache] = Depends(get_tile_cache),
+    replicas: Optional[ReplicaRouter] = Depends(get_replica_router)
+):
+    """Bulk import locations from an NDJSON, CSV or GeoJSON FeatureCollection body"""
+    # Spool the body to disk so the import reads it with bounded memory
+    with tempfile.TemporaryFile() as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+
+        # COPY goes through psycopg2, so this always runs on the sync session
+        try:
+            stats = await run_in_threadpool(
+                run_import, LocationRepository(db), spool, format, tolerance_meters
+            )
+        except InvalidDocument as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            )
+
+    if stats["inserted"]:
+        remember_write(response, replicas)
+
+    # Inserts are spread over arbitrary cells, so drop the whole nearby and tile caches
+    if cache is not None and stats["inserted"]:
+        await cache.clear()
+    if tile_cache is not None and stats["inserted"]:
+        await run_in_threadpool(tile_cache.clear)
+
+    return BulkImportResponse(**stats)
+
+
+@router.delete("/", response_model=BulkDeleteResponse)
+async def bulk_delete_locations(
+    body: BulkDeleteRequest,
+    response: Response,
+    repo: AsyncLocationRepository = Depends(get_location_repository),
+    cache: Optional[NearbyCache] = Depends(get_nearby_cache),
+    index: Optional[MemoryLocationIndex] = Depends(get_memory_index),
+    tile_cache: Optional[TileCache] = Depends(get_tile_cache),
+    replicas: Optional[ReplicaRouter] = Depends(get_replica_router)
+):
+    """
+    Delete every location matching all given filters (ids, bbox, updated_before), in
+    batches. If a batch fails, the earlier batches stay deleted: the response is a
+    500 reporting how many rows were deleted before the failure.
+    """
+    start = time.perf_counter()
+    deleted, error = [], None
+    try:
+        deleted = await repo.bulk_delete(ids=body.ids, bbox=body.bbox, updated_before=body.updated_before)
+    except BulkWriteError as exc:
+        logger.error("Bulk delete failed", exc_info=exc.__cause__)
+        deleted, error = exc.completed, str(exc)
+        response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    finally:
+        # Committed batches must leave the caches and the index even when a later one failed
+        if deleted:
+            remember_write(response, replicas)
+            if index is not None:
+                index.remove_many(location_id for location_id, _, _ in deleted)
+            await _invalidate_points([(lat, lng) for _, lat, lng in deleted], cache, tile_cache)
+
+    return BulkDeleteResponse(
+        deleted=len(deleted), elapsed_seconds=round(time.perf_counter() - start, 3), error=error
+    )
+
+
+@router.patch("/bulk", response_model=BulkUpdateResponse)
+async def bulk_update_locations(
+    body: BulkUpdateRequest,
+    response: Response,
+    repo: AsyncLocationRepository = Depends(get_location_repository),
+    cache: Optional[NearbyCache] = Depends(get_nearby_cache),
+    index: Optional[MemoryLocationIndex] = Depends(get_memory_index),
+    tile_cache: Optional[TileCache] = Depends(get_tile_cache),
+    replicas: Optional[ReplicaRouter] = Depends(get_replica_router)
+):
+    """
+    Update name, description, category or coordinates of many locations, in batches.
+    If a batch fails, the earlier batches stay applied: the response is a 500
+    reporting the rows updated before the failure (not_found is then not reported).
+    """
+    start = time.perf_counter()
+    updated, error = [], None
+    try:
+        updated = await repo.bulk_update([
+            (patch.id, patch.name, patch.description, patch.category, patch.latitude, patch.longitude)
+            for patch in body.updates
+        ])
+    except BulkWriteError as exc:
+        logger.error("Bulk update failed", exc_info=exc.__cause__)
+        updated, error = exc.completed, str(exc)
+        response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    finally:
+        # Committed batches must reach the caches and the index even when a later one failed
+        if updated:
+            remember_write(response, replicas)
+            if index is not None:
+                index.upsert(row for row, _, _ in updated)
+            # A moved point leaves its old cells and tiles and enters new ones
+            points = set()
+            for row, old_lat, old_lng in updated:
+                points.add((old_lat, old_lng))
+                points.add((row.latitude, row.longitude))
+            await _invalidate_points(list(points), cache, tile_cache)
+
+    updated_ids = {row.id for row, _, _ in updated}
+    return BulkUpdateResponse(
+        requested=len(body.updates),
+        updated=len(updated),
+        not_found=[] if error else [patch.id for patch in body.updates if patch.id not in updated_ids],
+        elapsed_seconds=round(time.perf_counter() - start, 3),
+        error=error
+    )
+
+
+@router.get("/export")
+async def export_locations(
+    request: Request,
+    format: ExportFormat = Query(ExportFormat.ndjson, description="ndjson, geojson or fgb (FlatGeobuf)"),
+    min_longitude: Optional[float] = Query(None, ge=-180, le=180, description="Bounding box (all four or none)"),
+    min_latitude: Optional[float] = Query(None, ge=-90, le=90),
+    max_longitude: Optional[float] = Query(None, ge=-180, le=180),
+    max_latitude: Optional[float] = Query(None, ge=-90, le=90),
+    latitude: Optional[float] = Query(None, ge=-90, le=90, description="Radius center (with longitude, distance_meters)"),
+    longitude: Optional[float] = Query(None, ge=-180, le=180),
+    distance_meters: Optional[int] = Query(None, gt=0, le=50000, description="Radius in meters (max 50km)"),
+    updated_since: Optional[datetime] = Query(None, description="Only rows updated at or after this time")
+):
+    """Stream every matching location as NDJSON, a GeoJSON FeatureCollection or FlatGeobuf"""
+    bbox = (min_longitude, min_latitude, max_longitude, max_latitude)
+    near = (latitude, longitude, distance_meters)
+    for name, group in (("bounding box", bbox), ("radius", near)):
+        if any(v is not None for v in group) and any(v is None for v in group):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Incomplete {name} filter"
+            )
+    if format == ExportFormat.fgb and not flatgeobuf.available():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="FlatGeobuf export requires the flatbuffers package"
+        )
+
+    # Rows come off a server-side cursor on the stream's own sync session (a replica
+    # when one is usable), so the body is produced batch by batch in the threadpool
+    body = run_export(
+        read_session_factory(request), format,
+        bbox=bbox if bbox[0] is not None else None,
+        near=near if near[0] is not None else None,
+        updated_since=updated_since
+    )
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="locations.{format.value}"'}
+    )
+
+
+@router.get("/bbox", response_model=BBoxSearchResponse)
+async def find_locations_in_bbox(
+    params: BBoxSearchParams = Depends(),
+    if_none_match: Optional[str] = Header(None),
+    repo: AsyncLocationRepository = Depends(get_read_location_repository)
+):
+    """
+    Everything inside a map viewport. Returns up to limit points; a viewport that
+    is zoomed out below BBOX_CLUSTER_BELOW_ZOOM, or holds more than limit points,
+    comes back as grid clusters instead, so the response size stays bounded.
+    """
+    if params.min_longitude >= params.max_longitude or params.min_latitude >= params.max_latitude:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bounding box min must be below max (antimeridian crossing is not supported)"
+        )
+    bbox = (params.min_longitude, params.min_latitude, params.max_longitude, params.max_latitude)
+
+    if params.zoom is None or params.zoom >= settings.bbox_cluster_below_zoom:
+        # One extra row tells us the viewport is over the cap
+        rows = await repo.find_within_bbox(bbox=bbox, limit=params.limit + 1, category=params.category)
+        if len(rows) <= params.limit:
+            headers = cache_headers(results_etag(rows), settings.search_cache_control)
+            not_modified = _not_modified(if_none_match, headers)
+            if not_modified is not None:
+                return not_modified
+            return FastJSONResponse({
+                "mode": ViewportMode.points.value,
+                "locations": [location_payload(row) for row in rows],
+                "clusters": [],
+                "grid_size_degrees": None
+            }, headers=headers)
+
+    # Square cells sized off the longer side: at most grid x grid clusters
+    grid_size = max(bbox[2] - bbox[0], bbox[3] - bbox[1]) / settings.bbox_cluster_grid
+    clusters = await repo.cluster_within_bbox(bbox=bbox, grid_size=grid_size, category=params.category)
+    return FastJSONResponse({
+        "mode": ViewportMode.clusters.value,
+        "locations": [],
+        "clusters": [
+            {"count": count, "latitude": latitude, "longitude": longitude}
+            for count, latitude, longitude in clusters
+        ],
+        "grid_size_degrees": grid_size
+    })
+
+
+@router.get("/nearest", response_model=List[LocationWithDistance])
+async def find_nearest_locations(
+    params: NearestSearchParams = Depends(),
+    if_none_match: Optional[str] = Header(None),
+    repo: AsyncLocationRepository = Depends(get_read_location_repository),
+    index: Optional[MemoryLocationIndex] = Depends(get_memory_index)
+):
+    """Find the k nearest locations, optionally capped at a maximum distance"""
+    center_point = latlong_to_point(params.latitude, params.longitude)
+
+    results = await _read(
+        repo, index, "find_k_nearest",
+        center_point=center_point,
+        k=params.k,
+        max_distance_meters=params.max_distance_meters,
+        category=params.category
+    )
+
+    headers = cache_headers(results_etag(row for row, _ in results), settings.search_cache_control)
+    not_modified = _not_modified(if_none_match, headers)
+    if not_modified is not None:
+        return not_modified
+
+    return FastJSONResponse([location_payload(row, distance) for row, distance in results], headers=headers)
+
+
+@router.get("/search", response_model=LocationSearchResponse)
+async def search_locations(
+    params: LocationSearchParams = Depends(),
+    if_none_match: Optional[str] = Header(None),
+    repo: AsyncLocationRepository = Depends(get_read_location_repository)
+):
+    """Find locations matching a text query within a radius ("coffee within 2 km") in one query"""
+    after = None
+    skip = (params.page - 1) * params.per_page
+    if params.cursor:
+        if params.sort_by != SearchSortBy.distance:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="cursor is only supported with sort_by=distance"
+            )
+        try:
+            after = decode_cursor(params.cursor)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            )
+        skip = 0
+
+    results = await repo.search_within_distance(
+        center_point=latlong_to_point(params.latitude, params.longitude),
+        distance_meters=params.distance_meters,
+        term=params.q,
+        sort_by=params.sort_by,
+        skip=skip,
+        limit=params.per_page,
+        after=after
+    )
+
+    next_cursor = None
+    if params.sort_by == SearchSortBy.distance and len(results) == params.per_page:
+        last_row, last_distance, _ = results[-1]
+        next_cursor = encode_cursor(last_distance, last_row.id)
+
+    headers = cache_headers(results_etag(row for row, _, _ in results), settings.search_cache_control)
+    not_modified = _not_modified(if_none_match, headers)
+    if not_modified is not None:
+        return not_modified
+
+    return FastJSONResponse({
+        "locations": [
+            {**location_payload(row, distance), "relevance": relevance}
+            for row, distance, relevance in results
+        ],
+        "next_cursor": next_cursor
+    }, headers=headers)
+
+
+@router.get("/range", response_model=DistanceRangeResponse)
+async def find_locations_in_distance_range(
+    params: DistanceRangeQuery = Depends(),
+    if_none_match: Optional[str] = Header(None),
+    repo: AsyncLocationRepository = Depends(get_read_location_repository),
+    index: Optional[MemoryLocationIndex] = Depends(get_memory_index)
+):
+    """Find locations between min_distance_meters and max_distance_meters, ordered by distance"""
+    if params.min_distance_meters > params.max_distance_meters:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_distance_meters must not exceed max_distance_meters"
+        )
+    if params.sort_by != LocationSortBy.distance:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Range queries are always ordered by distance"
+        )
+    if params.cursor:
+        try:
+            decode_cursor(params.cursor)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            )
+
+    results, total = await _read(repo, index, "find_within_distance_range", query_params=params)
+
+    # Without an exact total the repository fetched one extra row; with one, a cursor
+    # page cannot be placed against it, so a full page is taken to mean there is more
+    if params.count != CountStrategy.exact:
+        has_next = len(results) > params.per_page
+        results = results[:params.per_page]
+    elif params.cursor:
+        has_next = len(results) == params.per_page
+    else:
+        has_next = params.page * params.per_page < total
+
+    next_cursor = None
+    if has_next and results:
+        last_row, last_distance = results[-1]
+        next_cursor = encode_cursor(last_distance, last_row.id)
+
+    headers = cache_headers(
+        results_etag((row for row, _ in results), total, has_next), settings.search_cache_control
+    )
+    not_modified = _not_modified(if_none_match, headers)
+    if not_modified is not None:
+        return not_modified
+
+    return FastJSONResponse({
+        "locations": [location_payload(row, distance) for row, distance in results],
+        "total": total,
+        "count_strategy": params.count,
+        "has_next": has_next,
+        "next_cursor": next_cursor
+    }, headers=headers)
+
+
 @router.get("/{location_id}", response_model=LocationResponse)
-def get_location(
+async def get_location(
     location_id: int,
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    repo: AsyncLocationRepository = Depends(get_read_location_repository)
 ):
     """Get a single location by ID"""
-    repo = LocationRepository(db)
-    location = repo.get_by_id(location_id)
+    location = await repo.get_row_by_id(location_id)
 
     if not location:
         raise HTTPException(
@@ -58,67 +539,159 @@ def get_location(
             detail="Location not found"
         )
 
-    shapely_point = db_point_to_shapely(location.point)
-    lat, lng = point_to_latlong(shapely_point)
+    headers = cache_headers(location_etag(location), settings.location_cache_control)
+    not_modified = _not_modified(if_none_match, headers)
+    if not_modified is not None:
+        return not_modified
 
-    return LocationResponse(
-        id=location.id,
-        name=location.name,
-        description=location.description,
-        latitude=lat,
-        longitude=lng,
-        created_at=location.created_at,
-        updated_at=location.updated_at
-    )
+    return FastJSONResponse(location_payload(location), headers=headers)
 
 
 @router.delete("/{location_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_location(
+async def delete_location(
     location_id: int,
-    db: Session = Depends(get_db)
+    response: Response,
+    repo: AsyncLocationRepository = Depends(get_location_repository),
+    cache: Optional[NearbyCache] = Depends(get_nearby_cache),
+    index: Optional[MemoryLocationIndex] = Depends(get_memory_index),
+    tile_cache: Optional[TileCache] = Depends(get_tile_cache),
+    replicas: Optional[ReplicaRouter] = Depends(get_replica_router)
 ):
     """Delete a location"""
-    repo = LocationRepository(db)
-    if not repo.delete(location_id):
+    location = await repo.delete(location_id)
+    if not location:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Location not found"
         )
 
+    remember_write(response, replicas)
+    await _invalidate_points([(location.latitude, location.longitude)], cache, tile_cache)
+    if index is not None:
+        index.remove(location_id)
 
-@router.get("/nearby/search", response_model=List[LocationWithDistance])
-def find_nearby_locations(
+
+@router.get("/nearby/search", response_model=NearbySearchResponse)
+async def find_nearby_locations(
     params: NearbySearchParams = Depends(),
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    repo: AsyncLocationRepository = Depends(get_read_location_repository),
+    primary: AsyncLocationRepository = Depends(get_location_repository),
+    cache: Optional[NearbyCache] = Depends(get_nearby_cache),
+    index: Optional[MemoryLocationIndex] = Depends(get_memory_index)
 ):
     """Find locations within specified distance"""
-    repo = LocationRepository(db)
     center_point = latlong_to_point(params.latitude, params.longitude)
 
-    # Calculate pagination
+    # Keyset pagination when a cursor is given, offset otherwise
+    after = None
     skip = (params.page - 1) * params.per_page
+    if params.cursor:
+        try:
+            after = decode_cursor(params.cursor)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            )
+        skip = 0
 
-    results = repo.find_within_distance_with_distances(
-        center_point=center_point,
-        distance_meters=params.distance_meters,
-        skip=skip,
-        limit=params.per_page
+    results = None
+    if cache is not None:
+        results = await _cached_nearby(cache, primary, index, params, skip, after)
+    if results is None:
+        results = await _read(
+            repo, index, "find_within_distance_with_distances",
+            center_point=center_point,
+            distance_meters=params.distance_meters,
+            skip=skip,
+            limit=params.per_page,
+            after=after,
+            category=params.category
+        )
+
+    next_cursor = None
+    if len(results) == params.per_page:
+        last_row, last_distance = results[-1]
+        next_cursor = encode_cursor(last_distance, last_row.id)
+
+    headers = cache_headers(results_etag(row for row, _ in results), settings.search_cache_control)
+    not_modified = _not_modified(if_none_match, headers)
+    if not_modified is not None:
+        return not_modified
+
+    return FastJSONResponse({
+        "locations": [location_payload(row, distance) for row, distance in results],
+        "next_cursor": next_cursor
+    }, headers=headers)
+
+
+async def _cached_nearby(
+    cache: NearbyCache,
+    repo: AsyncLocationRepository,
+    index: Optional[MemoryLocationIndex],
+    params: NearbySearchParams,
+    skip: int,
+    after: Optional[Tuple[float, int]]
+) -> Optional[List[Tuple[LocationRow, float]]]:
+    """
+    A nearby page from the cache entry for the snapped cell and radius bucket -
+    the candidates around the cell center, ranked from the client's point - or
+    None when the cell is too dense to cache and the exact query should run.
+    Misses are filled from the primary (repo): an entry seeded by a lagging
+    replica right after a write invalidated it would serve the old rows for a TTL.
+    """
+    latitude, longitude = cache.snap(params.latitude, params.longitude)
+    bucket = radius_bucket(params.distance_meters)
+    cache_key = cache.key(latitude, longitude, bucket, category=params.category)
+
+    cached = await cache.get(cache_key)
+    if cached is None:
+        radius = cache.superset_radius(params.distance_meters)
+        rows = await _read(
+            repo, index, "find_within_distance_with_distances",
+            center_point=latlong_to_point(latitude, longitude),
+            distance_meters=radius,
+            limit=MAX_CACHED_CANDIDATES + 1,
+            category=params.category
+        )
+        too_dense = len(rows) > MAX_CACHED_CANDIDATES
+        cached = DENSE_MARKER if too_dense else encode_candidates([row for row, _ in rows])
+        await cache.set(cache_key, cached, latitude, longitude, radius)
+
+    if cached == DENSE_MARKER:
+        return None
+    # Rank with the metric of the uncached path, so cursors move between the two
+    return rank_candidates(
+        decode_candidates(cached), params.latitude, params.longitude, params.distance_meters,
+        skip=skip, limit=params.per_page, after=after,
+        distances_from=index.distances_from if index is not None else spheroid_distance_meters
+    )
+
+
+@router.post("/nearby/batch", response_model=BatchNearbyResponse)
+async def find_nearby_locations_batch(
+    request: BatchNearbyRequest,
+    repo: AsyncLocationRepository = Depends(get_read_location_repository),
+    index: Optional[MemoryLocationIndex] = Depends(get_memory_index)
+):
+    """Find locations near many points at once, grouped per input point"""
+    queries = [(q.latitude, q.longitude, q.distance_meters) for q in request.queries]
+
+    grouped = await _read(
+        repo, index, "find_within_distance_batch",
+        queries=queries,
+        limit=request.per_point_limit
     )
 
-    response = []
-    for location, distance in results:
-        shapely_point = db_point_to_shapely(location.point)
-        lat, lng = point_to_latlong(shapely_point)
-
-        response.append(LocationWithDistance(
-            id=location.id,
-            name=location.name,
-            description=location.description,
-            latitude=lat,
-            longitude=lng,
-            created_at=location.created_at,
-            updated_at=location.updated_at,
-            distance_meters=distance
-        ))
-
-    return response
+    return FastJSONResponse({
+        "results": [
+            {
+                "latitude": query.latitude,
+                "longitude": query.longitude,
+                "distance_meters": query.distance_meters,
+                "locations": [location_payload(row, distance) for row, distance in results]
+            }
+            for query, results in zip(request.queries, grouped)
+        ]
+    })
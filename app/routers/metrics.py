@@ -0,0 +1,54 @@
+import os
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.database import engine, async_engine, replica_router
+from app.core.dependencies import nearby_cache
+from app.core.instrumentation import render_metrics
+from app.core.pooling import pool_snapshot
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("", response_class=PlainTextResponse)
+def get_prometheus_metrics():
+    """Request, DB time, statement and row histograms in Prometheus text format"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/pool")
+def get_pool_metrics():
+    """Connection pool usage and checkout wait times for this worker process"""
+    pools = {"sync": pool_snapshot(engine.pool)}
+    if async_engine is not None:
+        pools["async"] = pool_snapshot(async_engine.sync_engine.pool)
+    if replica_router is not None:
+        for replica in replica_router.replicas:
+            pools[replica.name] = pool_snapshot(replica.engine.pool)
+            if replica.async_engine is not None:
+                pools[f"{replica.name}-async"] = pool_snapshot(replica.async_engine.sync_engine.pool)
+
+    return {"pid": os.getpid(), "pools": pools}
+
+
+@router.get("/replicas")
+def get_replica_metrics():
+    """Health, lag and usability of each read replica as of its last probe"""
+    if replica_router is None:
+        return {"pid": os.getpid(), "enabled": False}
+
+    return {
+        "pid": os.getpid(),
+        "enabled": True,
+        "max_lag_seconds": replica_router.max_lag_seconds,
+        "replicas": replica_router.snapshot()
+    }
+
+
+@router.get("/cache")
+async def get_cache_metrics():
+    """Nearby search cache hit/miss/eviction counters for this worker process"""
+    if nearby_cache is None:
+        return {"pid": os.getpid(), "enabled": False}
+
+    return {"pid": os.getpid(), "enabled": True, **await nearby_cache.stats()}
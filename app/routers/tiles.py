@@ -0,0 +1,47 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Path, Response, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.dependencies import get_location_repository, get_read_location_repository, get_tile_cache
+from app.core.tiles import MAX_ZOOM, MVT_MEDIA_TYPE, Tile, TileCache, thinning_grid
+from app.repositories.async_location_repository import AsyncLocationRepository
+
+router = APIRouter(prefix="/tiles", tags=["tiles"])
+
+
+@router.get("/{z}/{x}/{y}.mvt", response_class=Response)
+async def get_tile(
+    z: int = Path(..., ge=0, le=MAX_ZOOM),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    repo: AsyncLocationRepository = Depends(get_read_location_repository),
+    primary: AsyncLocationRepository = Depends(get_location_repository),
+    cache: Optional[TileCache] = Depends(get_tile_cache)
+):
+    """Locations as a Mapbox Vector Tile (layer "locations"), thinned below TILE_FULL_DETAIL_ZOOM"""
+    if x >= 2 ** z or y >= 2 ** z:
+        return Response(status_code=status.HTTP_404_NOT_FOUND)
+
+    tile = await run_in_threadpool(cache.get, z, x, y) if cache is not None else None
+    if tile is None:
+        grid = thinning_grid(z, settings.tile_full_detail_zoom, settings.tile_thin_pixels)
+        # Cached tiles have no expiry: render them on the primary, so a replica that
+        # has not replayed the write which just invalidated this tile cannot refill it
+        # with the old rows (sessions connect lazily, so cache hits never touch it)
+        renderer = primary if cache is not None else repo
+        tile = Tile.rendered(await renderer.get_tile(z=z, x=x, y=y, thin_grid=grid), cached=cache is not None)
+        if cache is not None:
+            await run_in_threadpool(cache.set, z, x, y, tile)
+
+    headers = {"ETag": tile.etag, "Cache-Control": f"public, max-age={settings.tile_max_age_seconds}"}
+    if tile.last_modified is not None:
+        headers["Last-Modified"] = tile.last_modified_header
+
+    if tile.not_modified(if_none_match, if_modified_since):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if not tile.data:
+        return Response(status_code=status.HTTP_204_NO_CONTENT, headers=headers)
+    return Response(tile.data, media_type=MVT_MEDIA_TYPE, headers=headers)
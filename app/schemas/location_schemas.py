@@ -1,11 +1,14 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+from pydantic import BaseModel, Field, model_validator, validator
+from typing import Optional, List, Tuple
 from datetime import datetime
 
+from app.schemas.query_schemas import CountStrategy, SearchSortBy, ViewportMode
+
 
 class LocationBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100, description="Location name")
     description: Optional[str] = Field(None, description="Location description")
+    category: Optional[str] = Field(None, max_length=50, description="Place type, e.g. restaurant")
 
 
 class LocationCreate(LocationBase):
@@ -58,15 +61,169 @@ class LocationWithDistance(LocationResponse):
 
 class LocationListResponse(BaseModel):
     locations: List[LocationResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Matching rows; approximate when count_strategy is estimated")
+    count_strategy: CountStrategy
     page: int
     per_page: int
     has_next: bool
 
 
+class NearbySearchResponse(BaseModel):
+    locations: List[LocationWithDistance]
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page")
+
+
+class DistanceRangeResponse(BaseModel):
+    locations: List[LocationWithDistance]
+    total: Optional[int] = Field(None, description="Matching rows; approximate when count_strategy is estimated")
+    count_strategy: CountStrategy
+    has_next: bool
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page")
+
+
+class LocationSearchResult(LocationWithDistance):
+    relevance: float = Field(..., description="Text match score, higher is better")
+
+
+class LocationSearchResponse(BaseModel):
+    locations: List[LocationSearchResult]
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page")
+
+
 class NearbySearchParams(BaseModel):
     latitude: float = Field(..., ge=-90, le=90)
     longitude: float = Field(..., ge=-180, le=180)
     distance_meters: int = Field(..., gt=0, le=50000, description="Search radius in meters (max 50km)")
     page: int = Field(1, ge=1, description="Page number")
     per_page: int = Field(10, ge=1, le=100, description="Items per page")
+    cursor: Optional[str] = Field(None, description="Opaque cursor from a previous page; overrides page")
+    category: Optional[str] = Field(None, max_length=50, description="Only locations of this category")
+
+
+class NearestSearchParams(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    k: int = Field(10, ge=1, le=100, description="Number of nearest locations to return")
+    max_distance_meters: Optional[int] = Field(None, gt=0, le=50000, description="Optional search radius cap in meters")
+    category: Optional[str] = Field(None, max_length=50, description="Only locations of this category")
+
+
+class BulkImportResponse(BaseModel):
+    received: int = Field(..., description="Valid rows read from the upload")
+    inserted: int
+    deduplicated: int = Field(..., description="Rows skipped as within tolerance of another location")
+    rejected: int = Field(..., description="Rows that failed parsing or validation")
+    elapsed_seconds: float
+    rows_per_second: float
+
+
+class BulkDeleteRequest(BaseModel):
+    """Filters are ANDed; at least one is required so an empty body never empties the table"""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=1_000_000, description="Location ids")
+    bbox: Optional[Tuple[float, float, float, float]] = Field(
+        None, description="min_longitude, min_latitude, max_longitude, max_latitude"
+    )
+    updated_before: Optional[datetime] = Field(None, description="Only locations last updated before this time")
+
+    @model_validator(mode='after')
+    def validate_filters(self):
+        if self.ids is None and self.bbox is None and self.updated_before is None:
+            raise ValueError('Give ids, bbox or updated_before')
+        if self.bbox is not None:
+            min_lng, min_lat, max_lng, max_lat = self.bbox
+            if not (-180 <= min_lng <= max_lng <= 180) or not (-90 <= min_lat <= max_lat <= 90):
+                raise ValueError('Invalid bbox')
+        return self
+
+
+class BulkDeleteResponse(BaseModel):
+    deleted: int = Field(..., description="Rows deleted, including by batches committed before a failure")
+    elapsed_seconds: float
+    error: Optional[str] = Field(None, description="Set when a batch failed; later batches were not run")
+
+
+class LocationPatch(BaseModel):
+    """Fields left out (or null) keep their current value"""
+    id: int
+    name: Optional[str] = Field(None, min_length=1, max_length=100)
+    description: Optional[str] = None
+    category: Optional[str] = Field(None, max_length=50)
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+
+    @model_validator(mode='after')
+    def validate_coordinates(self):
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError('latitude and longitude must be given together')
+        return self
+
+
+class BulkUpdateRequest(BaseModel):
+    updates: List[LocationPatch] = Field(..., min_length=1, max_length=100_000)
+
+    @validator('updates')
+    def validate_unique_ids(cls, v):
+        if len({patch.id for patch in v}) != len(v):
+            raise ValueError('Each id may appear only once')
+        return v
+
+
+class BulkUpdateResponse(BaseModel):
+    requested: int
+    updated: int
+    not_found: List[int] = Field(..., description="Requested ids with no matching location")
+    elapsed_seconds: float
+    error: Optional[str] = Field(None, description="Set when a batch failed; later batches were not run")
+
+
+class BatchNearbyQuery(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    distance_meters: int = Field(..., gt=0, le=50000, description="Search radius in meters (max 50km)")
+
+
+class BatchNearbyRequest(BaseModel):
+    queries: List[BatchNearbyQuery] = Field(..., min_length=1, max_length=500, description="Query points")
+    per_point_limit: int = Field(10, ge=1, le=100, description="Max locations returned per point")
+
+
+class BatchNearbyResult(BatchNearbyQuery):
+    locations: List[LocationWithDistance]
+
+
+class BatchNearbyResponse(BaseModel):
+    results: List[BatchNearbyResult]
+
+
+class LocationSearchParams(BaseModel):
+    q: str = Field(..., min_length=1, max_length=200, description="Text to match in name or description")
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    distance_meters: int = Field(..., gt=0, le=50000, description="Search radius in meters (max 50km)")
+    sort_by: SearchSortBy = Field(SearchSortBy.distance, description="Sort by distance or text relevance")
+    page: int = Field(1, ge=1, description="Page number")
+    per_page: int = Field(10, ge=1, le=100, description="Items per page")
+    cursor: Optional[str] = Field(None, description="Opaque cursor from a previous page; distance sort only")
+
+
+class BBoxSearchParams(BaseModel):
+    min_longitude: float = Field(..., ge=-180, le=180)
+    min_latitude: float = Field(..., ge=-90, le=90)
+    max_longitude: float = Field(..., ge=-180, le=180)
+    max_latitude: float = Field(..., ge=-90, le=90)
+    zoom: Optional[int] = Field(None, ge=0, le=24, description="Map zoom level; low zooms are clustered")
+    limit: int = Field(500, ge=1, le=2000, description="Max points before the viewport is clustered")
+    category: Optional[str] = Field(None, max_length=50, description="Only locations of this category")
+
+
+class LocationCluster(BaseModel):
+    count: int
+    latitude: float = Field(..., description="Mean latitude of the clustered points")
+    longitude: float = Field(..., description="Mean longitude of the clustered points")
+
+
+class BBoxSearchResponse(BaseModel):
+    mode: ViewportMode
+    locations: List[LocationResponse] = Field(..., description="Points, when mode is points")
+    clusters: List[LocationCluster] = Field(..., description="Grid cells, when mode is clusters")
+    grid_size_degrees: Optional[float] = Field(None, description="Cluster cell size")
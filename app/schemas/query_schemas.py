@@ -14,12 +14,35 @@ class LocationSortBy(str, Enum):
     distance = "distance"
 
 
+class ListSortBy(str, Enum):
+    name = "name"
+    created_at = "created_at"
+    relevance = "relevance"  # with search only
+
+
+class SearchSortBy(str, Enum):
+    distance = "distance"
+    relevance = "relevance"
+
+
+class ViewportMode(str, Enum):
+    points = "points"
+    clusters = "clusters"
+
+
+class CountStrategy(str, Enum):
+    exact = "exact"  # count(*), cached briefly per query
+    estimated = "estimated"  # planner row estimate, no rows read
+    none = "none"  # no total, has_next only (fetches per_page + 1)
+
+
 class LocationQuery(BaseModel):
     page: int = Field(1, ge=1, description="Page number")
     per_page: int = Field(10, ge=1, le=100, description="Items per page")
     search: Optional[str] = Field(None, description="Search in name or description")
-    sort_by: LocationSortBy = Field(LocationSortBy.created_at, description="Sort field")
+    sort_by: ListSortBy = Field(ListSortBy.created_at, description="Sort field; relevance applies with search")
     sort_order: SortOrder = Field(SortOrder.desc, description="Sort direction")
+    count: CountStrategy = Field(CountStrategy.exact, description="How total is computed: exact, estimated or none")
 
 
 class DistanceRangeQuery(BaseModel):
@@ -31,3 +54,6 @@ class DistanceRangeQuery(BaseModel):
     per_page: int = Field(10, ge=1, le=100)
     sort_by: LocationSortBy = Field(LocationSortBy.distance)
     sort_order: SortOrder = Field(SortOrder.asc)
+    cursor: Optional[str] = Field(None, description="Opaque cursor from a previous page; overrides page")
+    count: CountStrategy = Field(CountStrategy.exact, description="How total is computed: exact, estimated or none")
+    category: Optional[str] = Field(None, max_length=50, description="Only locations of this category")
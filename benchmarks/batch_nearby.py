@@ -0,0 +1,91 @@
+"""
+Batch nearby throughput: one POST /locations/nearby/batch vs N single searches.
+
+Runs N random waypoints both ways, at the repository level and through the
+ASGI app in-process (parsing, dependencies, session checkout included).
+
+Usage (DATABASE_URL must point at a seeded PostGIS):
+    python -m benchmarks.batch_nearby --points 10 50 200 --radius 500
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import httpx
+
+from app.core.database import SessionLocal
+from app.core.geometry import latlong_to_point
+from app.main import app
+from app.repositories.location_repository import LocationRepository
+
+CENTER = (40.7484, -73.9857)  # Midtown
+
+
+def waypoints(count: int, radius: int) -> list[tuple[float, float, int]]:
+    rng = random.Random(count)
+    return [
+        (CENTER[0] + rng.uniform(-0.05, 0.05), CENTER[1] + rng.uniform(-0.05, 0.05), radius)
+        for _ in range(count)
+    ]
+
+
+def repository_level(points, limit: int) -> tuple[float, float]:
+    db = SessionLocal()
+    try:
+        repo = LocationRepository(db)
+        start = time.perf_counter()
+        for lat, lng, radius in points:
+            repo.find_within_distance_with_distances(latlong_to_point(lat, lng), radius, limit=limit)
+        singles = time.perf_counter() - start
+
+        start = time.perf_counter()
+        repo.find_within_distance_batch(points, limit=limit)
+        batch = time.perf_counter() - start
+    finally:
+        db.close()
+    return singles, batch
+
+
+async def api_level(points, limit: int) -> tuple[float, float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for lat, lng, radius in points:
+            response = await client.get("/locations/nearby/search", params={
+                "latitude": lat, "longitude": lng, "distance_meters": radius, "per_page": limit
+            })
+            response.raise_for_status()
+        singles = time.perf_counter() - start
+
+        start = time.perf_counter()
+        response = await client.post("/locations/nearby/batch", json={
+            "queries": [{"latitude": lat, "longitude": lng, "distance_meters": radius} for lat, lng, radius in points],
+            "per_point_limit": limit
+        })
+        response.raise_for_status()
+        batch = time.perf_counter() - start
+    return singles, batch
+
+
+def report(label: str, count: int, singles: float, batch: float) -> None:
+    print(f"  {label:<12} singles={singles * 1000:9.1f} ms ({count / singles:8.1f} pts/s)  "
+          f"batch={batch * 1000:9.1f} ms ({count / batch:8.1f} pts/s)  speedup={singles / batch:5.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--points", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--radius", type=int, default=500, help="Search radius in meters")
+    parser.add_argument("--limit", type=int, default=10, help="Results per point")
+    args = parser.parse_args()
+
+    for count in args.points:
+        points = waypoints(count, args.radius)
+        print(f"N={count}:")
+        report("repository", count, *repository_level(points, args.limit))
+        report("api", count, *asyncio.run(api_level(points, args.limit)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Category filter: nearby, range, KNN and bbox with and without a category.
+
+For each query type, times the unfiltered query, the query filtered on a
+common and on a rare category (checked inside the composite GiST scan), and
+the old client-side approach (unfiltered query, then dropping other
+categories in Python, with the page size grown until enough rows survive).
+Also prints the indexes chosen for a filtered radius query.
+
+Usage (DATABASE_URL must point at a PostGIS seeded by benchmarks.suite,
+which assigns skewed categories):
+    python -m benchmarks.category_filter --iterations 200
+"""
+import argparse
+import itertools
+import random
+import statistics
+import time
+from typing import Callable, List
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.core.explain import explain_plan
+from app.core.geometry import latlong_to_point, shapely_to_db_point
+from app.core.spatial import st_dwithin_meters
+from app.models.location import Location
+from app.repositories.location_repository import LocationRepository, category_filter
+from app.schemas.query_schemas import DistanceRangeQuery
+from benchmarks.suite.workloads import query_point
+
+PAGE = 20
+
+
+def timed(fn: Callable[[], object], iterations: int) -> float:
+    """Median milliseconds per call"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def post_filtered(fetch: Callable[[int], List], category: str) -> List:
+    """Client-side filtering: fetch ever larger unfiltered pages until PAGE rows match"""
+    size = PAGE
+    while True:
+        rows = fetch(size)
+        matches = [row for row in rows if row.category == category]
+        if len(matches) >= PAGE or len(rows) < size:
+            return matches[:PAGE]
+        size *= 4
+
+
+def index_names(plan: dict) -> List[str]:
+    found = []
+
+    def walk(node):
+        if "Index Name" in node:
+            found.append(node["Index Name"])
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan["Plan"])
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--common", default="restaurant", help="High-selectivity category (~30%% of rows)")
+    parser.add_argument("--rare", default="museum", help="Low-selectivity category (~1%% of rows)")
+    parser.add_argument("--radius", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    points = [query_point(rng) for _ in range(args.iterations)]
+    cycle = itertools.cycle(points)
+
+    db = SessionLocal()
+    try:
+        repo = LocationRepository(db)
+
+        def nearby(category=None, limit=PAGE):
+            lat, lng = next(cycle)
+            return [row for row, _ in repo.find_within_distance_with_distances(
+                latlong_to_point(lat, lng), args.radius, limit=limit, category=category
+            )]
+
+        def ranged(category=None, limit=PAGE):
+            lat, lng = next(cycle)
+            rows, _ = repo.find_within_distance_range(DistanceRangeQuery(
+                latitude=lat, longitude=lng, min_distance_meters=500,
+                max_distance_meters=args.radius, per_page=min(limit, 100), count="none", category=category
+            ))
+            return [row for row, _ in rows]
+
+        def knn(category=None, limit=PAGE):
+            lat, lng = next(cycle)
+            return [row for row, _ in repo.find_k_nearest(latlong_to_point(lat, lng), k=limit, category=category)]
+
+        def bbox(category=None, limit=PAGE):
+            lat, lng = next(cycle)
+            return repo.find_within_bbox((lng - 0.02, lat - 0.02, lng + 0.02, lat + 0.02), limit, category=category)
+
+        print(f"{'query':<8} {'unfiltered':>11} {args.common:>12} {args.rare:>12} {'post-filter':>12}  (median ms)")
+        for name, query in (("nearby", nearby), ("range", ranged), ("knn", knn), ("bbox", bbox)):
+            unfiltered = timed(query, args.iterations)
+            common = timed(lambda: query(args.common), args.iterations)
+            rare = timed(lambda: query(args.rare), args.iterations)
+            post = timed(lambda: post_filtered(lambda size: query(limit=size), args.rare), args.iterations)
+            print(f"{name:<8} {unfiltered:11.2f} {common:12.2f} {rare:12.2f} {post:12.2f}")
+
+        lat, lng = points[0]
+        stmt = select(Location.id).where(
+            st_dwithin_meters(Location.point, shapely_to_db_point(latlong_to_point(lat, lng)), args.radius),
+            category_filter(args.rare)
+        )
+        print(f"\nFiltered radius plan uses: {', '.join(index_names(explain_plan(db, stmt))) or 'no index'}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
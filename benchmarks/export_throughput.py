@@ -0,0 +1,62 @@
+"""
+Export throughput and memory: GET /locations/export in each format.
+
+Streams the full export through the ASGI app in-process, discarding the body
+as it arrives, and reports rows/sec, MB/sec and the growth of peak RSS so a
+bounded-memory regression (e.g. buffering the whole result) shows up.
+
+Usage (DATABASE_URL must point at a seeded PostGIS, e.g. benchmarks.suite):
+    python -m benchmarks.export_throughput --formats ndjson geojson fgb
+"""
+import argparse
+import asyncio
+import resource
+import time
+
+import httpx
+
+from app.core.exporters import ExportFormat
+from app.main import app
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def export(fmt: str, params: dict) -> tuple[int, int, float]:
+    """(rows, bytes, seconds) for one streamed export"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        started = time.perf_counter()
+        size = lines = 0
+        async with client.stream("GET", "/locations/export", params={"format": fmt, **params}) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                lines += chunk.count(b"\n")
+        elapsed = time.perf_counter() - started
+    return lines, size, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--formats", nargs="+", choices=[f.value for f in ExportFormat],
+                        default=[f.value for f in ExportFormat])
+    parser.add_argument("--bbox", type=float, nargs=4, metavar=("MIN_LNG", "MIN_LAT", "MAX_LNG", "MAX_LAT"))
+    args = parser.parse_args()
+
+    params = {}
+    if args.bbox:
+        params = dict(zip(("min_longitude", "min_latitude", "max_longitude", "max_latitude"), args.bbox))
+
+    for fmt in args.formats:
+        rss_before = peak_rss_mb()
+        lines, size, elapsed = asyncio.run(export(fmt, params))
+        # Only NDJSON is line-per-row; report bytes for the others
+        rows = f"{lines / elapsed:10,.0f} rows/s" if fmt == "ndjson" else " " * 15
+        print(f"  {fmt:<8} {size / 1e6:9.1f} MB in {elapsed:7.1f} s  {rows}  "
+              f"{size / 1e6 / elapsed:7.1f} MB/s  peak RSS +{peak_rss_mb() - rss_before:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
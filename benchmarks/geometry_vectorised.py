@@ -0,0 +1,59 @@
+"""
+Geometry conversion: per-point GeoJSON decoding vs geojson_to_coordinates.
+
+Decodes N seeded GeoJSON points as the bulk import does and reports points/second
+for geojson_to_point + range check vs geojson_to_coordinates. No database needed.
+
+Usage:
+    python -m benchmarks.geometry_vectorised --points 10000 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.core.geometry import geojson_to_coordinates, geojson_to_point
+from app.core.spatial import validate_coordinates
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(count: int) -> None:
+    rng = np.random.default_rng(42)
+    coords = np.column_stack([rng.uniform(-180, 180, count), rng.uniform(-90, 90, count)])
+    geometries = [{"type": "Point", "coordinates": pair} for pair in coords.tolist()]
+
+    def geojson_in_per_point():
+        for geometry in geometries:
+            point = geojson_to_point(geometry)
+            validate_coordinates(point.y, point.x)
+
+    cases = {
+        "GeoJSON in": (
+            geojson_in_per_point,
+            lambda: geojson_to_coordinates(geometries),
+        ),
+    }
+
+    print(f"N={count:,}:")
+    for label, (per_point, vectorised) in cases.items():
+        slow, fast = timed(per_point), timed(vectorised)
+        print(f"  {label:<12} per-point={count / slow:12,.0f} pts/s  "
+              f"vectorised={count / fast:12,.0f} pts/s  speedup={slow / fast:6.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--points", type=int, nargs="+", default=[10_000, 1_000_000])
+    args = parser.parse_args()
+
+    for count in args.points:
+        run(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Load test: sync (threadpool) vs async (asyncpg) request path.
+
+Starts the API under uvicorn once per mode (ASYNC_DB=false / true), fires a
+fixed number of /locations/nearby/search requests at a given concurrency and
+reports p50/p99 latency and throughput for each.
+
+Usage (DATABASE_URL must point at a seeded PostGIS):
+    python -m benchmarks.load_test --requests 5000 --concurrency 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+MODES = {"sync": "false", "async": "true"}
+CENTER = (40.7484, -73.9857)  # Midtown
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("API did not become ready")
+
+
+async def fire(base_url: str, total: int, concurrency: int, radius: int) -> tuple[list[float], float, int]:
+    """Send `total` nearby searches with at most `concurrency` in flight"""
+    rng = random.Random(42)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        await wait_until_ready(client)
+
+        async def one() -> None:
+            nonlocal errors
+            params = {
+                "latitude": CENTER[0] + rng.uniform(-0.05, 0.05),
+                "longitude": CENTER[1] + rng.uniform(-0.05, 0.05),
+                "distance_meters": radius,
+            }
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get("/locations/nearby/search", params=params)
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+    return latencies, elapsed, errors
+
+
+def run_mode(mode: str, args: argparse.Namespace, port: int) -> None:
+    env = {**os.environ, "ASYNC_DB": MODES[mode]}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        latencies, elapsed, errors = asyncio.run(
+            fire(f"http://127.0.0.1:{port}", args.requests, args.concurrency, args.radius)
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"{mode:<6} p50={percentile(latencies, 50):7.1f} ms  p99={percentile(latencies, 99):7.1f} ms  "
+          f"mean={statistics.mean(latencies):7.1f} ms  {args.requests / elapsed:8.1f} req/s  errors={errors}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--radius", type=int, default=1000, help="Search radius in meters")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    args = parser.parse_args()
+
+    for offset, mode in enumerate(args.modes):
+        run_mode(mode, args, args.port + offset)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Nearby/KNN latency: in-memory index replica vs PostGIS.
+
+Loads the locations table into a MemoryLocationIndex, then runs the same
+random radius and KNN queries through LocationRepository and the index and
+reports p50/p99 latency and queries/sec for each.
+
+Usage (DATABASE_URL must point at a seeded PostGIS):
+    python -m benchmarks.memory_index_vs_postgis --queries 2000 --radius 1000
+"""
+import argparse
+import random
+import time
+
+from app.core.database import SessionLocal
+from app.core.geometry import latlong_to_point
+from app.repositories.location_repository import LocationRepository
+from app.repositories.memory_location_index import MemoryLocationIndex
+from benchmarks.load_test import percentile
+
+CENTER = (40.7484, -73.9857)  # Midtown
+
+
+def timed(fn, points) -> list[float]:
+    latencies = []
+    for point in points:
+        start = time.perf_counter()
+        fn(point)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label: str, latencies: list[float]) -> None:
+    total_seconds = sum(latencies) / 1000
+    print(f"  {label:<28} p50={percentile(latencies, 50):8.3f} ms  p99={percentile(latencies, 99):8.3f} ms  "
+          f"{len(latencies) / total_seconds:10.1f} q/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--radius", type=int, default=1000, help="Search radius in meters")
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--spread", type=float, default=0.05, help="Query jitter around the center, degrees")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    points = [
+        latlong_to_point(CENTER[0] + rng.uniform(-args.spread, args.spread),
+                         CENTER[1] + rng.uniform(-args.spread, args.spread))
+        for _ in range(args.queries)
+    ]
+
+    db = SessionLocal()
+    try:
+        index = MemoryLocationIndex()
+        start = time.perf_counter()
+        rows = index.load(db)
+        print(f"Loaded {rows:,} rows into memory index in {time.perf_counter() - start:.1f}s")
+
+        repo = LocationRepository(db)
+        print(f"Radius {args.radius} m, {args.queries} queries, page of 100:")
+        report("postgis", timed(lambda p: repo.find_within_distance_with_distances(p, args.radius), points))
+        report("memory", timed(lambda p: index.find_within_distance_with_distances(p, args.radius), points))
+
+        print(f"KNN k={args.k}:")
+        report("postgis", timed(lambda p: repo.find_k_nearest(p, args.k), points))
+        report("memory", timed(lambda p: index.find_k_nearest(p, args.k), points))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
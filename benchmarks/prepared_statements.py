@@ -0,0 +1,220 @@
+"""
+Prepared statements: statement build/compile and planning overhead on hot queries.
+
+1. Build + compile, no database: the pre-lambda_stmt construction of nearby,
+   range and get-by-id compiled without a cache and through SQLAlchemy's
+   compiled cache, vs the repository's cached lambda statements.
+2. Planning vs execution time of the nearby query from EXPLAIN ANALYZE,
+   i.e. what a reused prepared statement plan saves per call.
+3. End to end nearby latency: psycopg2 (client-side parameters, planned on
+   every call) vs asyncpg with the prepared statement cache off and on, under
+   plan_cache_mode auto and force_generic_plan.
+
+Usage (DATABASE_URL must point at a seeded PostGIS; part 1 runs with --offline
+without one):
+    python -m benchmarks.prepared_statements --iterations 2000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Callable, List
+
+from sqlalchemy import asc, select, tuple_
+from sqlalchemy.orm import Session
+from sqlalchemy.util import LRUCache
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.core.explain import explain_plan
+from app.core.geometry import latlong_to_point, shapely_to_db_point
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.spatial import st_distance_meters, st_dwithin_meters
+from app.models.location import Location
+from app.repositories.location_repository import LocationRepository, location_row_columns
+from app.schemas.query_schemas import DistanceRangeQuery, SortOrder
+from benchmarks.suite.workloads import query_point
+
+
+class _EmptyResult:
+    def all(self):
+        return []
+
+    def first(self):
+        return None
+
+    def scalars(self):
+        return self
+
+
+class CompileOnlySession(Session):
+    """Compiles each executed statement through a compiled cache like Connection.execute, then returns no rows"""
+
+    def __init__(self, compiled_cache):
+        super().__init__()
+        self.compiled_cache = compiled_cache
+
+    def execute(self, statement, *args, **kwargs):
+        compile_statement(statement, self.compiled_cache)
+        return _EmptyResult()
+
+
+def compile_statement(statement, compiled_cache) -> None:
+    statement._compile_w_cache(engine.dialect, compiled_cache=compiled_cache, column_keys=[])
+
+
+def nearby_before(lat: float, lng: float, radius: int, after=None):
+    """find_within_distance_with_distances as built before lambda_stmt"""
+    query_point = shapely_to_db_point(latlong_to_point(lat, lng))
+    distance = st_distance_meters(Location.point, query_point)
+    stmt = select(*location_row_columns(), distance.label('distance')).where(
+        st_dwithin_meters(Location.point, query_point, radius)
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(distance, Location.id) > tuple_(*after))
+    return stmt.order_by(asc('distance'), asc(Location.id)).offset(0).limit(20)
+
+
+def range_before(params: DistanceRangeQuery):
+    """find_within_distance_range's main query as built before lambda_stmt"""
+    center = shapely_to_db_point(latlong_to_point(params.latitude, params.longitude))
+    distance = st_distance_meters(Location.point, center)
+    stmt = select(*location_row_columns(), distance.label('distance')).where(
+        st_dwithin_meters(Location.point, center, params.max_distance_meters),
+        distance >= params.min_distance_meters
+    )
+    if params.cursor:
+        stmt = stmt.where(tuple_(distance, Location.id) > tuple_(*decode_cursor(params.cursor)))
+    return stmt.order_by(asc('distance'), asc(Location.id)).offset(0).limit(params.per_page + 1)
+
+
+def get_before(location_id: int):
+    return select(*location_row_columns()).where(Location.id == location_id)
+
+
+def median_us(fn: Callable[[], object], iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def build_overhead(points: List[tuple], iterations: int) -> None:
+    rng = random.Random(7)
+
+    def range_params(lat, lng):
+        return DistanceRangeQuery(
+            latitude=lat, longitude=lng, min_distance_meters=200, max_distance_meters=2000,
+            per_page=20, count="none", sort_order=SortOrder.asc, cursor=encode_cursor(250.0, 10)
+        )
+
+    ranges = [range_params(lat, lng) for lat, lng in points]
+    cache = LRUCache(settings.query_cache_size or 500)
+    repo = LocationRepository(CompileOnlySession(cache))
+
+    cases = {
+        "nearby": (
+            lambda: nearby_before(*rng.choice(points), 1000, after=(250.0, 10)),
+            lambda: repo.find_within_distance_with_distances(
+                latlong_to_point(*rng.choice(points)), 1000, limit=20, after=(250.0, 10)
+            ),
+        ),
+        "range": (
+            lambda: range_before(rng.choice(ranges)),
+            lambda: repo.find_within_distance_range(rng.choice(ranges)),
+        ),
+        "get": (
+            lambda: get_before(rng.randint(1, 1_000_000)),
+            lambda: repo.get_row_by_id(rng.randint(1, 1_000_000)),
+        ),
+    }
+
+    print("Statement build + compile (median us per call, no database round trip)")
+    print(f"{'query':<8} {'no cache':>10} {'cached':>10} {'lambda':>10}")
+    for name, (before, after) in cases.items():
+        uncached = median_us(lambda: compile_statement(before(), None), iterations)
+        cached = median_us(lambda: compile_statement(before(), cache), iterations)
+        lambdas = median_us(after, iterations)
+        print(f"{name:<8} {uncached:10.1f} {cached:10.1f} {lambdas:10.1f}")
+
+
+def planning_overhead(points: List[tuple], radius: int) -> None:
+    planning, execution = [], []
+    db = SessionLocal()
+    try:
+        for lat, lng in points:
+            plan = explain_plan(db, nearby_before(lat, lng, radius), analyze=True)
+            planning.append(plan["Planning Time"])
+            execution.append(plan["Execution Time"])
+    finally:
+        db.close()
+    print(f"\nNearby ({radius} m) EXPLAIN ANALYZE over {len(points)} points (median ms)")
+    print(f"  planning {statistics.median(planning):.3f}   execution {statistics.median(execution):.3f}")
+
+
+def sync_latency(points: List[tuple], radius: int) -> float:
+    db = SessionLocal()
+    try:
+        repo = LocationRepository(db)
+        cycle = iter(points)
+        return median_us(
+            lambda: repo.find_within_distance_with_distances(latlong_to_point(*next(cycle)), radius, limit=20),
+            len(points)
+        ) / 1000
+    finally:
+        db.close()
+
+
+async def async_latency(points: List[tuple], radius: int, cache_size: int, plan_cache_mode: str) -> float:
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    server_settings = {"timezone": "utc"}
+    if plan_cache_mode != "auto":
+        server_settings["plan_cache_mode"] = plan_cache_mode
+    async_engine = create_async_engine(
+        settings.async_database_url, pool_size=1,
+        connect_args={"server_settings": server_settings, "prepared_statement_cache_size": cache_size}
+    )
+    samples = []
+    try:
+        async with AsyncSession(async_engine) as session:
+            for lat, lng in points:
+                start = time.perf_counter()
+                await session.run_sync(lambda s: LocationRepository(s).find_within_distance_with_distances(
+                    latlong_to_point(lat, lng), radius, limit=20
+                ))
+                samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        await async_engine.dispose()
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--radius", type=int, default=1000)
+    parser.add_argument("--offline", action="store_true", help="Only the build + compile comparison")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    points = [query_point(rng) for _ in range(args.iterations)]
+
+    build_overhead(points, args.iterations)
+    if args.offline:
+        return
+
+    planning_overhead(points[:200], args.radius)
+
+    print(f"\nNearby end to end over {len(points)} calls (median ms)")
+    print(f"  psycopg2                           {sync_latency(points, args.radius):.3f}")
+    for cache_size, mode in ((0, "auto"), (100, "auto"), (100, "force_generic_plan")):
+        latency = asyncio.run(async_latency(points, args.radius, cache_size, mode))
+        label = f"asyncpg cache={cache_size} {mode}"
+        print(f"  {label:<34} {latency:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Rows touched by radius searches: legacy degree-based ST_DWithin vs geography.
+
+Seeds a scratch copy of the locations table (same indexes) with uniformly
+distributed points over New York City, then runs EXPLAIN (ANALYZE, BUFFERS)
+for each query shape and reports rows read from the index/heap and buffers hit.
+
+Usage (against a throwaway PostGIS, e.g. the docker-compose db service):
+    python -m benchmarks.radius_rows_touched --rows 1000000 10000000 --radius 500
+"""
+import argparse
+import json
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+BENCH_TABLE = "bench_locations"
+
+# NYC bounding box (lng_min, lat_min, lng_max, lat_max)
+BBOX = (-74.25, 40.49, -73.70, 40.92)
+CENTER = (-73.9857, 40.7484)  # Midtown
+
+QUERIES = {
+    "degrees (legacy)": f"""
+        SELECT id, ST_Distance(point, ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)) AS distance
+        FROM {BENCH_TABLE}
+        WHERE ST_DWithin(point, ST_SetSRID(ST_MakePoint(:lng, :lat), 4326), :radius)
+        ORDER BY distance LIMIT 100
+    """,
+    "geography (meters)": f"""
+        SELECT id, ST_Distance(geography(point), geography(ST_SetSRID(ST_MakePoint(:lng, :lat), 4326))) AS distance
+        FROM {BENCH_TABLE}
+        WHERE ST_DWithin(geography(point), geography(ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)), :radius)
+        ORDER BY distance LIMIT 100
+    """,
+}
+
+
+def seed(conn, rows: int) -> None:
+    """(Re)create the scratch table and fill it with seeded uniform points"""
+    conn.execute(text(f"DROP TABLE IF EXISTS {BENCH_TABLE}"))
+    conn.execute(text(f"CREATE TABLE {BENCH_TABLE} (LIKE locations INCLUDING ALL)"))
+    conn.execute(text("SELECT setseed(0.42)"))
+    lng_min, lat_min, lng_max, lat_max = BBOX
+    conn.execute(text(f"""
+        INSERT INTO {BENCH_TABLE} (name, point)
+        SELECT 'poi ' || g,
+               ST_SetSRID(ST_MakePoint(
+                   :lng_min + random() * (:lng_max - :lng_min),
+                   :lat_min + random() * (:lat_max - :lat_min)
+               ), 4326)
+        FROM generate_series(1, :rows) AS g
+    """), {"rows": rows, "lng_min": lng_min, "lat_min": lat_min,
+           "lng_max": lng_max, "lat_max": lat_max})
+    conn.execute(text(f"ANALYZE {BENCH_TABLE}"))
+
+
+def rows_touched(plan: dict) -> tuple[int, int]:
+    """Sum rows produced + rows discarded by scan nodes, and shared buffers, over a plan tree"""
+    rows = 0
+    buffers = plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0)
+    if "Scan" in plan.get("Node Type", ""):
+        loops = plan.get("Actual Loops", 1)
+        rows += plan.get("Actual Rows", 0) * loops
+        rows += plan.get("Rows Removed by Filter", 0)
+        rows += plan.get("Rows Removed by Index Recheck", 0)
+    for child in plan.get("Plans", []):
+        child_rows, _ = rows_touched(child)
+        rows += child_rows
+    return rows, buffers
+
+
+def run(rows: int, radius: int) -> None:
+    with engine.begin() as conn:
+        print(f"Seeding {rows:,} rows...")
+        seed(conn, rows)
+
+        for label, sql in QUERIES.items():
+            explain = text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")
+            result = conn.execute(explain, {"lng": CENTER[0], "lat": CENTER[1], "radius": radius})
+            raw = result.scalar()
+            plan = (raw if isinstance(raw, list) else json.loads(raw))[0]
+            touched, buffers = rows_touched(plan["Plan"])
+            print(f"  {label:<20} rows touched={touched:>10,}  buffers={buffers:>8,}  "
+                  f"time={plan['Execution Time']:.1f} ms")
+
+        conn.execute(text(f"DROP TABLE {BENCH_TABLE}"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--radius", type=int, default=500, help="Search radius in meters")
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        run(rows, args.radius)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Per-row response serialization cost: ORM + Shapely + Pydantic vs LocationRow + orjson.
+
+Builds a 100-row nearby page both ways and times turning it into JSON bytes.
+No database needed (DATABASE_URL only has to parse).
+
+Usage:
+    python -m benchmarks.serialization --rows 100 --repeat 2000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+
+from app.core.geometry import db_point_to_shapely, point_to_latlong, latlong_to_point, shapely_to_db_point
+from app.core.responses import FastJSONResponse, location_payload
+from app.models.location import Location, LocationRow
+from app.schemas.location_schemas import LocationWithDistance, NearbySearchResponse
+
+
+def orm_page(rows: list[LocationRow]) -> list[tuple[Location, float]]:
+    return [
+        (Location(id=r.id, name=r.name, description=r.description,
+                  point=shapely_to_db_point(latlong_to_point(r.latitude, r.longitude)),
+                  created_at=r.created_at, updated_at=r.updated_at), 123.4)
+        for r in rows
+    ]
+
+
+def serialize_orm(page) -> bytes:
+    """Pre-change path: WKB -> Shapely -> lat/lng -> Pydantic -> JSON"""
+    locations = []
+    for location, distance in page:
+        lat, lng = point_to_latlong(db_point_to_shapely(location.point))
+        locations.append(LocationWithDistance(
+            id=location.id, name=location.name, description=location.description,
+            latitude=lat, longitude=lng, created_at=location.created_at,
+            updated_at=location.updated_at, distance_meters=distance
+        ))
+    return NearbySearchResponse(locations=locations, next_cursor=None).model_dump_json().encode()
+
+
+def serialize_rows(page) -> bytes:
+    """Fast path: LocationRow -> dict -> orjson"""
+    return FastJSONResponse({
+        "locations": [location_payload(row, distance) for row, distance in page],
+        "next_cursor": None
+    }).body
+
+
+def bench(label: str, fn, page, repeat: int, rows: int) -> None:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(page)
+    elapsed = time.perf_counter() - start
+    per_row_us = elapsed / (repeat * rows) * 1e6
+    print(f"  {label:<24} {elapsed / repeat * 1000:8.3f} ms/page  {per_row_us:7.2f} us/row")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    rows = [
+        LocationRow(i, f"Place {i}", "Some description", 40.7 + rng.random() / 10, -74.0 + rng.random() / 10, now, now)
+        for i in range(args.rows)
+    ]
+
+    print(f"{args.rows}-row page, {args.repeat} iterations:")
+    bench("orm + shapely + pydantic", serialize_orm, orm_page(rows), args.repeat, args.rows)
+    bench("row + orjson", serialize_rows, [(r, 123.4) for r in rows], args.repeat, args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Seeded synthetic POI generator: uniform or urban-clustered points with searchable names"""
+import io
+from typing import Iterator, Tuple
+
+import numpy as np
+from sqlalchemy import text
+
+DISTRIBUTIONS = ("uniform", "urban")
+
+# Region covered by the synthetic data (lng_min, lat_min, lng_max, lat_max): north-east US
+BBOX = (-80.0, 38.0, -70.0, 44.0)
+
+# Urban centers (lng, lat, relative weight, spread in degrees)
+CITIES = (
+    (-73.9857, 40.7484, 0.40, 0.08),  # New York
+    (-75.1652, 39.9526, 0.15, 0.06),  # Philadelphia
+    (-71.0589, 42.3601, 0.15, 0.06),  # Boston
+    (-77.0369, 38.9072, 0.12, 0.06),  # Washington
+    (-79.9959, 40.4406, 0.08, 0.05),  # Pittsburgh
+    (-73.7562, 42.6526, 0.05, 0.04),  # Albany
+)
+RURAL_SHARE = 0.05  # Uniform background noise in the urban distribution
+
+WORDS = (
+    "coffee", "pizza", "bar", "park", "museum", "library", "bakery", "gym",
+    "hotel", "market", "station", "school", "church", "bank", "pharmacy", "diner",
+)
+
+# Skewed place types (percent of rows) so filters can be measured at several selectivities
+CATEGORIES = (
+    ("restaurant", 30), ("shop", 25), ("cafe", 15), ("bar", 10), ("park", 8),
+    ("hotel", 6), ("school", 5), ("museum", 1),
+)
+
+Row = Tuple[str, str, float, float]  # name, description, lng, lat
+
+
+def category_for(index: int) -> str:
+    """Deterministic category for the index-th generated row, following CATEGORIES' shares"""
+    bucket = (index * 7919) % 100
+    for category, share in CATEGORIES:
+        if bucket < share:
+            return category
+        bucket -= share
+    return CATEGORIES[-1][0]
+
+
+def generate_coordinates(count: int, distribution: str, rng: np.random.Generator) -> np.ndarray:
+    """(count, 2) array of lng/lat inside BBOX"""
+    lng_min, lat_min, lng_max, lat_max = BBOX
+    if distribution == "uniform":
+        return np.column_stack([
+            rng.uniform(lng_min, lng_max, count),
+            rng.uniform(lat_min, lat_max, count),
+        ])
+    if distribution != "urban":
+        raise ValueError(f"distribution must be one of {', '.join(DISTRIBUTIONS)}, got {distribution!r}")
+
+    weights = np.array([city[2] for city in CITIES])
+    city_index = rng.choice(len(CITIES), size=count, p=weights / weights.sum())
+    centers = np.array([city[:2] for city in CITIES])[city_index]
+    spreads = np.array([city[3] for city in CITIES])[city_index]
+    coords = centers + rng.normal(size=(count, 2)) * spreads[:, None]
+
+    rural = rng.random(count) < RURAL_SHARE
+    coords[rural] = np.column_stack([
+        rng.uniform(lng_min, lng_max, rural.sum()),
+        rng.uniform(lat_min, lat_max, rural.sum()),
+    ])
+    np.clip(coords, [lng_min, lat_min], [lng_max, lat_max], out=coords)
+    return coords
+
+
+def generate_pois(count: int, distribution: str = "uniform", seed: int = 42,
+                  chunk_size: int = 100_000) -> Iterator[Row]:
+    """Deterministic POIs for a (count, distribution, seed), generated chunk by chunk"""
+    rng = np.random.default_rng(seed)
+    produced = 0
+    while produced < count:
+        size = min(chunk_size, count - produced)
+        coords = generate_coordinates(size, distribution, rng)
+        first, second, third = (rng.integers(0, len(WORDS), size) for _ in range(3))
+        for i in range(size):
+            yield (
+                f"{WORDS[first[i]]} {WORDS[second[i]]} {produced + i}",
+                f"near the {WORDS[third[i]]}",
+                float(coords[i, 0]),
+                float(coords[i, 1]),
+            )
+        produced += size
+
+
+def seed_locations(engine, count: int, distribution: str = "uniform", seed: int = 42,
+                   batch_size: int = 500_000) -> None:
+    """Replace the locations table contents with generated POIs (COPY in batches), then ANALYZE"""
+    with engine.begin() as conn:
+        conn.execute(text("TRUNCATE locations RESTART IDENTITY"))
+
+    rows = enumerate(generate_pois(count, distribution, seed))
+    raw = engine.raw_connection()
+    try:
+        while True:
+            buffer = io.StringIO()
+            written = 0
+            for index, (name, description, lng, lat) in rows:
+                buffer.write(
+                    f"{name}\t{description}\t{category_for(index)}\tSRID=4326;POINT({lng:.7f} {lat:.7f})\n"
+                )
+                written += 1
+                if written == batch_size:
+                    break
+            if not written:
+                break
+            buffer.seek(0)
+            with raw.cursor() as cursor:
+                cursor.copy_expert("COPY locations (name, description, category, point) FROM STDIN", buffer)
+            raw.commit()
+    finally:
+        raw.close()
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE locations"))
@@ -0,0 +1,168 @@
+"""Run the workloads against the repository and/or the API and compare with a stored baseline"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from app.core.database import SessionLocal, engine
+from app.main import app
+from app.repositories.location_repository import LocationRepository
+from benchmarks.load_test import percentile
+from benchmarks.suite.generator import DISTRIBUTIONS, seed_locations
+from benchmarks.suite.workloads import WORKLOADS, Workload
+
+DEFAULT_BASELINE = Path(__file__).parent / "results" / "baseline.json"
+TARGETS = ("repo", "api")
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    return {
+        "ops": len(latencies),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "mean_ms": statistics.mean(latencies),
+        "ops_per_second": len(latencies) / elapsed,
+    }
+
+
+def run_repo(workload: Workload, iterations: int, seed: int, created_ids: list) -> Dict[str, float]:
+    """Sequential calls on one session - isolates query cost from HTTP and concurrency"""
+    rng = random.Random(seed)
+    db = SessionLocal()
+    try:
+        repo = LocationRepository(db)
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(iterations):
+            start = time.perf_counter()
+            workload.repo(repo, rng, created_ids)
+            latencies.append((time.perf_counter() - start) * 1000)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+    return summarize(latencies, elapsed)
+
+
+async def run_api(workload: Workload, iterations: int, concurrency: int, seed: int,
+                  created_ids: list) -> Dict[str, float]:
+    """In-process ASGI requests with bounded concurrency - includes routing, validation, serialization"""
+    rng = random.Random(seed)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60.0) as client:
+        async def one() -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                await workload.api(client, rng, created_ids)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(iterations)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(latencies, elapsed)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Workloads whose p95 grew or throughput fell by more than `tolerance` (fraction)"""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{key}: p95 {previous['p95_ms']:.1f} -> {current['p95_ms']:.1f} ms")
+        if current["ops_per_second"] < previous["ops_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{key}: throughput {previous['ops_per_second']:.1f} -> {current['ops_per_second']:.1f} ops/s"
+            )
+    return regressions
+
+
+def print_row(key: str, current: dict, previous: dict = None) -> None:
+    line = (f"  {key:<12} p50={current['p50_ms']:8.2f}  p95={current['p95_ms']:8.2f}  "
+            f"p99={current['p99_ms']:8.2f} ms  {current['ops_per_second']:9.1f} ops/s")
+    if previous:
+        line += f"  (baseline p95={previous['p95_ms']:.2f} ms, {previous['ops_per_second']:.1f} ops/s)"
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000, help="POIs to generate (10k - 10M)")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="urban")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the data already in the database")
+    parser.add_argument("--migrate", action="store_true", help="Run alembic upgrade head first")
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=list(TARGETS))
+    parser.add_argument("--workloads", nargs="+", choices=[w.name for w in WORKLOADS],
+                        default=[w.name for w in WORKLOADS])
+    parser.add_argument("--iterations", type=int, default=500, help="Operations per workload")
+    parser.add_argument("--concurrency", type=int, default=16, help="In-flight API requests")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed regression vs baseline")
+    args = parser.parse_args()
+
+    if args.migrate:
+        from alembic import command
+        from alembic.config import Config
+        command.upgrade(Config("alembic.ini"), "head")
+
+    if not args.skip_seed:
+        print(f"Seeding {args.rows:,} {args.distribution} POIs (seed {args.seed})...")
+        started = time.perf_counter()
+        seed_locations(engine, args.rows, args.distribution, args.seed)
+        print(f"  done in {time.perf_counter() - started:.1f} s")
+
+    stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    run_key = f"{args.distribution}-{args.rows}"
+    baseline = stored.get(run_key, {}).get("results", {})
+
+    results = {}
+    selected = [w for w in WORKLOADS if w.name in args.workloads]
+    for target in args.targets:
+        print(f"{target}:")
+        created_ids: list = []  # create fills it, delete drains it
+        for workload in selected:
+            key = f"{target}.{workload.name}"
+            if target == "repo":
+                results[key] = run_repo(workload, args.iterations, args.seed, created_ids)
+            else:
+                results[key] = asyncio.run(
+                    run_api(workload, args.iterations, args.concurrency, args.seed, created_ids)
+                )
+            print_row(key, results[key], baseline.get(key))
+
+    if args.save_baseline:
+        stored[run_key] = {
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "results": results,
+        }
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(stored, indent=2, sort_keys=True))
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("Regressions vs baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    if baseline:
+        print(f"No regressions beyond {args.tolerance:.0%} vs baseline")
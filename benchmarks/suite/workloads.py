@@ -0,0 +1,161 @@
+"""Fixed query workloads, each runnable against the repository or the HTTP API"""
+import random
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List
+
+from app.core.geometry import latlong_to_point
+from app.core.tiles import point_tiles
+from app.schemas.query_schemas import DistanceRangeQuery, LocationQuery
+from benchmarks.suite.generator import CITIES, WORDS
+
+
+@dataclass
+class Workload:
+    name: str
+    repo: Callable[..., None]  # (repo, rng, created_ids)
+    api: Callable[..., Awaitable[None]]  # (client, rng, created_ids)
+
+
+def query_point(rng: random.Random) -> tuple[float, float]:
+    """(lat, lng) near a random city center - where the urban data is dense"""
+    lng, lat, _, spread = rng.choice(CITIES)
+    return lat + rng.uniform(-spread, spread), lng + rng.uniform(-spread, spread)
+
+
+def _check(response) -> None:
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.method} {response.request.url} -> {response.status_code}")
+
+
+# nearby: 1 km radius, first page
+def nearby_repo(repo, rng, created_ids):
+    lat, lng = query_point(rng)
+    repo.find_within_distance_with_distances(latlong_to_point(lat, lng), 1000, limit=20)
+
+
+async def nearby_api(client, rng, created_ids):
+    lat, lng = query_point(rng)
+    _check(await client.get("/locations/nearby/search", params={
+        "latitude": lat, "longitude": lng, "distance_meters": 1000, "per_page": 20
+    }))
+
+
+# range: 500 m - 5 km ring, exact count
+def range_repo(repo, rng, created_ids):
+    lat, lng = query_point(rng)
+    repo.find_within_distance_range(DistanceRangeQuery(
+        latitude=lat, longitude=lng, min_distance_meters=500, max_distance_meters=5000, per_page=20
+    ))
+
+
+async def range_api(client, rng, created_ids):
+    # No HTTP route for distance rings; the combined search covers the API side of radius + predicate
+    lat, lng = query_point(rng)
+    _check(await client.get("/locations/search", params={
+        "q": rng.choice(WORDS), "latitude": lat, "longitude": lng, "distance_meters": 5000, "per_page": 20
+    }))
+
+
+# knn: 10 nearest, no radius
+def knn_repo(repo, rng, created_ids):
+    lat, lng = query_point(rng)
+    repo.find_k_nearest(latlong_to_point(lat, lng), k=10)
+
+
+async def knn_api(client, rng, created_ids):
+    lat, lng = query_point(rng)
+    _check(await client.get("/locations/nearest", params={"latitude": lat, "longitude": lng, "k": 10}))
+
+
+# text: one or two vocabulary words, relevance order, has_next only
+def _text_term(rng) -> str:
+    return " ".join(rng.sample(WORDS, rng.choice((1, 2))))
+
+
+def text_repo(repo, rng, created_ids):
+    repo.get_rows_with_filters(LocationQuery(search=_text_term(rng), sort_by="relevance", count="none"))
+
+
+async def text_api(client, rng, created_ids):
+    _check(await client.get("/locations/", params={
+        "search": _text_term(rng), "sort_by": "relevance", "count": "none"
+    }))
+
+
+# bbox: city-block viewport (points) and a zoomed-out city viewport (clusters)
+def _viewport(rng, half_degrees: float) -> tuple[float, float, float, float]:
+    lat, lng = query_point(rng)
+    return lng - half_degrees, lat - half_degrees, lng + half_degrees, lat + half_degrees
+
+
+def bbox_repo(repo, rng, created_ids):
+    repo.find_within_bbox(_viewport(rng, 0.005), limit=501)
+    repo.cluster_within_bbox(_viewport(rng, 0.5), grid_size=1.0 / 32)
+
+
+async def bbox_api(client, rng, created_ids):
+    for half_degrees, zoom in ((0.005, 16), (0.5, 9)):
+        min_lng, min_lat, max_lng, max_lat = _viewport(rng, half_degrees)
+        _check(await client.get("/locations/bbox", params={
+            "min_longitude": min_lng, "min_latitude": min_lat,
+            "max_longitude": max_lng, "max_latitude": max_lat, "zoom": zoom
+        }))
+
+
+# tiles: one thinned (z11) and one full detail (z15) tile over a city
+def _tile(rng, z: int) -> tuple[int, int, int]:
+    lat, lng = query_point(rng)
+    x, y = next(iter(point_tiles(lat, lng, z)))
+    return z, x, y
+
+
+def tiles_repo(repo, rng, created_ids):
+    repo.get_tile(*_tile(rng, 11), thin_grid=64)
+    repo.get_tile(*_tile(rng, 15))
+
+
+async def tiles_api(client, rng, created_ids):
+    for zoom in (11, 15):
+        z, x, y = _tile(rng, zoom)
+        _check(await client.get(f"/tiles/{z}/{x}/{y}.mvt"))
+
+
+# create: new POI near a city (ids are kept so delete can remove them again)
+def create_repo(repo, rng, created_ids):
+    lat, lng = query_point(rng)
+    location, _ = repo.create_if_not_exists(
+        name=f"bench {rng.random():.12f}", description="benchmark", point=latlong_to_point(lat, lng)
+    )
+    created_ids.append(location.id)
+
+
+async def create_api(client, rng, created_ids):
+    lat, lng = query_point(rng)
+    response = await client.post("/locations/", json={
+        "name": f"bench {rng.random():.12f}", "description": "benchmark", "latitude": lat, "longitude": lng
+    })
+    _check(response)
+    created_ids.append(response.json()["id"])
+
+
+# delete: removes what create inserted, so a run leaves the dataset unchanged
+def delete_repo(repo, rng, created_ids):
+    if created_ids:
+        repo.delete(created_ids.pop())
+
+
+async def delete_api(client, rng, created_ids):
+    if created_ids:
+        _check(await client.delete(f"/locations/{created_ids.pop()}"))
+
+
+WORKLOADS: List[Workload] = [
+    Workload("nearby", nearby_repo, nearby_api),
+    Workload("range", range_repo, range_api),
+    Workload("knn", knn_repo, knn_api),
+    Workload("text", text_repo, text_api),
+    Workload("bbox", bbox_repo, bbox_api),
+    Workload("tiles", tiles_repo, tiles_api),
+    Workload("create", create_repo, create_api),
+    Workload("delete", delete_repo, delete_api),
+]
@@ -0,0 +1,103 @@
+"""
+Combined text + radius search: one planned query vs two queries intersected.
+
+Seeds the same scratch table as benchmarks.text_search, then for a dense case
+(common word, 2 km around Midtown) and a sparse case (rare term, 50 km) times
+  - two-step: text search ids and radius search ids, intersected client-side
+  - combined: the single statement used by LocationRepository.search_within_distance
+and prints which index drove the combined plan (from EXPLAIN).
+
+Usage (against a throwaway PostGIS, e.g. the docker-compose db service):
+    python -m benchmarks.text_geo_search --rows 5000000
+"""
+import argparse
+import json
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.core.search import like_pattern
+from benchmarks.text_search import BENCH_TABLE, seed
+
+CENTER = (-73.9857, 40.7484)  # Midtown
+
+CASES = {
+    "dense": {"term": "coffee", "radius": 2000},
+    "sparse": {"term": "museum 4242", "radius": 50000},
+}
+
+POINT = "ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)"
+TEXT_FILTER = """(
+    name ILIKE :pattern ESCAPE '\\' OR description ILIKE :pattern ESCAPE '\\'
+    OR search_vector @@ websearch_to_tsquery('simple', :term)
+)"""
+GEO_FILTER = f"ST_DWithin(geography(point), geography({POINT}), :radius)"
+
+TEXT_IDS_SQL = f"SELECT id FROM {BENCH_TABLE} WHERE {TEXT_FILTER}"
+GEO_IDS_SQL = f"SELECT id FROM {BENCH_TABLE} WHERE {GEO_FILTER}"
+COMBINED_SQL = f"""
+    SELECT id, name, ST_Distance(geography(point), geography({POINT})) AS distance
+    FROM {BENCH_TABLE}
+    WHERE {GEO_FILTER} AND {TEXT_FILTER}
+    ORDER BY distance, id LIMIT 20
+"""
+
+
+def driving_indexes(plan: dict) -> list[str]:
+    """Index names used by scan nodes, in plan order"""
+    found = [plan["Index Name"]] if "Index Name" in plan else []
+    for child in plan.get("Plans", []):
+        found.extend(driving_indexes(child))
+    return found
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(rows: int, repeat: int) -> None:
+    with engine.begin() as conn:
+        print(f"Seeding {rows:,} rows...")
+        seed(conn, rows)
+
+        for label, case in CASES.items():
+            params = {"lng": CENTER[0], "lat": CENTER[1], "radius": case["radius"],
+                      "term": case["term"], "pattern": like_pattern(case["term"])}
+
+            def two_step():
+                text_ids = set(conn.execute(text(TEXT_IDS_SQL), params).scalars())
+                geo_ids = set(conn.execute(text(GEO_IDS_SQL), params).scalars())
+                return text_ids & geo_ids
+
+            def combined():
+                return conn.execute(text(COMBINED_SQL), params).fetchall()
+
+            raw = conn.execute(text(f"EXPLAIN (FORMAT JSON) {COMBINED_SQL}"), params).scalar()
+            plan = (raw if isinstance(raw, list) else json.loads(raw))[0]["Plan"]
+
+            print(f"  {label:<7} {case['term']!r} within {case['radius']} m: "
+                  f"two-step={timed(two_step, repeat):9.1f} ms  combined={timed(combined, repeat):9.1f} ms  "
+                  f"indexes={', '.join(driving_indexes(plan)) or 'seq scan'}")
+
+        conn.execute(text(f"DROP TABLE {BENCH_TABLE}"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[5_000_000])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (median reported)")
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        run(rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Text search latency: legacy sequential ILIKE vs pg_trgm / full-text indexes.
+
+Seeds a scratch copy of the locations table (same columns and indexes,
+including search_vector and the trigram GINs) with names and descriptions
+drawn from a small vocabulary, then times page + count for each search term.
+The legacy rows run the old ILIKE filter with index scans disabled, which is
+the plan it got before the text search migration.
+
+Usage (against a throwaway PostGIS, e.g. the docker-compose db service):
+    python -m benchmarks.text_search --rows 5000000 --terms coffee "pizza bar" zzz
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.core.search import like_pattern
+
+BENCH_TABLE = "bench_locations"
+
+WORDS = [
+    "coffee", "pizza", "bar", "park", "museum", "library", "bakery", "gym",
+    "hotel", "market", "station", "school", "church", "bank", "pharmacy", "diner",
+]
+
+LEGACY_SQL = f"""
+    SELECT id, name FROM {BENCH_TABLE}
+    WHERE name ILIKE :pattern OR description ILIKE :pattern
+    ORDER BY created_at DESC LIMIT 20
+"""
+LEGACY_COUNT_SQL = f"""
+    SELECT count(*) FROM {BENCH_TABLE}
+    WHERE name ILIKE :pattern OR description ILIKE :pattern
+"""
+
+INDEXED_FILTER = """
+    name ILIKE :pattern ESCAPE '\\' OR description ILIKE :pattern ESCAPE '\\'
+    OR search_vector @@ websearch_to_tsquery('simple', :term)
+"""
+INDEXED_SQL = f"""
+    SELECT id, name FROM {BENCH_TABLE}
+    WHERE {INDEXED_FILTER}
+    ORDER BY ts_rank_cd(search_vector, websearch_to_tsquery('simple', :term)) + similarity(name, :term) DESC, id
+    LIMIT 20
+"""
+INDEXED_COUNT_SQL = f"SELECT count(*) FROM {BENCH_TABLE} WHERE {INDEXED_FILTER}"
+
+
+def seed(conn, rows: int) -> None:
+    """(Re)create the scratch table and fill it with seeded two/three-word names"""
+    conn.execute(text(f"DROP TABLE IF EXISTS {BENCH_TABLE}"))
+    conn.execute(text(f"CREATE TABLE {BENCH_TABLE} (LIKE locations INCLUDING ALL)"))
+    conn.execute(text("SELECT setseed(0.42)"))
+    conn.execute(text(f"""
+        INSERT INTO {BENCH_TABLE} (name, description, point)
+        SELECT (:words)[1 + floor(random() * :n)::int] || ' ' || (:words)[1 + floor(random() * :n)::int] || ' ' || g,
+               'near the ' || (:words)[1 + floor(random() * :n)::int],
+               ST_SetSRID(ST_MakePoint(-74.25 + random() * 0.55, 40.49 + random() * 0.43), 4326)
+        FROM generate_series(1, :rows) AS g
+    """), {"rows": rows, "words": WORDS, "n": len(WORDS)})
+    conn.execute(text(f"ANALYZE {BENCH_TABLE}"))
+
+
+def timed(conn, page_sql: str, count_sql: str, params: dict, repeat: int) -> float:
+    """Median milliseconds for one page query plus its count"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(text(page_sql), params).fetchall()
+        conn.execute(text(count_sql), params).scalar()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(rows: int, terms: list[str], repeat: int) -> None:
+    with engine.begin() as conn:
+        print(f"Seeding {rows:,} rows...")
+        seed(conn, rows)
+
+        for term in terms:
+            params = {"pattern": like_pattern(term), "term": term}
+
+            conn.execute(text("SET LOCAL enable_indexscan = off"))
+            conn.execute(text("SET LOCAL enable_bitmapscan = off"))
+            legacy = timed(conn, LEGACY_SQL, LEGACY_COUNT_SQL, params, repeat)
+            conn.execute(text("RESET enable_indexscan"))
+            conn.execute(text("RESET enable_bitmapscan"))
+
+            indexed = timed(conn, INDEXED_SQL, INDEXED_COUNT_SQL, params, repeat)
+            print(f"  {term!r:<14} legacy ILIKE={legacy:9.1f} ms  indexed={indexed:9.1f} ms  "
+                  f"speedup={legacy / indexed:6.1f}x")
+
+        conn.execute(text(f"DROP TABLE {BENCH_TABLE}"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[5_000_000])
+    parser.add_argument("--terms", nargs="+", default=["coffee", "pizza bar", "museum 4242", "zzz"])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per term (median reported)")
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        run(rows, args.terms, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""add_geography_point_index
+
+Revision ID: 3f9c2b7d1e54
+Revises: 61a03a65630f
+Create Date: 2026-10-18 09:12:31.502114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2b7d1e54'
+down_revision: Union[str, Sequence[str], None] = '61a03a65630f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Functional GiST index matching geography(point) used by meter-based radius searches
+    op.create_index(
+        'idx_locations_point_geog',
+        'locations',
+        [sa.text('geography(point)')],
+        unique=False,
+        postgresql_using='gist'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_locations_point_geog', table_name='locations')
@@ -0,0 +1,91 @@
+"""add_location_insert_if_absent
+
+Revision ID: a7c41e9b2d60
+Revises: 3f9c2b7d1e54
+Create Date: 2026-10-18 11:40:07.318254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c41e9b2d60'
+down_revision: Union[str, Sequence[str], None] = '3f9c2b7d1e54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Dedup-insert in one call. Writers serialise on advisory locks for every
+# ~1 km grid cell the tolerance circle overlaps (taken in a fixed order so
+# they cannot deadlock), and each plpgsql statement takes a fresh snapshot,
+# so the existence check sees any row committed by a writer we waited on.
+CREATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION location_insert_if_absent(
+    p_name varchar,
+    p_description text,
+    p_lng double precision,
+    p_lat double precision,
+    p_tolerance double precision
+)
+RETURNS TABLE (
+    id integer,
+    name varchar,
+    description text,
+    point geometry,
+    created_at timestamptz,
+    updated_at timestamptz,
+    was_created boolean
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    cell_size constant double precision := 0.01;
+    dlat double precision := p_tolerance / 111320.0;
+    dlng double precision := least(180.0, p_tolerance / (111320.0 * greatest(cos(radians(p_lat)), 0.0001)));
+    pt geometry := ST_SetSRID(ST_MakePoint(p_lng, p_lat), 4326);
+    cell record;
+BEGIN
+    FOR cell IN
+        SELECT x, y
+        FROM generate_series(floor((p_lng - dlng) / cell_size)::bigint,
+                             floor((p_lng + dlng) / cell_size)::bigint) AS x,
+             generate_series(floor((p_lat - dlat) / cell_size)::bigint,
+                             floor((p_lat + dlat) / cell_size)::bigint) AS y
+        ORDER BY x, y
+    LOOP
+        PERFORM pg_advisory_xact_lock(hashtextextended('locations:' || cell.x || ':' || cell.y, 0));
+    END LOOP;
+
+    RETURN QUERY
+        SELECT l.id, l.name, l.description, l.point, l.created_at, l.updated_at, false
+        FROM locations l
+        WHERE ST_DWithin(geography(l.point), geography(pt), p_tolerance)
+        ORDER BY ST_Distance(geography(l.point), geography(pt))
+        LIMIT 1;
+    IF FOUND THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY
+        INSERT INTO locations AS l (name, description, point)
+        VALUES (p_name, p_description, pt)
+        RETURNING l.id, l.name, l.description, l.point, l.created_at, l.updated_at, true;
+END;
+$$;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(CREATE_FUNCTION)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "DROP FUNCTION IF EXISTS location_insert_if_absent("
+        "varchar, text, double precision, double precision, double precision)"
+    )
@@ -0,0 +1,69 @@
+"""add_text_search_indexes
+
+Revision ID: c2e8d4f61a93
+Revises: a7c41e9b2d60
+Create Date: 2026-10-18 14:05:52.771903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e8d4f61a93'
+down_revision: Union[str, Sequence[str], None] = 'a7c41e9b2d60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # Stored generated column - Postgres keeps it current on every insert/update
+    op.add_column(
+        'locations',
+        sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR_SQL, persisted=True))
+    )
+    op.create_index(
+        'idx_locations_search_vector',
+        'locations',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin'
+    )
+
+    # Trigram GIN indexes serve ILIKE '%term%' substring matches
+    op.create_index(
+        'idx_locations_name_trgm',
+        'locations',
+        ['name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'idx_locations_description_trgm',
+        'locations',
+        ['description'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'description': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_locations_description_trgm', table_name='locations')
+    op.drop_index('idx_locations_name_trgm', table_name='locations')
+    op.drop_index('idx_locations_search_vector', table_name='locations')
+    op.drop_column('locations', 'search_vector')
@@ -0,0 +1,125 @@
+"""add_location_category
+
+Revision ID: d4a9e3c7b215
+Revises: c2e8d4f61a93
+Create Date: 2026-10-18 17:22:41.608137
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from alembic.script import ScriptDirectory
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a9e3c7b215'
+down_revision: Union[str, Sequence[str], None] = 'c2e8d4f61a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same dedup-insert as a7c41e9b2d60, now also writing and returning category
+CREATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION location_insert_if_absent(
+    p_name varchar,
+    p_description text,
+    p_lng double precision,
+    p_lat double precision,
+    p_tolerance double precision,
+    p_category varchar DEFAULT NULL
+)
+RETURNS TABLE (
+    id integer,
+    name varchar,
+    description text,
+    category varchar,
+    point geometry,
+    created_at timestamptz,
+    updated_at timestamptz,
+    was_created boolean
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    cell_size constant double precision := 0.01;
+    dlat double precision := p_tolerance / 111320.0;
+    dlng double precision := least(180.0, p_tolerance / (111320.0 * greatest(cos(radians(p_lat)), 0.0001)));
+    pt geometry := ST_SetSRID(ST_MakePoint(p_lng, p_lat), 4326);
+    cell record;
+BEGIN
+    FOR cell IN
+        SELECT x, y
+        FROM generate_series(floor((p_lng - dlng) / cell_size)::bigint,
+                             floor((p_lng + dlng) / cell_size)::bigint) AS x,
+             generate_series(floor((p_lat - dlat) / cell_size)::bigint,
+                             floor((p_lat + dlat) / cell_size)::bigint) AS y
+        ORDER BY x, y
+    LOOP
+        PERFORM pg_advisory_xact_lock(hashtextextended('locations:' || cell.x || ':' || cell.y, 0));
+    END LOOP;
+
+    RETURN QUERY
+        SELECT l.id, l.name, l.description, l.category, l.point, l.created_at, l.updated_at, false
+        FROM locations l
+        WHERE ST_DWithin(geography(l.point), geography(pt), p_tolerance)
+        ORDER BY ST_Distance(geography(l.point), geography(pt))
+        LIMIT 1;
+    IF FOUND THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY
+        INSERT INTO locations AS l (name, description, category, point)
+        VALUES (p_name, p_description, p_category, pt)
+        RETURNING l.id, l.name, l.description, l.category, l.point, l.created_at, l.updated_at, true;
+END;
+$$;
+"""
+
+DROP_PREVIOUS_FUNCTION = (
+    "DROP FUNCTION IF EXISTS location_insert_if_absent("
+    "varchar, text, double precision, double precision, double precision)"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # btree_gist lets a plain varchar column share a GiST index with the point
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+
+    op.add_column('locations', sa.Column('category', sa.String(length=50), nullable=True))
+    op.create_index(
+        'idx_locations_category_point_geog',
+        'locations',
+        ['category', sa.text('geography(point)')],
+        unique=False,
+        postgresql_using='gist'
+    )
+    op.create_index(
+        'idx_locations_category_point',
+        'locations',
+        ['category', 'point'],
+        unique=False,
+        postgresql_using='gist'
+    )
+
+    # The return type changes, so the old function has to go rather than be replaced
+    op.execute(DROP_PREVIOUS_FUNCTION)
+    op.execute(CREATE_FUNCTION)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "DROP FUNCTION IF EXISTS location_insert_if_absent("
+        "varchar, text, double precision, double precision, double precision, varchar)"
+    )
+    # Restore the 5-argument function as a7c41e9b2d60 defined it
+    previous = ScriptDirectory.from_config(op.get_context().config).get_revision('a7c41e9b2d60')
+    op.execute(previous.module.CREATE_FUNCTION)
+
+    op.drop_index('idx_locations_category_point', table_name='locations')
+    op.drop_index('idx_locations_category_point_geog', table_name='locations')
+    op.drop_column('locations', 'category')
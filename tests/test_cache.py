@@ -0,0 +1,76 @@
+import asyncio
+from datetime import datetime, timezone
+
+from app.core.cache import (
+    LRUCacheBackend, RedisCacheBackend, NearbyCache, decode_candidates, encode_candidates,
+    radius_bucket, rank_candidates
+)
+from app.core.geometry import spheroid_distance_meters
+from app.models.location import LocationRow
+
+
+async def exercise(cache):
+    lat, lng = cache.snap(40.71284, -74.00601)
+    print(f"Snapped to cell center: {lat}, {lng}")
+
+    key = cache.key(lat, lng, radius_bucket(480), page=1, per_page=10, cursor=None)
+    print(f"Miss: {await cache.get(key)}")
+    await cache.set(key, b'{"locations": []}', lat, lng, radius_bucket(480))
+    print(f"Hit: {await cache.get(key)}")
+
+    # Write far away leaves the entry alone, write inside the circle drops it
+    await cache.invalidate_point(48.8566, 2.3522)
+    print(f"After far write: {await cache.get(key)}")
+    await cache.invalidate_point(40.7130, -74.0062)
+    print(f"After nearby write: {await cache.get(key)}")
+    print(f"Stats: {await cache.stats()}")
+
+
+# Test radius buckets
+print(f"Radius buckets: {[radius_bucket(r) for r in (1, 480, 1001, 12345, 50000)]}")
+
+# Test in-process LRU
+asyncio.run(exercise(NearbyCache(LRUCacheBackend(max_entries=100))))
+
+# Test LRU eviction
+lru = LRUCacheBackend(max_entries=2)
+for i in range(3):
+    asyncio.run(lru.set(f"k{i}", b"v", 30))
+print(f"LRU evictions: {lru.evictions}, oldest present: {asyncio.run(lru.get('k0')) is not None}")
+
+# Test Redis backend against a local fake
+try:
+    import fakeredis
+except ImportError:
+    print("fakeredis not installed - skipping Redis backend")
+else:
+    asyncio.run(exercise(NearbyCache(RedisCacheBackend(fakeredis.FakeAsyncRedis()))))
+
+# Cached candidates are re-ranked from the client's own point with the exact radius
+cache = NearbyCache(LRUCacheBackend())
+now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+client = (40.71284, -74.00601)
+cell = cache.snap(*client)
+candidates = [
+    LocationRow(i, f"p{i}", None, client[0] + i * 0.0004, client[1], now, now) for i in range(1, 8)
+]
+superset = cache.superset_radius(480)
+assert all(
+    spheroid_distance_meters(cell[0], cell[1], [r.latitude], [r.longitude])[0] <= superset
+    for r in candidates if spheroid_distance_meters(*client, [r.latitude], [r.longitude])[0] <= 500
+)
+cached = encode_candidates(candidates)
+page = rank_candidates(decode_candidates(cached), *client, 200, limit=3)
+print(f"Ranked page: {[(row.id, round(distance, 1)) for row, distance in page]}")
+assert [row.id for row, _ in page] == [1, 2, 3]
+assert all(distance <= 200 for _, distance in rank_candidates(decode_candidates(cached), *client, 200, limit=10))
+after = (page[-1][1], page[-1][0].id)
+assert [row.id for row, _ in rank_candidates(decode_candidates(cached), *client, 200, limit=10, after=after)] == [4]
+assert page[0][0].updated_at == now
+
+# Ranking builds new rows: decoded candidates can be ranked again, and distances are keyset-rounded
+decoded = decode_candidates(cached)
+first = rank_candidates(decoded, *client, 200, limit=10)
+assert rank_candidates(decoded, *client, 200, limit=10) == first and isinstance(decoded[0][5], str)
+assert all(distance == round(distance, 2) for _, distance in first)
+print(f"Superset radius for 480 m: {superset:.1f} m")
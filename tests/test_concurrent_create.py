@@ -0,0 +1,56 @@
+# Stress test: 200 concurrent writers creating the same spot must yield one row
+from concurrent.futures import ThreadPoolExecutor
+import random
+import threading
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import DATABASE_URL
+from app.repositories.location_repository import LocationRepository
+from app.core.geometry import latlong_to_point
+
+WRITERS = 200
+TOLERANCE_METERS = 10
+
+# Dedicated engine so every writer can hold a connection at once
+engine = create_engine(DATABASE_URL, pool_size=WRITERS, max_overflow=0)
+Session = sessionmaker(bind=engine)
+
+# Unique spot per run, every writer lands within ~3m of it
+base_lat = 40.0 + random.uniform(-1, 1)
+base_lng = -74.0 + random.uniform(-1, 1)
+start = threading.Barrier(WRITERS)
+
+
+def writer(i):
+    db = Session()
+    try:
+        repo = LocationRepository(db)
+        point = latlong_to_point(
+            base_lat + random.uniform(-0.00002, 0.00002),
+            base_lng + random.uniform(-0.00002, 0.00002)
+        )
+        start.wait()
+        location, was_created = repo.create_if_not_exists(
+            f"Stress {i}", "Concurrency stress test", point, TOLERANCE_METERS
+        )
+        return location.id, was_created
+    finally:
+        db.close()
+
+
+with ThreadPoolExecutor(max_workers=WRITERS) as pool:
+    results = list(pool.map(writer, range(WRITERS)))
+
+created = [location_id for location_id, was_created in results if was_created]
+distinct_ids = {location_id for location_id, _ in results}
+print(f"Writers: {WRITERS}, created: {len(created)}, distinct ids returned: {len(distinct_ids)}")
+print("Duplicates: 0" if len(created) == 1 and len(distinct_ids) == 1 else f"Duplicates: {len(created) - 1}")
+
+# Clean up
+db = Session()
+repo = LocationRepository(db)
+for location_id in distinct_ids:
+    repo.delete(location_id)
+db.close()
@@ -0,0 +1,30 @@
+import time
+
+from sqlalchemy import select
+
+from app.core.counting import CountCache, statement_fingerprint
+from app.models.location import Location
+
+# Same SQL + same parameters -> same key; different parameters -> different key
+a = statement_fingerprint(select(Location.id).where(Location.name == "coffee"))
+b = statement_fingerprint(select(Location.id).where(Location.name == "coffee"))
+c = statement_fingerprint(select(Location.id).where(Location.name == "tea"))
+assert a == b
+assert a != c
+
+# TTL expiry and LRU bound
+cache = CountCache(ttl_seconds=0.05, max_entries=2)
+cache.set("a", 10)
+assert cache.get("a") == 10
+time.sleep(0.06)
+assert cache.get("a") is None
+
+cache = CountCache(ttl_seconds=60, max_entries=2)
+cache.set("a", 1)
+cache.set("b", 2)
+cache.get("a")
+cache.set("c", 3)
+assert cache.get("b") is None
+assert cache.get("a") == 1 and cache.get("c") == 3
+
+print("Count cache tests passed!")
@@ -0,0 +1,43 @@
+import json
+import struct
+from datetime import datetime, timezone
+
+from app.core import flatgeobuf
+from app.core.exporters import ExportStats, _geojson, _ndjson, _fgb
+from app.models.location import LocationRow
+
+now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+rows = [LocationRow(i, f"Place {i}", None, 40.0 + i / 100, -74.0, now, now) for i in range(5)]
+batches = [rows[:2], rows[2:]]
+
+# NDJSON: one object per line
+stats = ExportStats()
+lines = b"".join(_ndjson(iter(batches), stats)).splitlines()
+assert len(lines) == 5 and stats.rows == 5
+assert json.loads(lines[4])["latitude"] == 40.04
+print(f"NDJSON line: {lines[0].decode()}")
+
+# GeoJSON: a valid FeatureCollection with export stats as a foreign member
+stats = ExportStats()
+collection = json.loads(b"".join(_geojson(iter(batches), stats)))
+assert len(collection["features"]) == 5
+assert collection["features"][0]["geometry"] == {"type": "Point", "coordinates": [-74.0, 40.0]}
+assert collection["export"]["rows"] == 5
+print(f"GeoJSON feature: {collection['features'][0]}")
+
+# Empty export is still a valid collection
+assert json.loads(b"".join(_geojson(iter([]), ExportStats())))["features"] == []
+
+# FlatGeobuf: magic, size-prefixed header, then one size-prefixed feature per row
+if flatgeobuf.available():
+    data = b"".join(_fgb(iter(batches), ExportStats()))
+    assert data[:8] == flatgeobuf.MAGIC
+    offset = 12 + struct.unpack("<I", data[8:12])[0]
+    features = 0
+    while offset < len(data):
+        offset += 4 + struct.unpack("<I", data[offset:offset + 4])[0]
+        features += 1
+    assert offset == len(data) and features == 5
+    print(f"FlatGeobuf: {len(data)} bytes, {features} features")
+
+print("Exporter tests passed!")
@@ -0,0 +1,21 @@
+from benchmarks.suite.generator import BBOX, generate_pois
+
+# Same seed -> same data, different seed -> different data
+first = list(generate_pois(1000, "urban", seed=7, chunk_size=300))
+assert first == list(generate_pois(1000, "urban", seed=7, chunk_size=300))
+assert first != list(generate_pois(1000, "urban", seed=8, chunk_size=300))
+
+# Every point lands inside the region, names are unique
+lng_min, lat_min, lng_max, lat_max = BBOX
+for distribution in ("uniform", "urban"):
+    pois = list(generate_pois(5000, distribution, seed=1))
+    assert len(pois) == 5000
+    assert all(lng_min <= lng <= lng_max and lat_min <= lat <= lat_max for _, _, lng, lat in pois)
+    assert len({name for name, _, _, _ in pois}) == 5000
+
+# Urban data is clustered: most points fall within ~0.25 degrees of Manhattan or another city
+urban = list(generate_pois(5000, "urban", seed=1))
+near_nyc = sum(1 for _, _, lng, lat in urban if abs(lng + 73.9857) < 0.25 and abs(lat - 40.7484) < 0.25)
+assert near_nyc > 1500
+
+print("Generator tests passed!")
@@ -18,3 +18,7 @@ print(f"WKT: {wkt_str}")
 # Test validation
 print(f"Valid GeoJSON: {validate_geojson_point(geojson)}")
 print(f"Invalid GeoJSON: {validate_geojson_point({'type': 'LineString'})}")
+
+# Test array-oriented GeoJSON decoding
+parsed, valid = geojson_to_coordinates([geojson, {'type': 'LineString'}, {'type': 'Point', 'coordinates': [200, 0]}])
+print(f"GeoJSON decode valid mask: {valid.tolist()}")
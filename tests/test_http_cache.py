@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta, timezone
+
+from app.core.http_cache import etag_matches, location_etag, results_etag
+from app.models.location import LocationRow
+
+now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+row = LocationRow(1, "Cafe", None, 40.0, -74.0, now, now)
+
+# Single location: strong, changes with updated_at only
+etag = location_etag(row)
+assert etag.startswith('"') and etag == location_etag(row._replace(name="Renamed"))
+assert etag != location_etag(row._replace(updated_at=now + timedelta(seconds=1)))
+print(f"Location ETag: {etag}")
+
+# Result lists: weak, changes with membership, order or the newest updated_at
+rows = [row, row._replace(id=2)]
+etag = results_etag(rows)
+assert etag.startswith('W/"')
+assert etag != results_etag(rows[::-1])
+assert etag != results_etag(rows[:1])
+assert etag != results_etag([rows[0], rows[1]._replace(updated_at=now + timedelta(seconds=1))])
+assert results_etag([]) == results_etag(iter([]))
+print(f"Results ETag: {etag}")
+
+# If-None-Match: lists, weak comparison, wildcard
+assert etag_matches(f'"other", {etag}', etag)
+assert etag_matches(etag[2:], etag)
+assert etag_matches("*", etag)
+assert not etag_matches(None, etag)
+assert not etag_matches('"other"', etag)
+
+print("HTTP cache tests passed!")
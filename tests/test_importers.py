@@ -0,0 +1,75 @@
+import io
+from app.core.importers import ImportFormat, ImportStats, InvalidDocument, check_document, parse_records
+
+# Test NDJSON (plain objects and GeoJSON features, one bad line)
+ndjson = (
+    b'{"name": "Starbucks", "description": "Coffee shop", "latitude": 40.7128, "longitude": -74.0060}\n'
+    b'not json\n'
+    b'{"type": "Feature", "geometry": {"type": "Point", "coordinates": [-74.0062, 40.7130]}, '
+    b'"properties": {"name": "Dunkin Coffee"}}\n'
+)
+stats = ImportStats()
+print(f"NDJSON records: {list(parse_records(io.BytesIO(ndjson), ImportFormat.ndjson, stats))}")
+print(f"NDJSON rejected: {stats.rejected}")
+
+# Lines that are not objects, or carry a non-string name, are rejected rather than raised
+stats = ImportStats()
+odd = b'[1]\n"text"\n{"name": 123, "latitude": 40.7, "longitude": -74.0}\n{"name": "Ok", "latitude": 40.7, "longitude": -74.0}\n'
+records = list(parse_records(io.BytesIO(odd), ImportFormat.ndjson, stats))
+assert [r[0] for r in records] == ["Ok"] and stats.rejected == 3
+print(f"Odd NDJSON rejected: {stats.rejected}")
+
+# Test CSV (second row has invalid latitude)
+csv_data = b"name,description,latitude,longitude\nJoe's Pizza,Pizza place,40.7125,-74.0058\nInvalid,,100,-74.0\n"
+stats = ImportStats()
+print(f"CSV records: {list(parse_records(io.BytesIO(csv_data), ImportFormat.csv, stats))}")
+print(f"CSV rejected: {stats.rejected}")
+
+# Test GeoJSON FeatureCollection
+geojson = (
+    b'{"type": "FeatureCollection", "features": [{"type": "Feature", '
+    b'"geometry": {"type": "Point", "coordinates": [-74.0060, 40.7128]}, "properties": {"name": "NYC"}}]}'
+)
+stats = ImportStats()
+print(f"GeoJSON records: {list(parse_records(io.BytesIO(geojson), ImportFormat.geojson, stats))}")
+
+# Category is read in every format; a description that is not a string rejects the row
+stats = ImportStats()
+records = list(parse_records(io.BytesIO(
+    b'{"name": "Cafe", "category": "cafe", "latitude": 40.7, "longitude": -74.0}\n'
+    b'{"name": "Dict", "description": {"a": 1}, "latitude": 40.7, "longitude": -74.0}\n'
+), ImportFormat.ndjson, stats))
+assert records == [("Cafe", None, "cafe", -74.0, 40.7)] and stats.rejected == 1
+csv_records = list(parse_records(
+    io.BytesIO(b"name,category,latitude,longitude\nPark,park,40.7,-74.0\n"), ImportFormat.csv, ImportStats()
+))
+assert csv_records == [("Park", None, "park", -74.0, 40.7)]
+stats = ImportStats()
+geojson_records = list(parse_records(io.BytesIO(
+    b'{"type": "FeatureCollection", "features": ['
+    b'{"geometry": {"type": "Point", "coordinates": [-74.0, 40.7]}, "properties": {"name": "M", "category": "museum"}},'
+    b'{"geometry": {"type": "Point", "coordinates": [-74.0, 40.7]}, "properties": {"name": "D", "description": [1]}}]}'
+), ImportFormat.geojson, stats))
+assert geojson_records == [("M", None, "museum", -74.0, 40.7)] and stats.rejected == 1
+print(f"Category records: {records + csv_records + geojson_records}")
+
+# Bad UTF-8 rejects one NDJSON line; unreadable documents raise InvalidDocument before import
+stats = ImportStats()
+records = list(parse_records(
+    io.BytesIO(b'\xff\xfe\n{"name": "Ok", "latitude": 40.7, "longitude": -74.0}\n'), ImportFormat.ndjson, stats
+))
+assert len(records) == 1 and stats.rejected == 1
+for body, fmt in (
+    (b"[1, 2]", ImportFormat.geojson),
+    (b'{"type": "FeatureCollection", "features": [{"geometry"', ImportFormat.geojson),
+    (b'{"features": 5}', ImportFormat.geojson),
+    (b"name,latitude,longitude\n\xff\xfe,40.7,-74.0\n", ImportFormat.csv),
+):
+    stream = io.BytesIO(body)
+    try:
+        check_document(stream, fmt)
+        list(parse_records(stream, fmt, ImportStats()))
+    except InvalidDocument as exc:
+        print(f"Rejected document: {exc}")
+    else:
+        raise AssertionError(f"{body!r} was accepted")
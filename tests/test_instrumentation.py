@@ -0,0 +1,43 @@
+from sqlalchemy import create_engine, text
+
+from app.core.config import Settings
+from app.core.instrumentation import (
+    Histogram, RequestStats, _request_stats, install_query_instrumentation, instrument_methods
+)
+
+# Histogram renders cumulative buckets in Prometheus text format
+histogram = Histogram("demo_seconds", "Demo", ("endpoint",), (0.1, 1.0))
+histogram.observe(0.05, "/a")
+histogram.observe(0.5, "/a")
+histogram.observe(5.0, "/a")
+rendered = "\n".join(histogram.render())
+assert 'demo_seconds_bucket{endpoint="/a",le="0.1"} 1' in rendered
+assert 'demo_seconds_bucket{endpoint="/a",le="1.0"} 2' in rendered
+assert 'demo_seconds_bucket{endpoint="/a",le="+Inf"} 3' in rendered
+assert 'demo_seconds_count{endpoint="/a"} 3' in rendered
+
+# Statements are counted into the active request and tagged by repository method
+engine = create_engine("sqlite://")
+install_query_instrumentation(engine, Settings())
+
+
+@instrument_methods
+class Repo:
+    def two_queries(self):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+
+
+stats = RequestStats("/demo")
+token = _request_stats.set(stats)
+try:
+    Repo().two_queries()
+finally:
+    _request_stats.reset(token)
+
+assert stats.statements == 2
+assert [method for method, _ in stats.statement_seconds] == ["Repo.two_queries"] * 2
+assert Repo.two_queries.__name__ == "two_queries"
+
+print("Instrumentation tests passed!")
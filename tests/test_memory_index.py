@@ -0,0 +1,78 @@
+import random
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.core.pagination import encode_cursor
+from app.models.location import LocationRow
+from app.repositories.memory_location_index import MemoryLocationIndex, haversine_meters
+from app.schemas.query_schemas import DistanceRangeQuery
+from app.core.geometry import latlong_to_point
+
+# Build an index over random points around NYC (no database needed)
+rng = random.Random(7)
+now = datetime.now(timezone.utc)
+rows = [
+    LocationRow(i, f"POI {i}", None, 40.7 + rng.uniform(-0.1, 0.1), -74.0 + rng.uniform(-0.1, 0.1), now, now)
+    for i in range(1, 20001)
+]
+index = MemoryLocationIndex(cell_degrees=0.01)
+index.upsert(rows)
+print(f"Indexed {len(index)} rows")
+
+# Radius query matches brute-force haversine
+center = latlong_to_point(40.71, -74.01)
+results = index.find_within_distance_with_distances(center, 1000, limit=100000)
+lat, lng = np.radians([r.latitude for r in rows]), np.radians([r.longitude for r in rows])
+expected = int((haversine_meters(np.radians(40.71), np.radians(-74.01), lat, lng) <= 1000).sum())
+print(f"Within 1000m: {len(results)} (brute force: {expected})")
+
+# Keyset pagination returns the same rows as one big page
+first = index.find_within_distance_with_distances(center, 1000, limit=10)
+last_row, last_distance = first[-1]
+second = index.find_within_distance_with_distances(center, 1000, limit=10, after=(last_distance, last_row.id))
+print(f"Pages match: {[r.id for r, _ in first + second] == [r.id for r, _ in results[:20]]}")
+
+# KNN
+nearest = index.find_k_nearest(center, k=5)
+print(f"Nearest 5 distances: {[round(d, 1) for _, d in nearest]}")
+
+# Distance range
+ranged, total = index.find_within_distance_range(DistanceRangeQuery(
+    latitude=40.71, longitude=-74.01, min_distance_meters=500, max_distance_meters=1000
+))
+print(f"Between 500-1000m: {total}")
+
+# Range cursor pages line up with one big page, both directions
+for order in ("asc", "desc"):
+    query = dict(latitude=40.71, longitude=-74.01, min_distance_meters=500, max_distance_meters=1000,
+                 sort_order=order, count="none")
+    everything, _ = index.find_within_distance_range(DistanceRangeQuery(per_page=100, **query))
+    page, _ = index.find_within_distance_range(DistanceRangeQuery(per_page=10, **query))
+    last_row, last_distance = page[9]
+    rest, _ = index.find_within_distance_range(DistanceRangeQuery(
+        per_page=10, cursor=encode_cursor(last_distance, last_row.id), **query
+    ))
+    assert [r.id for r, _ in page[:10] + rest[:10]] == [r.id for r, _ in everything[:20]]
+
+# Write-through delete
+index.remove(nearest[0][0].id)
+print(f"Nearest after delete: {index.find_k_nearest(center, k=1)[0][0].id != nearest[0][0].id}")
+
+# Write-through bulk delete, one publish for all ids
+before = len(index)
+index.remove_many([row.id for row, _ in nearest[1:]])
+assert len(index) == before - 4
+assert not {row.id for row, _ in nearest} & {row.id for row, _ in index.find_k_nearest(center, k=10)}
+print(f"Rows after bulk delete: {len(index)}")
+
+# Category filter, over both the packed snapshot and the write-through overlay
+categories = ("cafe", "park", "museum")
+categorized = MemoryLocationIndex(cell_degrees=0.01)
+categorized.upsert([row._replace(category=categories[row.id % 3]) for row in rows])
+categorized.upsert([LocationRow(99999, "New cafe", None, 40.71, -74.01, now, now, "cafe")])
+cafes = categorized.find_within_distance_with_distances(center, 1000, limit=100000, category="cafe")
+assert cafes and all(r.category == "cafe" for r, _ in cafes)
+assert cafes[0][0].id == 99999
+assert all(r.category == "park" for r, _ in categorized.find_k_nearest(center, k=5, category="park"))
+print(f"Cafes within 1000m: {len(cafes)}")
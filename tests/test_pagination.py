@@ -0,0 +1,12 @@
+from app.core.pagination import encode_cursor, decode_cursor
+
+# Test cursor round trip
+cursor = encode_cursor(123.456789, 42)
+print(f"Cursor: {cursor}")
+print(f"Decoded: {decode_cursor(cursor)}")
+
+# Test malformed cursor
+try:
+    decode_cursor("not-a-cursor")
+except ValueError as e:
+    print(f"Validation error: {e}")
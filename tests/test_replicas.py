@@ -0,0 +1,108 @@
+import logging
+import time
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core import dependencies
+from app.core.replicas import READ_PRIMARY_COOKIE, Replica, ReplicaRouter, remember_write, wants_primary
+
+
+class FakeEngine:
+    """Stands in for a replica engine: the health probe returns lag, or raises when down"""
+
+    def __init__(self, lag=0.0):
+        self.lag = lag
+        self.down = False
+
+    def connect(self):
+        if self.down:
+            raise ConnectionError("replica down")
+        engine = self
+
+        class Connection:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, statement):
+                return type("Result", (), {"scalar": lambda _: engine.lag})()
+
+        return Connection()
+
+
+class FakeSession:
+    def __init__(self, name):
+        self.name = name
+
+    def close(self):
+        pass
+
+
+def request(headers=None, cookies=None) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    if cookies:
+        raw.append((b"cookie", "; ".join(f"{k}={v}" for k, v in cookies.items()).encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+engines = [FakeEngine(0.1), FakeEngine(0.2), FakeEngine(30.0)]
+replicas = [Replica(f"replica-{i}", e, session_factory=lambda i=i: FakeSession(f"replica-{i}")) for i, e in enumerate(engines)]
+router = ReplicaRouter(replicas, max_lag_seconds=5.0, check_seconds=1.0)
+
+# Probe failures are logged with a traceback; keep the output readable
+logging.getLogger("app.core.replicas").setLevel(logging.CRITICAL)
+
+# Nothing is used before the first probe
+assert router.pick() is None
+router.check()
+
+# Round-robin over healthy replicas within the lag tolerance; the lagging one is skipped
+picked = [router.pick().name for _ in range(4)]
+assert picked == ["replica-0", "replica-1", "replica-0", "replica-1"]
+print(f"Round robin: {picked}")
+
+# A failed probe takes a replica out until it recovers
+engines[0].down = True
+router.check()
+assert {router.pick().name for _ in range(4)} == {"replica-1"}
+engines[0].down = False
+router.check()
+assert {router.pick().name for _ in range(4)} == {"replica-0", "replica-1"}
+
+# Unknown lag (WAL receiver gone, nothing replayed yet) is reported as infinite: healthy but unused
+engines[0].lag = float("inf")
+router.check()
+assert replicas[0].healthy and {router.pick().name for _ in range(4)} == {"replica-1"}
+engines[0].lag = 0.1
+router.check()
+
+# Failure during a request also takes it out; all replicas out -> primary
+router.mark_failed(replicas[0])
+router.mark_failed(replicas[1])
+assert router.pick() is None
+router.check()
+print(f"Replica snapshot: {router.snapshot()}")
+
+# Read-your-writes: a write sets a cookie that routes reads to the primary for max lag + check interval
+response = Response()
+remember_write(response, router)
+cookie = response.headers["set-cookie"]
+until = float(cookie.split(";")[0].split("=")[1])
+assert READ_PRIMARY_COOKIE in cookie and 5.0 < until - time.time() < 6.01
+assert wants_primary(request(cookies={READ_PRIMARY_COOKIE: str(until)}))
+assert not wants_primary(request(cookies={READ_PRIMARY_COOKIE: str(time.time() - 1)}))
+assert wants_primary(request(headers={"X-Read-Consistency": "primary"}))
+assert not wants_primary(request())
+
+# The read session dependency follows the router
+dependencies.replica_router = router
+sessions = dependencies.get_read_db(request())
+assert isinstance(next(sessions), FakeSession)
+sessions.close()
+primary = dependencies.get_read_db(request(headers={"X-Read-Consistency": "primary"}))
+assert not isinstance(next(primary), FakeSession)
+primary.close()
+print("Replica routing tests passed!")
@@ -20,4 +20,18 @@ print(f"Found location: {found.name if found else 'Not found'}")
 total = repo.count_total()
 print(f"Total locations: {total}")
 
+# Test bulk update (one moved, one renamed, one missing id) and bulk delete
+boston = repo.create("Boston", None, latlong_to_point(42.3601, -71.0589))
+updated = repo.bulk_update([
+    (location.id, None, None, None, 40.7306, -73.9352),
+    (boston.id, "Boston, MA", None, None, None, None),
+    (-1, "Missing", None, None, None, None),
+])
+print(f"Bulk updated: {sorted((row.id, row.name, round(row.latitude, 4)) for row, _, _ in updated)}")
+print(f"Previous NYC point: {[(lat, lng) for row, lat, lng in updated if row.id == location.id]}")
+
+deleted = repo.bulk_delete(ids=[location.id, boston.id], batch_size=1)
+print(f"Bulk deleted: {sorted(location_id for location_id, _, _ in deleted)}")
+print(f"Deleted again: {repo.bulk_delete(ids=[location.id])}")
+
 db.close()
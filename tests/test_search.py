@@ -0,0 +1,16 @@
+from sqlalchemy.dialects import postgresql
+
+from app.core.search import like_pattern, text_search_filter
+
+# Wildcards in user input are matched literally
+assert like_pattern("coffee") == "%coffee%"
+assert like_pattern("50%_off") == "%50\\%\\_off%"
+assert like_pattern("a\\b") == "%a\\\\b%"
+
+# Filter hits both trigram-indexed columns and the tsvector
+sql = str(text_search_filter("pizza bar").compile(dialect=postgresql.dialect()))
+assert "locations.name ILIKE" in sql
+assert "locations.description ILIKE" in sql
+assert "locations.search_vector @@ websearch_to_tsquery" in sql
+
+print("Text search helper tests passed!")
@@ -0,0 +1,85 @@
+from shapely.geometry import Point
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.core.pagination import encode_cursor
+from app.repositories.location_repository import LocationRepository
+from app.schemas.query_schemas import DistanceRangeQuery
+
+
+class EmptyResult:
+    def all(self):
+        return []
+
+    def first(self):
+        return None
+
+    def scalars(self):
+        return self
+
+
+class CapturingSession(Session):
+    """Records executed statements instead of running them"""
+
+    def __init__(self):
+        super().__init__()
+        self.statements = []
+
+    def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return EmptyResult()
+
+
+dialect = postgresql.psycopg2.dialect()
+
+
+def captured(call):
+    session = CapturingSession()
+    call(LocationRepository(session))
+    (statement,) = session.statements
+    return statement, statement.compile(dialect=dialect).params
+
+
+def same_cache_key(a, b):
+    return a._generate_cache_key().key == b._generate_cache_key().key
+
+
+# Nearby: different values share one cache entry, and the new values are bound
+first, first_params = captured(lambda repo: repo.find_within_distance_with_distances(
+    Point(-74.0, 40.7), 500, limit=20, category="cafe", after=(120.5, 7)
+))
+second, second_params = captured(lambda repo: repo.find_within_distance_with_distances(
+    Point(-73.9, 40.8), 1500, limit=5, category="bar", after=(80.0, 3)
+))
+assert same_cache_key(first, second)
+assert second_params["longitude_1"] == -73.9 and second_params["latitude_1"] == 40.8
+assert second_params["distance_meters_1"] == 1500 and second_params["category_1"] == "bar"
+assert (second_params["after_distance_1"], second_params["after_id_1"]) == (80.0, 3)
+assert second_params["limit_1"] == 5
+print(f"Nearby binds: {sorted(second_params)}")
+
+# Optional filters change the statement shape, so they get their own entry
+plain, _ = captured(lambda repo: repo.find_within_distance_with_distances(Point(-74.0, 40.7), 500))
+assert not same_cache_key(first, plain)
+
+# Range: cursor and sort order are part of the shape, values are bound
+range_query = dict(latitude=40.7, longitude=-74.0, max_distance_meters=2000, count="none")
+asc_page, asc_params = captured(lambda repo: repo.find_within_distance_range(DistanceRangeQuery(
+    min_distance_meters=100, cursor=encode_cursor(250.0, 10), **range_query
+)))
+asc_page2, asc_params2 = captured(lambda repo: repo.find_within_distance_range(DistanceRangeQuery(
+    min_distance_meters=300, cursor=encode_cursor(900.0, 42), **range_query
+)))
+desc_page, _ = captured(lambda repo: repo.find_within_distance_range(DistanceRangeQuery(
+    min_distance_meters=100, cursor=encode_cursor(250.0, 10), sort_order="desc", **range_query
+)))
+assert same_cache_key(asc_page, asc_page2) and not same_cache_key(asc_page, desc_page)
+assert asc_params2["min_distance_1"] == 300 and asc_params2["after_id_1"] == 42
+assert asc_params["limit_1"] == 11  # per_page + 1 without an exact count
+
+# Lookups by id
+one, _ = captured(lambda repo: repo.get_row_by_id(1))
+two, two_params = captured(lambda repo: repo.get_row_by_id(2))
+assert same_cache_key(one, two) and two_params == {"location_id_1": 2}
+
+print("Statement cache tests passed!")
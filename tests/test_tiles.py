@@ -0,0 +1,46 @@
+import tempfile
+from datetime import datetime, timezone
+
+from app.core.tiles import Tile, TileCache, point_tiles, thinning_grid, tile_bounds, tile_etag
+
+# Tile bounds: z0 is the whole web mercator world, z1 splits it in four
+min_lng, min_lat, max_lng, max_lat = tile_bounds(0, 0, 0)
+assert (min_lng, max_lng) == (-180.0, 180.0) and abs(max_lat - 85.0511) < 1e-3
+assert tile_bounds(1, 1, 0)[:2] == (0.0, 0.0)
+print(f"Tile 1/1/0 bounds: {tile_bounds(1, 1, 0)}")
+
+# A point is filed under its own tile, plus neighbours only when inside their buffer
+lng, lat = -73.9857, 40.7484
+assert list(point_tiles(lat, lng, 12)) == [(1206, 1539)]
+assert sorted(point_tiles(0.0, 0.0, 1)) == [(0, 0), (0, 1), (1, 0), (1, 1)]
+
+# Thinning only below the full detail zoom
+assert thinning_grid(14, 14, 4) is None
+assert thinning_grid(10, 14, 4) == 64
+
+# ETag follows the bytes, so a thinned cell whose count property changed gets a new one
+assert tile_etag(b"cell count=3") != tile_etag(b"cell count=2")
+assert Tile.rendered(b"mvt").etag == tile_etag(b"mvt")
+# Only cached renders get a Last-Modified; an uncached one never answers If-Modified-Since
+assert Tile.rendered(b"mvt").last_modified is None and Tile.rendered(b"mvt", cached=True).last_modified
+assert not Tile.rendered(b"mvt").not_modified(None, "Fri, 02 Jan 2099 03:04:05 GMT")
+
+stamp = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+tile = Tile(b"mvt", tile_etag(b"mvt"), stamp)
+assert tile.last_modified_header == "Fri, 02 Jan 2026 03:04:05 GMT"
+assert tile.not_modified(tile.etag, None)
+assert not tile.not_modified('"other"', "Fri, 02 Jan 2026 03:04:05 GMT")
+assert tile.not_modified(None, "Fri, 02 Jan 2026 03:04:05 GMT")
+assert not tile.not_modified(None, "Fri, 02 Jan 2026 03:04:04 GMT")
+
+# Disk cache round trip and point invalidation across zooms
+with tempfile.TemporaryDirectory() as root:
+    cache = TileCache(root)
+    for z in (4, 12):
+        x, y = next(iter(point_tiles(lat, lng, z)))
+        cache.set(z, x, y, tile)
+    assert cache.get(12, 1206, 1539) == tile
+    assert cache.invalidate_point(lat, lng) == 2
+    assert cache.get(12, 1206, 1539) is None
+
+print("Tile tests passed!")